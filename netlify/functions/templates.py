@@ -1,6 +1,6 @@
 import os
-import json
 import sys
+import orjson
 from pathlib import Path
 
 # Add project root to Python path
@@ -23,7 +23,7 @@ def success_response(data, status_code=200):
             'Content-Type': 'application/json',
             **get_cors_headers()
         },
-        'body': json.dumps(data)
+        'body': orjson.dumps(data).decode('utf-8')
     }
 
 def error_response(message, status_code=500):
@@ -34,7 +34,7 @@ def error_response(message, status_code=500):
             'Content-Type': 'application/json',
             **get_cors_headers()
         },
-        'body': json.dumps({"error": message})
+        'body': orjson.dumps({"error": message}).decode('utf-8')
     }
 
 def handler(event, context):
@@ -59,8 +59,8 @@ def handler(event, context):
         if not templates_file_path.exists():
             return error_response("Templates configuration file not found", 404)
         
-        with open(templates_file_path, 'r', encoding='utf-8') as f:
-            templates_data = json.load(f)
+        with open(templates_file_path, 'rb') as f:
+            templates_data = orjson.loads(f.read())
         
         return success_response(templates_data)
         
@@ -1,6 +1,7 @@
 import os
 import json
 import sys
+import orjson
 from pathlib import Path
 
 # Add project root to Python path for imports
@@ -23,7 +24,7 @@ def success_response(data, status_code=200):
             'Content-Type': 'application/json',
             **get_cors_headers()
         },
-        'body': json.dumps(data)
+        'body': orjson.dumps(data).decode('utf-8')
     }
 
 def error_response(message, status_code=500, details=None):
@@ -38,14 +39,14 @@ def error_response(message, status_code=500, details=None):
             'Content-Type': 'application/json',
             **get_cors_headers()
         },
-        'body': json.dumps(error_data)
+        'body': orjson.dumps(error_data).decode('utf-8')
     }
 
 def parse_request_body(event):
     """Parse JSON body from the event"""
     try:
         if event.get('body'):
-            return json.loads(event['body'])
+            return orjson.loads(event['body'])
         return {}
     except json.JSONDecodeError:
         raise ValueError("Invalid JSON in request body")
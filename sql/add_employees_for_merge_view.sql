@@ -0,0 +1,61 @@
+-- =====================================================================
+-- EMPLOYEES FOR MERGE VIEW
+-- =====================================================================
+-- The employee merge tool lists every employee with their roles. The
+-- aggregated role_in_contract in employee_profiles can repeat a role when
+-- several assignments list it (e.g. "Civil Engineer, Civil Engineer, Data
+-- Engineer"), so the roles are deduplicated here instead of per row in the
+-- web server.
+--
+-- Run this in your Supabase SQL editor after update_employee_profiles_view.sql.
+-- The server falls back to deduplicating in Python until it is deployed.
+-- =====================================================================
+
+-- =================================================================
+-- FUNCTION: DEDUPLICATE A COMMA-SEPARATED ROLE STRING
+-- =================================================================
+-- Trims each role, drops empty entries and keeps the first occurrence of
+-- each role in its original order, joined with ', '.
+CREATE OR REPLACE FUNCTION dedup_roles(p_roles TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+STRICT
+AS $$
+    SELECT COALESCE(STRING_AGG(role, ', ' ORDER BY first_position), '')
+    FROM (
+        SELECT TRIM(raw_role) as role, MIN(role_position) as first_position
+        FROM UNNEST(string_to_array(p_roles, ',')) WITH ORDINALITY AS roles(raw_role, role_position)
+        WHERE TRIM(raw_role) <> ''
+        GROUP BY TRIM(raw_role)
+    ) unique_roles;
+$$;
+
+-- =================================================================
+-- VIEW: EMPLOYEES FOR MERGE
+-- =================================================================
+DROP VIEW IF EXISTS employees_for_merge;
+
+CREATE VIEW employees_for_merge AS
+SELECT
+    employee_id,
+    employee_name,
+    dedup_roles(role_in_contract) as role_in_contract,
+    total_years_experience,
+    education,
+    source_filename
+FROM employee_profiles;
+
+-- Grant permissions
+GRANT EXECUTE ON FUNCTION dedup_roles(TEXT) TO anon, authenticated;
+GRANT SELECT ON employees_for_merge TO anon, authenticated;
+
+-- =====================================================================
+-- VERIFICATION QUERIES
+-- =====================================================================
+-- SELECT dedup_roles('Civil Engineer, Civil Engineer, Data Engineer');
+-- -- => 'Civil Engineer, Data Engineer'
+
+-- SELECT employee_name, role_in_contract
+-- FROM employees_for_merge
+-- ORDER BY employee_name;
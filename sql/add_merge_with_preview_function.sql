@@ -0,0 +1,53 @@
+-- =====================================================================
+-- EMPLOYEE MERGE WITH PREVIEW
+-- =====================================================================
+-- Combines get_merge_preview and merge_employees into one call, so the
+-- merge tool can preview and (when confirmed) merge in a single round
+-- trip. Both run in the same transaction; the preview returned is the
+-- state the merge was applied to.
+--
+-- Run this in your Supabase SQL editor after
+-- add_employee_merge_functions.sql. The existing functions are unchanged.
+-- =====================================================================
+
+-- =================================================================
+-- FUNCTION: MERGE TWO EMPLOYEES WITH PREVIEW
+-- =================================================================
+CREATE OR REPLACE FUNCTION merge_employees_with_preview(
+    p_primary_employee_id UUID,     -- Employee to keep (target)
+    p_secondary_employee_id UUID,   -- Employee to merge and remove (source)
+    p_merge_options JSONB DEFAULT '{}'::JSONB,  -- Merge preferences
+    p_confirm BOOLEAN DEFAULT FALSE -- Perform the merge, not just preview it
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_preview JSONB;
+    v_merge_result JSONB;
+BEGIN
+    v_preview := get_merge_preview(p_primary_employee_id, p_secondary_employee_id);
+
+    -- Preview only, or nothing to merge
+    IF NOT p_confirm OR v_preview ? 'error' THEN
+        RETURN jsonb_build_object(
+            'preview', v_preview,
+            'result', NULL
+        );
+    END IF;
+
+    v_merge_result := merge_employees(
+        p_primary_employee_id,
+        p_secondary_employee_id,
+        p_merge_options
+    );
+
+    RETURN jsonb_build_object(
+        'preview', v_preview,
+        'result', v_merge_result
+    );
+END;
+$$;
+
+-- Grant permissions
+GRANT EXECUTE ON FUNCTION merge_employees_with_preview(UUID, UUID, JSONB, BOOLEAN) TO anon, authenticated;
@@ -32,6 +32,12 @@ except ImportError as e:
 # Load environment variables
 load_dotenv()
 
+# Project-relative paths (Netlify compatible), resolved once at import
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_TEMPLATE_PATH = str(PROJECT_ROOT / "templates" / "Section E template.pdf")
+OUTPUT_DIR = PROJECT_ROOT / "OutputFiles" / "PDFs"
+PARSED_RESULTS_PATH = str(PROJECT_ROOT / "data" / "ParsedFiles" / "real_parsed_results.json")
+
 
 class SectionEPDFGenerator:
     """Generate Section E PDF forms with Supabase data"""
@@ -52,11 +58,10 @@ class SectionEPDFGenerator:
             print("⚠️ No Supabase credentials found. Will use JSON fallback.")
         
         # Use project root relative paths for Netlify compatibility
-        project_root = Path(__file__).parent.parent.parent
-        self.template_path = str(project_root / "templates" / "Section E template.pdf")
-        self.output_dir = project_root / "OutputFiles" / "PDFs"
+        self.template_path = DEFAULT_TEMPLATE_PATH
+        self.output_dir = OUTPUT_DIR
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.json_path = str(project_root / "data" / "ParsedFiles" / "real_parsed_results.json")
+        self.json_path = PARSED_RESULTS_PATH
     
     def fetch_employee_by_id(self, employee_id: str) -> Optional[Dict]:
         """Fetch employee data by ID from Supabase or JSON fallback"""
@@ -576,7 +581,7 @@ class SectionEPDFGenerator:
         print(f"📄 Generating Section E PDF for: {employee_data['name']}")
         return self.create_section_e_pdf(employee_data)
     
-    def generate_resume_by_name(self, employee_name: str) -> Optional[str]:
+    def generate_resume_by_name(self, employee_name: str, output_filename: Optional[str] = None) -> Optional[str]:
         """Generate Section E resume for employee by name"""
         print(f"🔍 Searching for employee: {employee_name}")
         
@@ -587,7 +592,7 @@ class SectionEPDFGenerator:
         employee_data = self.format_employee_data(data)
         
         print(f"📄 Generating Section E PDF for: {employee_data['name']}")
-        return self.create_section_e_pdf(employee_data)
+        return self.create_section_e_pdf(employee_data, output_filename)
     
     def list_employees(self) -> List[Dict]:
         """List all employees in the database"""
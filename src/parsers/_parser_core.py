@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Shared core of the Section E resume parsers
+
+Single source of truth for the OpenAI prompt, the request/response handling
+and the text extraction step used by both section_e_parser.py (local folders)
+and section_e_parsing_bucket.py (Supabase storage bucket).
+"""
+
+import re
+import json
+import hashlib
+import orjson
+from pathlib import Path
+from typing import Optional, Union
+from openai import AsyncOpenAI, AuthenticationError, PermissionDeniedError
+
+from src.parsers.enhanced_text_extractor import EnhancedTextExtractor
+
+OPENAI_MODEL = "gpt-4o-mini"
+MAX_COMPLETION_TOKENS = 4000
+
+# The SDK retries 429s, 5xx and dropped connections with jittered backoff
+OPENAI_MAX_RETRIES = 5
+OPENAI_TIMEOUT_SECONDS = 60.0
+
+# Errors every later request would hit too (bad key, no model access): stop the run
+# instead of failing each file in turn. Other 4xx fail only the file that caused them.
+FATAL_OPENAI_ERRORS = (AuthenticationError, PermissionDeniedError)
+
+# System prompt for OpenAI to extract structured data from resumes
+SYSTEM_PROMPT = """You are a structured resume parser for U.S. Government Standard Form 330 Section E resumes.
+Extract the following fields from the provided text and return them as a JSON object.
+
+IMPORTANT PARSING INSTRUCTIONS:
+- Look for ACTUAL detailed project descriptions, NOT placeholder text
+- Ignore text like "Brief scope, size, cost, etc." - find the real project details
+- For project scope, extract the detailed technical description that follows "Scope:" 
+- Extract specific technical details, methodologies, and project deliverables
+- For costs and fees, look for actual dollar amounts (e.g., "$4.1M", "$349k")
+- If information is not provided or unclear, use empty string "" rather than placeholder text
+
+{
+  "name": "",
+  "role_in_contract": "",
+  "years_experience": {
+    "total": "",
+    "with_current_firm": ""
+  },
+  "firm_name_and_location": "",
+  "education": "",
+  "current_professional_registration": "",
+  "other_professional_qualifications": "",
+  "relevant_projects": [
+    {
+      "title_and_location": "",
+      "year_completed": {
+        "professional_services": "",
+        "construction": ""
+      },
+      "description": {
+        "scope": "",  
+        "cost": "",
+        "fee": "",
+        "role": ""
+      }
+    }
+  ]
+}
+
+CRITICAL: For the "scope" field, extract the FULL detailed project description that appears after "Scope:" in the document. 
+This should include specific technical details about what work was performed, methodologies used, project components, etc.
+DO NOT use placeholder text like "Brief scope, size, cost, etc." - extract the actual detailed project information.
+
+There can be multiple relevant projects. Use best effort to extract and normalize each section.
+Return only the JSON object, no additional text or formatting."""
+
+# OpenAI prompt caching matches on the exact message prefix, so SYSTEM_PROMPT
+# must stay a static, byte-identical first message (no timestamps or filenames;
+# per-call resume text always goes in the user message after it). The pinned
+# hash catches accidental edits.
+SYSTEM_PROMPT_SHA256 = "84058c6d161f27f544c76e8a53df86bd624e33f59b2fbd68c679f76bc8c85b41"
+assert hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest() == SYSTEM_PROMPT_SHA256, \
+    "SYSTEM_PROMPT changed: update SYSTEM_PROMPT_SHA256"
+
+# JSON schema mirroring the example object in SYSTEM_PROMPT. Strict structured
+# outputs need every field listed in "required" and no additional properties.
+_STRING = {"type": "string"}
+
+RESUME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": _STRING,
+        "role_in_contract": _STRING,
+        "years_experience": {
+            "type": "object",
+            "properties": {
+                "total": _STRING,
+                "with_current_firm": _STRING
+            },
+            "required": ["total", "with_current_firm"],
+            "additionalProperties": False
+        },
+        "firm_name_and_location": _STRING,
+        "education": _STRING,
+        "current_professional_registration": _STRING,
+        "other_professional_qualifications": _STRING,
+        "relevant_projects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title_and_location": _STRING,
+                    "year_completed": {
+                        "type": "object",
+                        "properties": {
+                            "professional_services": _STRING,
+                            "construction": _STRING
+                        },
+                        "required": ["professional_services", "construction"],
+                        "additionalProperties": False
+                    },
+                    "description": {
+                        "type": "object",
+                        "properties": {
+                            "scope": _STRING,
+                            "cost": _STRING,
+                            "fee": _STRING,
+                            "role": _STRING
+                        },
+                        "required": ["scope", "cost", "fee", "role"],
+                        "additionalProperties": False
+                    }
+                },
+                "required": ["title_and_location", "year_completed", "description"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": [
+        "name",
+        "role_in_contract",
+        "years_experience",
+        "firm_name_and_location",
+        "education",
+        "current_professional_registration",
+        "other_professional_qualifications",
+        "relevant_projects"
+    ],
+    "additionalProperties": False
+}
+
+# Single-resume requests are held to RESUME_SCHEMA by the API
+RESUME_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "resume", "strict": True, "schema": RESUME_SCHEMA}
+}
+
+
+def request_fingerprint(system_prompt: str, response_format: dict) -> str:
+    """
+    Short fingerprint of the prompt and output contract a request was sent with
+    
+    Cached parses are keyed on it, so editing either one invalidates the
+    results it produced, and results from different contracts never mix.
+    """
+    digest = hashlib.sha256(system_prompt.encode("utf-8"))
+    digest.update(orjson.dumps(response_format, option=orjson.OPT_SORT_KEYS))
+    return digest.hexdigest()[:12]
+
+
+# Fingerprint of single-resume requests (SYSTEM_PROMPT with strict RESUME_SCHEMA output)
+RESUME_REQUEST_VERSION = request_fingerprint(SYSTEM_PROMPT, RESUME_RESPONSE_FORMAT)
+
+# Extractions shorter than this, or without any of these section words, are
+# header noise or not a resume; they are not worth a completion
+MIN_RESUME_TEXT_LENGTH = 400
+RESUME_SENTINEL_PATTERN = re.compile(r"education|experience|project|qualification", re.IGNORECASE)
+
+# Shared across files: the extractor holds no per-call state and its caches
+# (lookup tables, memoized results) are only worth having if they are reused
+_EXTRACTOR = EnhancedTextExtractor()
+
+
+def looks_like_resume(text: str) -> bool:
+    """
+    Cheap check that extracted text is worth sending to OpenAI
+    
+    Args:
+        text (str): Extracted document text
+        
+    Returns:
+        bool: True if the text is long enough and mentions a resume section
+    """
+    return len(text.strip()) >= MIN_RESUME_TEXT_LENGTH and RESUME_SENTINEL_PATTERN.search(text) is not None
+
+
+def build_chat_request(system_prompt: str, user_content: str,
+                       response_format: dict = RESUME_RESPONSE_FORMAT,
+                       max_tokens: int = MAX_COMPLETION_TOKENS) -> dict:
+    """
+    Build the keyword arguments for a chat completion request
+    
+    Args:
+        system_prompt (str): Static instructions, sent first so the prefix can be cached
+        user_content (str): Per-call resume text
+        response_format (dict): Output contract; structured RESUME_SCHEMA by default
+        max_tokens (int): Completion token cap; one resume's worth by default
+        
+    Returns:
+        dict: Arguments for client.chat.completions.create
+    """
+    return {
+        "model": OPENAI_MODEL,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ],
+        "response_format": response_format,
+        "temperature": 0,
+        "max_tokens": max_tokens
+    }
+
+
+def decode_json_response(response) -> dict:
+    """
+    Decode the JSON object returned in a chat completion
+    
+    Args:
+        response: Chat completion returned by the OpenAI client
+        
+    Returns:
+        dict: Parsed data, or an empty dict if the response was empty or invalid
+    """
+    content = response.choices[0].message.content
+    
+    # Check if content is valid
+    if not content:
+        print("Error: Empty response from OpenAI")
+        return {}
+    
+    # Schema conformance is guaranteed, but a completion cut off at
+    # max_tokens is still truncated JSON
+    try:
+        return orjson.loads(content)
+    except json.JSONDecodeError as e:
+        print(f"JSON parsing failed: {e}")
+        print(f"Raw response: {content[:200]!r}...")
+        return {}
+
+
+async def parse_resume(client: AsyncOpenAI, text: str) -> dict:
+    """
+    Parse resume text using OpenAI gpt-4o-mini with structured outputs
+    
+    Args:
+        client (AsyncOpenAI): Async OpenAI client instance
+        text (str): Extracted document text
+        
+    Returns:
+        dict: Parsed resume data as dictionary
+    """
+    try:
+        response = await client.chat.completions.create(**build_chat_request(SYSTEM_PROMPT, text))
+    except FATAL_OPENAI_ERRORS:
+        raise
+    except Exception as e:
+        print(f"OpenAI parsing failed: {e}")
+        return {}
+    
+    return decode_json_response(response)
+
+
+def extract_text(source: Union[str, bytes], filename: Optional[str] = None) -> str:
+    """
+    Extract text from a PDF or Word document using enhanced extraction with encoding fixes
+    
+    Args:
+        source (str | bytes): Path to the document, or its content in memory
+        filename (str): Document name; required for in-memory content to pick the format
+        
+    Returns:
+        str: Extracted and cleaned text content
+    """
+    label = filename or source
+    try:
+        extractor = _EXTRACTOR
+        suffix = Path(label).suffix
+        if isinstance(source, (bytes, bytearray)):
+            text, method_used = extractor.extract_text_with_fallback_bytes(source, suffix)
+        else:
+            text, method_used = extractor.extract_text_with_fallback(source)
+        
+        if text:
+            print(f"  ✓ {suffix.upper()} text extracted using {method_used} (length: {len(text)})")
+            
+            # Analyze text quality for reporting
+            quality = extractor.analyze_text_quality(text)
+            if quality['issues']:
+                print(f"  ⚠ Text quality: {quality['quality']} - {', '.join(quality['issues'])}")
+            else:
+                print(f"  ✓ Text quality: {quality['quality']}")
+                
+            return text
+        else:
+            print(f"  ✗ Failed to extract text using enhanced extractor")
+            return ""
+            
+    except Exception as e:
+        print(f"Error extracting text from {label}: {e}")
+        return ""
@@ -6,66 +6,126 @@ This module provides multiple extraction methods and text preprocessing
 to handle various PDF encoding issues before sending to OpenAI.
 """
 
+import importlib
+import importlib.util
+import io
+import os
 import re
+import shutil
+import subprocess
+import threading
 import unicodedata
 import logging
-from typing import List, Dict, Optional, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import tempfile
+from typing import List, Dict, Optional, Tuple, Any, Union
 from pathlib import Path
 
-try:
-    import fitz  # PyMuPDF
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
-
-try:
-    from PyPDF2 import PdfReader
-    PYPDF2_AVAILABLE = True
-except ImportError:
-    PYPDF2_AVAILABLE = False
-
-try:
-    from pdfminer.high_level import extract_text
-    PDFMINER_AVAILABLE = True
-except ImportError:
-    PDFMINER_AVAILABLE = False
-
-try:
-    from docx import Document
-    PYTHON_DOCX_AVAILABLE = True
-except ImportError:
-    PYTHON_DOCX_AVAILABLE = False
-
-try:
-    import docx2txt
-    DOCX2TXT_AVAILABLE = True
-except ImportError:
-    DOCX2TXT_AVAILABLE = False
-
-try:
-    import subprocess
-    import shutil
-    SUBPROCESS_AVAILABLE = True
-    # Check if antiword is available (for legacy .doc files)
-    ANTIWORD_AVAILABLE = shutil.which('antiword') is not None
-    # Check if catdoc is available (alternative for .doc files)
-    CATDOC_AVAILABLE = shutil.which('catdoc') is not None
-except ImportError:
-    SUBPROCESS_AVAILABLE = False
-    ANTIWORD_AVAILABLE = False
-    CATDOC_AVAILABLE = False
-
-try:
-    import textract
-    TEXTRACT_AVAILABLE = True
-except ImportError:
-    TEXTRACT_AVAILABLE = False
+
+def _module_available(module_name: str) -> bool:
+    """Check whether a backend is installed without paying its import cost"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _import_backend(module_name: str):
+    """Import an extraction backend on first use"""
+    return importlib.import_module(module_name)
+
+
+def _as_file(source: Union[str, bytes]):
+    """Wrap in-memory document bytes in a file object; paths pass through unchanged"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return source
+
+
+# Backends are imported lazily by the extractor that needs them
+PYMUPDF_AVAILABLE = _module_available("fitz")
+PDFPLUMBER_AVAILABLE = _module_available("pdfplumber")
+PYPDF2_AVAILABLE = _module_available("PyPDF2")
+PDFMINER_AVAILABLE = _module_available("pdfminer")
+PYTHON_DOCX_AVAILABLE = _module_available("docx")
+DOCX2TXT_AVAILABLE = _module_available("docx2txt")
+TEXTRACT_AVAILABLE = _module_available("textract")
+
+SUBPROCESS_AVAILABLE = True
+# Check if antiword is available (for legacy .doc files)
+ANTIWORD_AVAILABLE = shutil.which('antiword') is not None
+# Check if catdoc is available (alternative for .doc files)
+CATDOC_AVAILABLE = shutil.which('catdoc') is not None
+
+# PyMuPDF releases the GIL inside get_text, so long documents are split
+# across a small thread pool. Short resumes stay on the serial path.
+PYMUPDF_PARALLEL_MIN_PAGES = 4
+PYMUPDF_MAX_WORKERS = 8
+
+# Pages where more than this share of spans carry unmappable glyphs are
+# re-read in plain text mode and left to the CID/garbled cleanup layer.
+UNMAPPED_SPAN_RATIO_LIMIT = 0.1
+
+# Extraction results are memoized per (path, mtime, size) so repeated
+# inspections of an unchanged file skip the backend entirely.
+EXTRACTION_CACHE_SIZE = 128
+
+# PDFs above this page count skip the pure-Python fallbacks (pdfplumber,
+# pdfminer), which take minutes on documents that long
+LARGE_PDF_MIN_PAGES = 50
+
+# Backends that shell out or need a real file; in-memory input is spilled to a temp file for them
+PATH_ONLY_METHODS = frozenset({"extract_text_antiword", "extract_text_catdoc", "extract_text_textract"})
+
+# Extraction backends per file type, in fallback order: (display name, method name)
+EXTRACTION_METHODS = {
+    '.pdf': (
+        ("PyMuPDF", "extract_text_pymupdf"),
+        ("PyPDF2", "extract_text_pypdf2"),
+        ("pdfplumber", "extract_text_pdfplumber"),
+        ("pdfminer", "extract_text_pdfminer"),
+    ),
+    # Modern Word format (.docx) - use Office Open XML methods
+    '.docx': (
+        ("python-docx", "extract_text_python_docx"),
+        ("docx2txt", "extract_text_docx2txt"),
+        ("textract", "extract_text_textract"),
+    ),
+    # Legacy Word format (.doc) - use binary format methods
+    '.doc': (
+        ("antiword", "extract_text_antiword"),
+        ("catdoc", "extract_text_catdoc"),
+        ("textract", "extract_text_textract"),
+        ("python-docx", "extract_text_python_docx"),  # Sometimes works
+        ("docx2txt", "extract_text_docx2txt"),        # Sometimes works
+    ),
+}
+
+# Replacement chains selected by a caller's backend_hint: (extension, hint) -> methods
+BACKEND_HINT_METHODS = {
+    ('.pdf', 'large_pdf'): (
+        ("PyMuPDF", "extract_text_pymupdf"),
+        ("PyPDF2", "extract_text_pypdf2"),
+    ),
+}
+
+CID_PATTERN = re.compile(r'\(cid:(\d+)\)')
+CID_TABLE_SIZE = 1024
+CID_SPAN_CACHE_SIZE = 4096
+
+# analyze_text_quality inspects at most this many characters from each end
+QUALITY_SAMPLE_CHARS = 8192
+
+# Header words that appear on every SF330 page; if none of their garbled
+# forms are present the font shift did not happen and the fixups can be skipped.
+GARBLED_SENTINELS = ("1$0(", "52/(", "&2175$&7")
+
+CONTROL_CHARS_PATTERN = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
+WHITESPACE_RUN_PATTERN = re.compile(r'\s+')
+BLANK_LINES_PATTERN = re.compile(r'\n\s*\n')
+EXCESS_NEWLINES_PATTERN = re.compile(r'\n{3,}')
 
 
 class EnhancedTextExtractor:
@@ -73,6 +133,8 @@ class EnhancedTextExtractor:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self._cached_extract = lru_cache(maxsize=EXTRACTION_CACHE_SIZE)(self._extract_for_stat)
+        self._decode_span = lru_cache(maxsize=CID_SPAN_CACHE_SIZE)(self._decode_span_uncached)
         
         # CID to Unicode mapping for common characters
         self.cid_mappings = {
@@ -143,6 +205,11 @@ class EnhancedTextExtractor:
             "(cid:93)": "z",   # z
         }
         
+        # Index-addressed lookup table built from cid_mappings: (cid:NN) -> char
+        self._cid_table: List[Optional[str]] = [None] * CID_TABLE_SIZE
+        for cid, char in self.cid_mappings.items():
+            self._cid_table[int(CID_PATTERN.fullmatch(cid).group(1))] = char
+        
         # Character replacement mappings for garbled text
         self.char_replacements = {
             # Common garbled patterns from PDF extraction
@@ -169,33 +236,109 @@ class EnhancedTextExtractor:
             "0LFKLJDQ": "Michigan",
             "7HFKQRORJLFDO": "Technological",
         }
+        
+        # One alternation over CID markers and garbled patterns (longest first)
+        # so analyze_text_quality can count everything in a single scan.
+        garbled_keys = sorted(self.char_replacements, key=len, reverse=True)
+        self._quality_pattern = re.compile(
+            "|".join([CID_PATTERN.pattern] + [re.escape(key) for key in garbled_keys])
+        )
+        # Prefilter on 3-character prefixes: if none occur, no garbled pattern can
+        self._garbled_prefix_pattern = re.compile(
+            "|".join(re.escape(prefix) for prefix in sorted({key[:3] for key in garbled_keys}))
+        )
+        # A longer pattern swallows any shorter ones inside it during the scan
+        self._garbled_contains = {
+            key: {other for other in garbled_keys if other != key and other in key}
+            for key in garbled_keys
+        }
 
-    def extract_text_pymupdf(self, pdf_path: str) -> str:
-        """Extract text using PyMuPDF (best for most PDFs)"""
+    def extract_text_pymupdf(self, pdf_path: Union[str, bytes]) -> str:
+        """Extract text using PyMuPDF (best for most PDFs); accepts a path or PDF bytes"""
         if not PYMUPDF_AVAILABLE:
             raise ImportError("PyMuPDF not available")
+        fitz = _import_backend("fitz")
         
         try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                # PyMuPDF page text extraction
-                page_text = getattr(page, 'get_text', lambda *args: '')()
-                text += page_text + "\n"
-            doc.close()
-            return text.strip()
+            doc = self._open_pymupdf(fitz, pdf_path)
+            try:
+                page_count = len(doc)
+                if page_count > PYMUPDF_PARALLEL_MIN_PAGES:
+                    page_texts = self._extract_pages_pymupdf_parallel(pdf_path, page_count)
+                else:
+                    page_texts = [self._page_text_pymupdf(page) for page in doc]
+            finally:
+                doc.close()
+            return "\n".join(page_texts).strip()
         except Exception as e:
             self.logger.error(f"PyMuPDF extraction failed: {e}")
             return ""
 
-    def extract_text_pdfplumber(self, pdf_path: str) -> str:
+    def _page_text_pymupdf(self, page) -> str:
+        """
+        Extract one page from PyMuPDF's span structure, keeping only spans
+        whose glyphs mapped cleanly to Unicode
+        """
+        page_dict = page.get_text("dict", flags=_import_backend("fitz").TEXTFLAGS_TEXT)
+        total_spans = 0
+        unmapped_spans = 0
+        block_texts = []
+        
+        for block in page_dict.get("blocks", []):
+            line_texts = []
+            for line in block.get("lines", []):
+                span_texts = []
+                for span in line.get("spans", []):
+                    total_spans += 1
+                    span_text = span.get("text", "")
+                    if "\ufffd" in span_text:
+                        unmapped_spans += 1
+                        continue
+                    span_texts.append(span_text)
+                line_texts.append("".join(span_texts))
+            block_texts.append("\n".join(line_texts))
+        
+        if total_spans and unmapped_spans > total_spans * UNMAPPED_SPAN_RATIO_LIMIT:
+            return page.get_text("text")
+        
+        return "\n".join(block_texts)
+
+    def _open_pymupdf(self, fitz, source: Union[str, bytes]):
+        """Open a PyMuPDF document from a path or from in-memory bytes"""
+        if isinstance(source, (bytes, bytearray)):
+            return fitz.open(stream=source, filetype="pdf")
+        return fitz.open(source)
+
+    def _extract_pages_pymupdf_parallel(self, pdf_path: Union[str, bytes], page_count: int) -> List[str]:
+        """Extract page texts on a thread pool, one document handle per worker thread"""
+        # fitz.Document is not thread-safe in every build, so each worker opens its own
+        fitz = _import_backend("fitz")
+        local = threading.local()
+        opened_docs = []
+
+        def page_text(page_index: int) -> str:
+            doc = getattr(local, 'doc', None)
+            if doc is None:
+                doc = local.doc = self._open_pymupdf(fitz, pdf_path)
+                opened_docs.append(doc)
+            return self._page_text_pymupdf(doc[page_index])
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(PYMUPDF_MAX_WORKERS, page_count)) as executor:
+                return list(executor.map(page_text, range(page_count)))
+        finally:
+            for doc in opened_docs:
+                doc.close()
+
+    def extract_text_pdfplumber(self, pdf_path: Union[str, bytes]) -> str:
         """Extract text using pdfplumber"""
         if not PDFPLUMBER_AVAILABLE:
             raise ImportError("pdfplumber not available")
+        pdfplumber = _import_backend("pdfplumber")
         
         try:
             text = ""
-            with pdfplumber.open(pdf_path) as pdf:
+            with pdfplumber.open(_as_file(pdf_path)) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
@@ -205,69 +348,77 @@ class EnhancedTextExtractor:
             self.logger.error(f"pdfplumber extraction failed: {e}")
             return ""
 
-    def extract_text_pypdf2(self, pdf_path: str) -> str:
+    def extract_text_pypdf2(self, pdf_path: Union[str, bytes]) -> str:
         """Extract text using PyPDF2"""
         if not PYPDF2_AVAILABLE:
             raise ImportError("PyPDF2 not available")
+        PdfReader = _import_backend("PyPDF2").PdfReader
         
         try:
             text = ""
-            with open(pdf_path, 'rb') as file:
-                reader = PdfReader(file)
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            # PdfReader reads a path into memory itself, or wraps the bytes we hand it
+            reader = PdfReader(_as_file(pdf_path))
+            for page in reader.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
             return text.strip()
         except Exception as e:
             self.logger.error(f"PyPDF2 extraction failed: {e}")
             return ""
 
-    def extract_text_pdfminer(self, pdf_path: str) -> str:
+    def extract_text_pdfminer(self, pdf_path: Union[str, bytes]) -> str:
         """Extract text using pdfminer"""
         if not PDFMINER_AVAILABLE:
             raise ImportError("pdfminer not available")
+        extract_text = _import_backend("pdfminer.high_level").extract_text
         
         try:
-            return extract_text(pdf_path).strip()
+            return extract_text(_as_file(pdf_path)).strip()
         except Exception as e:
             self.logger.error(f"pdfminer extraction failed: {e}")
             return ""
 
-    def extract_text_python_docx(self, doc_path: str) -> str:
+    def extract_text_python_docx(self, doc_path: Union[str, bytes]) -> str:
         """Extract text using python-docx (for .docx files)"""
         if not PYTHON_DOCX_AVAILABLE:
             raise ImportError("python-docx not available")
+        Document = _import_backend("docx").Document
         
         try:
-            doc = Document(doc_path)
-            text_parts = []
+            doc = Document(_as_file(doc_path))
+            buffer = io.StringIO()
             
-            # Extract text from paragraphs
+            # Extract text from paragraphs (.text walks the XML, so read it once)
             for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
+                paragraph_text = paragraph.text
+                if paragraph_text.strip():
+                    buffer.write(paragraph_text)
+                    buffer.write("\n")
             
             # Extract text from tables
             for table in doc.tables:
                 for row in table.rows:
                     for cell in row.cells:
-                        if cell.text.strip():
-                            text_parts.append(cell.text)
+                        cell_text = cell.text
+                        if cell_text.strip():
+                            buffer.write(cell_text)
+                            buffer.write("\n")
             
-            return "\n".join(text_parts).strip()
+            return buffer.getvalue().strip()
             
         except Exception as e:
             self.logger.error(f"python-docx extraction failed: {e}")
             return ""
 
-    def extract_text_docx2txt(self, doc_path: str) -> str:
+    def extract_text_docx2txt(self, doc_path: Union[str, bytes]) -> str:
         """Extract text using docx2txt (simpler, for .docx files)"""
         if not DOCX2TXT_AVAILABLE:
             raise ImportError("docx2txt not available")
+        docx2txt = _import_backend("docx2txt")
         
         try:
-            text = docx2txt.process(doc_path)
+            text = docx2txt.process(_as_file(doc_path))
             return text.strip() if text else ""
         except Exception as e:
             self.logger.error(f"docx2txt extraction failed: {e}")
@@ -279,16 +430,19 @@ class EnhancedTextExtractor:
             raise ImportError("antiword not available")
         
         try:
+            # Force UTF-8 output and decode it explicitly instead of via the locale
             result = subprocess.run(
-                ['antiword', doc_path],
-                capture_output=True,
-                text=True,
+                ['antiword', '-m', 'UTF-8.txt', doc_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                encoding='utf-8',
+                errors='replace',
                 timeout=30
             )
             if result.returncode == 0:
                 return result.stdout.strip()
             else:
-                self.logger.error(f"antiword failed with return code {result.returncode}: {result.stderr}")
+                self.logger.error(f"antiword failed with return code {result.returncode}")
                 return ""
         except subprocess.TimeoutExpired:
             self.logger.error("antiword extraction timed out")
@@ -303,16 +457,19 @@ class EnhancedTextExtractor:
             raise ImportError("catdoc not available")
         
         try:
+            # Force UTF-8 output and decode it explicitly instead of via the locale
             result = subprocess.run(
-                ['catdoc', doc_path],
-                capture_output=True,
-                text=True,
+                ['catdoc', '-d', 'utf-8', doc_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                encoding='utf-8',
+                errors='replace',
                 timeout=30
             )
             if result.returncode == 0:
                 return result.stdout.strip()
             else:
-                self.logger.error(f"catdoc failed with return code {result.returncode}: {result.stderr}")
+                self.logger.error(f"catdoc failed with return code {result.returncode}")
                 return ""
         except subprocess.TimeoutExpired:
             self.logger.error("catdoc extraction timed out")
@@ -325,6 +482,7 @@ class EnhancedTextExtractor:
         """Extract text using textract (comprehensive document processing)"""
         if not TEXTRACT_AVAILABLE:
             raise ImportError("textract not available")
+        textract = _import_backend("textract")
         
         try:
             text = textract.process(doc_path).decode('utf-8')
@@ -335,16 +493,32 @@ class EnhancedTextExtractor:
 
     def decode_cid_patterns(self, text: str) -> str:
         """Decode CID patterns to readable text"""
-        decoded_text = text
-        
-        # Replace known CID mappings
-        for cid, char in self.cid_mappings.items():
-            decoded_text = decoded_text.replace(cid, char)
-        
-        # Remove any remaining unknown CID patterns
-        decoded_text = re.sub(r'\(cid:\d+\)', '', decoded_text)
+        # Form headers repeat the same encoded lines on every page, so decode
+        # line by line through a memoized helper
+        return "\n".join(
+            self._decode_span(line) if '(cid:' in line else line
+            for line in text.split("\n")
+        )
+
+    def _decode_span_uncached(self, text: str) -> str:
+        """Decode the CID patterns in one line of text"""
+        cid_table = self._cid_table
+        parts = []
+        last_end = 0
+        
+        # Single pass: copy text between matches, map known CIDs, drop unknown ones
+        for match in CID_PATTERN.finditer(text):
+            parts.append(text[last_end:match.start()])
+            cid = int(match.group(1))
+            if cid < CID_TABLE_SIZE and cid_table[cid]:
+                parts.append(cid_table[cid])
+            last_end = match.end()
+        
+        if not parts:
+            return text
         
-        return decoded_text
+        parts.append(text[last_end:])
+        return "".join(parts)
 
     def fix_garbled_text(self, text: str) -> str:
         """Fix common garbled text patterns"""
@@ -359,113 +533,248 @@ class EnhancedTextExtractor:
     def normalize_unicode(self, text: str) -> str:
         """Normalize unicode characters"""
         try:
-            # Normalize unicode to canonical form
-            normalized = unicodedata.normalize('NFKC', text)
+            # Normalize unicode to canonical form (a no-op for pure ASCII)
+            normalized = text if text.isascii() else unicodedata.normalize('NFKC', text)
             
             # Remove or replace problematic characters
-            normalized = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', normalized)
+            normalized = CONTROL_CHARS_PATTERN.sub('', normalized)
             
             return normalized
         except Exception as e:
             self.logger.warning(f"Unicode normalization failed: {e}")
             return text
 
+    def _needs_repair(self, text: str) -> bool:
+        """Cheap check for anything clean_extracted_text would fix beyond whitespace"""
+        return (
+            '(cid:' in text
+            or any(sentinel in text for sentinel in GARBLED_SENTINELS)
+            or not text.isascii()
+            or CONTROL_CHARS_PATTERN.search(text) is not None
+        )
+
     def clean_extracted_text(self, text: str) -> str:
         """Apply all text cleaning and preprocessing"""
         if not text:
             return ""
         
         # Step 1: Decode CID patterns
-        text = self.decode_cid_patterns(text)
+        if '(cid:' in text:
+            text = self.decode_cid_patterns(text)
         
         # Step 2: Fix garbled text patterns  
-        text = self.fix_garbled_text(text)
+        if any(sentinel in text for sentinel in GARBLED_SENTINELS):
+            text = self.fix_garbled_text(text)
         
         # Step 3: Normalize unicode
         text = self.normalize_unicode(text)
         
         # Step 4: Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single
-        text = re.sub(r'\n\s*\n', '\n\n', text)  # Multiple newlines to double
+        text = WHITESPACE_RUN_PATTERN.sub(' ', text)  # Multiple spaces to single
+        text = BLANK_LINES_PATTERN.sub('\n\n', text)  # Multiple newlines to double
         
         # Step 5: Remove excessive blank lines
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = EXCESS_NEWLINES_PATTERN.sub('\n\n', text)
         
         return text.strip()
 
-    def extract_text_with_fallback(self, file_path: str) -> Tuple[str, str]:
+    def pdf_backend_hint(self, source: Union[str, bytes]) -> Optional[str]:
+        """
+        Choose a backend_hint for a PDF from its page count
+        
+        Args:
+            source (str | bytes): Path to the PDF, or its content in memory
+            
+        Returns:
+            Optional[str]: "large_pdf" for long documents, None for the normal chain
+        """
+        if not PYMUPDF_AVAILABLE:
+            return None
+        try:
+            doc = self._open_pymupdf(_import_backend("fitz"), source)
+        except Exception:
+            return None
+        try:
+            page_count = doc.page_count
+        finally:
+            doc.close()
+        return "large_pdf" if page_count > LARGE_PDF_MIN_PAGES else None
+
+    def _methods_for(self, file_ext: str, backend_hint: Optional[str]):
+        """Backend chain for a file type, replaced by BACKEND_HINT_METHODS when hinted"""
+        if backend_hint is not None:
+            hinted = BACKEND_HINT_METHODS.get((file_ext, backend_hint))
+            if hinted is not None:
+                return hinted
+        return EXTRACTION_METHODS.get(file_ext)
+
+    def extract_text_with_fallback(self, file_path: str, backend_hint: Optional[str] = None) -> Tuple[str, str]:
         """
         Extract text using multiple methods with fallback for PDFs and Word documents
         
+        Results are cached on the file's modification time and size, so an
+        unchanged file is only parsed once per extractor instance.
+        
+        Args:
+            file_path (str): Path to the document
+            backend_hint (str): Optional key into BACKEND_HINT_METHODS, e.g. from pdf_backend_hint()
+        
         Returns:
             Tuple[str, str]: (extracted_text, method_used)
         """
-        file_ext = Path(file_path).suffix.lower()
-        
-        if file_ext == '.pdf':
-            methods = [
-                ("PyMuPDF", self.extract_text_pymupdf),
-                ("PyPDF2", self.extract_text_pypdf2),
-                ("pdfplumber", self.extract_text_pdfplumber), 
-                ("pdfminer", self.extract_text_pdfminer),
-            ]
-        elif file_ext == '.docx':
-            # Modern Word format (.docx) - use Office Open XML methods
-            methods = [
-                ("python-docx", self.extract_text_python_docx),
-                ("docx2txt", self.extract_text_docx2txt),
-                ("textract", self.extract_text_textract),
-            ]
-        elif file_ext == '.doc':
-            # Legacy Word format (.doc) - use binary format methods
-            methods = [
-                ("antiword", self.extract_text_antiword),
-                ("catdoc", self.extract_text_catdoc),
-                ("textract", self.extract_text_textract),
-                ("python-docx", self.extract_text_python_docx),  # Sometimes works
-                ("docx2txt", self.extract_text_docx2txt),        # Sometimes works
-            ]
-        else:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return self._extract_text_uncached(file_path, backend_hint)
+        return self._cached_extract(file_path, stat.st_mtime_ns, stat.st_size, backend_hint)
+
+    def _extract_for_stat(self, file_path: str, mtime_ns: int, size: int,
+                          backend_hint: Optional[str]) -> Tuple[str, str]:
+        """Cache entry point; mtime and size only participate in the cache key"""
+        return self._extract_text_uncached(file_path, backend_hint)
+
+    def _extract_text_uncached(self, file_path: str, backend_hint: Optional[str] = None) -> Tuple[str, str]:
+        """Run the extraction backends for file_path in fallback order"""
+        file_ext = os.path.splitext(file_path)[1].lower()
+        methods = self._methods_for(file_ext, backend_hint)
+        
+        if methods is None:
+            self.logger.error(f"Unsupported file format: {file_ext}")
+            return "", "unsupported"
+        
+        check_page_count = file_ext == '.pdf' and backend_hint is None
+        return self._run_methods(methods, lambda method_attr: file_path, check_page_count)
+
+    def extract_text_with_fallback_bytes(self, data: bytes, suffix: str,
+                                         backend_hint: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Extract text from an in-memory document, e.g. a storage bucket download
+        
+        PDF and .docx backends read the bytes directly; only the backends in
+        PATH_ONLY_METHODS get a temporary file, written on first use.
+        
+        Args:
+            data (bytes): Document content
+            suffix (str): File extension including the dot, e.g. ".pdf"
+            backend_hint (str): Optional key into BACKEND_HINT_METHODS, e.g. from pdf_backend_hint()
+            
+        Returns:
+            Tuple[str, str]: (extracted_text, method_used)
+        """
+        file_ext = suffix.lower()
+        methods = self._methods_for(file_ext, backend_hint)
+        
+        if methods is None:
             self.logger.error(f"Unsupported file format: {file_ext}")
             return "", "unsupported"
         
-        for method_name, method_func in methods:
+        temp_path = None
+        
+        def source_for(method_attr: str) -> Union[str, bytes]:
+            nonlocal temp_path
+            if method_attr not in PATH_ONLY_METHODS:
+                return data
+            if temp_path is None:
+                with tempfile.NamedTemporaryFile(suffix=file_ext, delete=False) as temp_file:
+                    temp_file.write(data)
+                temp_path = temp_file.name
+            return temp_path
+        
+        try:
+            return self._run_methods(methods, source_for, file_ext == '.pdf' and backend_hint is None)
+        finally:
+            if temp_path is not None:
+                os.unlink(temp_path)
+
+    def _run_methods(self, methods, source_for, check_page_count: bool = False) -> Tuple[str, str]:
+        """
+        Try each (name, method) in order and return the first viable, cleaned text
+        
+        With check_page_count, a PDF whose first backend fails has its page
+        count read once; long documents then fall back only along the
+        large_pdf chain. PDFs PyMuPDF handles are never opened a second time.
+        """
+        allowed = None
+        for method_name, method_attr in methods:
+            if allowed is not None and (method_name, method_attr) not in allowed:
+                continue
             try:
-                text = method_func(file_path)
+                text = getattr(self, method_attr)(source_for(method_attr))
                 if text and len(text.strip()) > 50:  # Minimum viable text (lower for Word docs)
-                    cleaned_text = self.clean_extracted_text(text)
+                    if self._needs_repair(text):
+                        cleaned_text = self.clean_extracted_text(text)
+                    else:
+                        # Clean ASCII output: whitespace collapse is all cleanup would do
+                        cleaned_text = WHITESPACE_RUN_PATTERN.sub(' ', text).strip()
                     self.logger.info(f"Successfully extracted text using {method_name}")
                     return cleaned_text, method_name
             except ImportError:
                 self.logger.warning(f"{method_name} not available")
-                continue
             except Exception as e:
                 self.logger.warning(f"{method_name} failed: {e}")
-                continue
+            
+            if check_page_count:
+                check_page_count = False
+                hint = self.pdf_backend_hint(source_for(method_attr))
+                allowed = BACKEND_HINT_METHODS.get((".pdf", hint)) if hint else None
         
         return "", "none"
 
+    def _count_encoding_markers(self, text: str) -> Tuple[int, int]:
+        """
+        Count CID markers and distinct garbled patterns in one pass over text
+        
+        Returns:
+            Tuple[int, int]: (cid_count, garbled_pattern_count)
+        """
+        if '(cid:' not in text and self._garbled_prefix_pattern.search(text) is None:
+            return 0, 0
+        
+        cid_count = 0
+        garbled_found = set()
+        
+        for match in self._quality_pattern.finditer(text):
+            if match.group(1) is not None:  # CID alternative matched
+                cid_count += 1
+            else:
+                garbled_found.add(match.group(0))
+        
+        for token in list(garbled_found):
+            garbled_found |= self._garbled_contains[token]
+        
+        return cid_count, len(garbled_found)
+
     def analyze_text_quality(self, text: str) -> Dict[str, Any]:
         """Analyze the quality of extracted text"""
         if not text:
             return {"quality": "empty", "issues": ["No text extracted"]}
         
         issues = []
+        text_length = len(text)
+        
+        # Large documents are judged on their head and tail; counts are scaled back up
+        if text_length > 2 * QUALITY_SAMPLE_CHARS:
+            sample = text[:QUALITY_SAMPLE_CHARS] + text[-QUALITY_SAMPLE_CHARS:]
+        else:
+            sample = text
+        scale = text_length / len(sample)
+        
+        cid_count, garbled_patterns = self._count_encoding_markers(sample)
+        cid_count = round(cid_count * scale)
         
         # Check for CID patterns
-        cid_count = len(re.findall(r'\(cid:\d+\)', text))
         if cid_count > 0:
             issues.append(f"Contains {cid_count} CID patterns")
         
         # Check for garbled text patterns
-        garbled_patterns = sum(1 for pattern in self.char_replacements.keys() if pattern in text)
         if garbled_patterns > 0:
             issues.append(f"Contains {garbled_patterns} garbled patterns")
         
         # Check for character encoding issues
-        non_ascii = sum(1 for char in text if ord(char) > 127)
-        if non_ascii > len(text) * 0.1:  # More than 10% non-ASCII
-            issues.append(f"High non-ASCII character ratio: {non_ascii}/{len(text)}")
+        non_ascii = 0 if sample.isascii() else len(sample) - len(sample.encode('ascii', 'ignore'))
+        non_ascii = round(non_ascii * scale)
+        if non_ascii > text_length * 0.1:  # More than 10% non-ASCII
+            issues.append(f"High non-ASCII character ratio: {non_ascii}/{text_length}")
         
         # Determine quality
         if not issues:
@@ -478,10 +787,10 @@ class EnhancedTextExtractor:
         return {
             "quality": quality,
             "issues": issues,
-            "length": len(text),
+            "length": text_length,
             "cid_patterns": cid_count,
             "garbled_patterns": garbled_patterns,
-            "non_ascii_ratio": non_ascii / len(text) if text else 0
+            "non_ascii_ratio": non_ascii / text_length
         }
 
 
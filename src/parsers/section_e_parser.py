@@ -4,163 +4,62 @@ Standard Form 330 Section E Resume Parser using OpenAI API for structured extrac
 
 This script processes PDF and Word document resumes in Standard Form 330 Section E format by:
 1. Using enhanced text extraction for PDF and Word documents (.pdf, .docx, .doc)
-2. Sending the text to OpenAI GPT-4-turbo to extract structured data
+2. Sending the text to OpenAI gpt-4o-mini to extract structured data
 
 Requirements:
 - OPENAI_API_KEY environment variable must be set
-- pip install openai pdfminer.six python-dotenv python-docx docx2txt pymupdf pdfplumber
+- pip install openai orjson pdfminer.six python-dotenv python-docx docx2txt pymupdf pdfplumber
 
 Usage:
-python section_e_parser.py --folder /path/to/resumes --output results.json
+python section_e_parser.py --folder /path/to/resumes --output results.json [--concurrency 20]
 """
 
 import os
 import sys
-import json
+import orjson
+import asyncio
 import argparse
+from operator import attrgetter
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 # Add project root to Python path for src module imports
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
-from src.parsers.enhanced_text_extractor import EnhancedTextExtractor
+from src.parsers._parser_core import (
+    FATAL_OPENAI_ERRORS,
+    OPENAI_MAX_RETRIES,
+    OPENAI_TIMEOUT_SECONDS,
+    parse_resume as parse_resume_with_openai,
+    extract_text as extract_text_from_document,
+    looks_like_resume,
+)
 
-# System prompt for OpenAI to extract structured data from resumes
-SYSTEM_PROMPT = """You are a structured resume parser for U.S. Government Standard Form 330 Section E resumes.
-Extract the following fields from the provided text and return them as a JSON object.
+# Maximum number of OpenAI requests in flight at once
+DEFAULT_CONCURRENCY = 20
 
-IMPORTANT PARSING INSTRUCTIONS:
-- Look for ACTUAL detailed project descriptions, NOT placeholder text
-- Ignore text like "Brief scope, size, cost, etc." - find the real project details
-- For project scope, extract the detailed technical description that follows "Scope:" 
-- Extract specific technical details, methodologies, and project deliverables
-- For costs and fees, look for actual dollar amounts (e.g., "$4.1M", "$349k")
-- If information is not provided or unclear, use empty string "" rather than placeholder text
+# Tuple for messages, frozenset for per-file membership tests
+SUPPORTED_SUFFIXES = ('.pdf', '.docx', '.doc')
+SUPPORTED_EXTENSIONS = frozenset(SUPPORTED_SUFFIXES)
 
-{
-  "name": "",
-  "role_in_contract": "",
-  "years_experience": {
-    "total": "",
-    "with_current_firm": ""
-  },
-  "firm_name_and_location": "",
-  "education": "",
-  "current_professional_registration": "",
-  "other_professional_qualifications": "",
-  "relevant_projects": [
-    {
-      "title_and_location": "",
-      "year_completed": {
-        "professional_services": "",
-        "construction": ""
-      },
-      "description": {
-        "scope": "",  
-        "cost": "",
-        "fee": "",
-        "role": ""
-      }
-    }
-  ]
-}
 
-CRITICAL: For the "scope" field, extract the FULL detailed project description that appears after "Scope:" in the document. 
-This should include specific technical details about what work was performed, methodologies used, project components, etc.
-DO NOT use placeholder text like "Brief scope, size, cost, etc." - extract the actual detailed project information.
-
-There can be multiple relevant projects. Use best effort to extract and normalize each section.
-Return only the JSON object, no additional text or formatting."""
-
-
-def parse_resume_with_openai(client: OpenAI, text: str) -> dict:
-    """
-    Parse resume text using OpenAI GPT-4-turbo
-    
-    Args:
-        client (OpenAI): OpenAI client instance
-        text (str): Extracted PDF text
-        
-    Returns:
-        dict: Parsed resume data as dictionary
-    """
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4-turbo",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": text}
-            ],
-            temperature=0,
-            max_tokens=4000
-        )
-        content = response.choices[0].message.content
-        
-        # Check if content is valid
-        if not content:
-            print("Error: Empty response from OpenAI")
-            return {}
-        
-        # Try to parse the JSON response
-        parsed_data = json.loads(content)
-        return parsed_data
-        
-    except json.JSONDecodeError as e:
-        print(f"JSON parsing failed: {e}")
-        content_preview = content[:200] if content else "None"
-        print(f"Raw response: {content_preview}...")
-        return {}
-    except Exception as e:
-        print(f"OpenAI parsing failed: {e}")
-        return {}
-
-
-def extract_text_from_document(file_path: str) -> str:
-    """
-    Extract text from PDF or Word document using enhanced extraction with encoding fixes
-    
-    Args:
-        file_path (str): Path to PDF or Word document file
-        
-    Returns:
-        str: Extracted and cleaned text content
-    """
-    try:
-        extractor = EnhancedTextExtractor()
-        text, method_used = extractor.extract_text_with_fallback(file_path)
-        
-        if text:
-            file_type = Path(file_path).suffix.upper()
-            print(f"  ✓ {file_type} text extracted using {method_used} (length: {len(text)})")
-            
-            # Analyze text quality for reporting
-            quality = extractor.analyze_text_quality(text)
-            if quality['issues']:
-                print(f"  ⚠ Text quality: {quality['quality']} - {', '.join(quality['issues'])}")
-            else:
-                print(f"  ✓ Text quality: {quality['quality']}")
-                
-            return text
-        else:
-            print(f"  ✗ Failed to extract text using enhanced extractor")
-            return ""
-            
-    except Exception as e:
-        print(f"Error extracting text from {file_path}: {e}")
-        return ""
-
-
-def process_resume(client: OpenAI, file_path: Path) -> dict:
+async def process_resume(semaphore: asyncio.Semaphore, client: AsyncOpenAI, file_path: Path,
+                         processed_at: str, extract_pool: Optional[Executor] = None) -> dict:
     """
     Process a single resume file (PDF or Word document)
     
     Args:
-        client (OpenAI): OpenAI client instance
+        semaphore (asyncio.Semaphore): Gate bounding concurrent OpenAI requests
+        client (AsyncOpenAI): Async OpenAI client instance
         file_path (Path): Path to resume file
+        processed_at (str): Run timestamp recorded on the result
+        extract_pool (Executor): Optional process pool for CPU-bound text extraction;
+            defaults to the event loop's thread pool
         
     Returns:
         dict: Processing result with filename, data, and metadata
@@ -168,53 +67,146 @@ def process_resume(client: OpenAI, file_path: Path) -> dict:
     print(f"Processing {file_path.name}...")
     
     try:
-        # Extract text from document
-        text = extract_text_from_document(str(file_path))
+        # Extract text from document (off the event loop, extraction is blocking)
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(extract_pool, extract_text_from_document, str(file_path))
         if not text:
             print(f"Warning: No text extracted from {file_path.name}")
             return {
                 "filename": file_path.name,
                 "error": "No text extracted from document",
-                "processed_at": datetime.utcnow().isoformat()
+                "processed_at": processed_at
+            }
+        
+        if not looks_like_resume(text):
+            print(f"Warning: Skipping {file_path.name}, text too short or not a resume")
+            return {
+                "filename": file_path.name,
+                "error": "text too short or non-resume",
+                "processed_at": processed_at
             }
         
         # Parse with OpenAI
-        parsed_data = parse_resume_with_openai(client, text)
+        async with semaphore:
+            parsed_data = await parse_resume_with_openai(client, text)
         
         if not parsed_data:
             return {
                 "filename": file_path.name,
                 "error": "Failed to parse resume data",
-                "processed_at": datetime.utcnow().isoformat()
+                "processed_at": processed_at
             }
         
         return {
             "filename": file_path.name,
             "data": parsed_data,
-            "processed_at": datetime.utcnow().isoformat()
+            "processed_at": processed_at
         }
         
+    except FATAL_OPENAI_ERRORS:
+        raise
     except Exception as e:
         print(f"Failed to process {file_path.name}: {e}")
         return {
             "filename": file_path.name,
             "error": str(e),
-            "processed_at": datetime.utcnow().isoformat()
+            "processed_at": processed_at
         }
 
 
+async def process_all_resumes(client: AsyncOpenAI, resume_files: list, max_concurrency: int,
+                              output_path: str, processed_at: str) -> Tuple[int, int]:
+    """
+    Process resume files concurrently with at most max_concurrency OpenAI calls in flight
+    
+    Text extraction is CPU-bound and holds the GIL in the pure-Python backends,
+    so multi-file runs spread it over a process pool, one worker per core.
+    
+    Results are appended to the output JSON in input order as soon as every
+    earlier file has finished, so the file is the same from run to run; only
+    results that finish ahead of an earlier file wait in memory.
+    The results are written to a temporary file next to output_path, which
+    replaces output_path only once the JSON is complete, so an aborted run never
+    leaves a truncated file behind.
+    
+    Args:
+        client (AsyncOpenAI): Async OpenAI client instance
+        resume_files (list): Paths of resume files to process
+        max_concurrency (int): Maximum number of concurrent OpenAI requests
+        output_path (str): Output JSON file path
+        processed_at (str): Run timestamp recorded on every result
+        
+    Returns:
+        Tuple[int, int]: Number of successful and failed files
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    successful = 0
+    failed = 0
+    
+    # A single file is not worth the worker start-up cost
+    extract_pool = ProcessPoolExecutor(max_workers=os.cpu_count()) if len(resume_files) > 1 else None
+    temp_path = f"{output_path}.tmp"
+    tasks = []
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(b'{\n  "resumes": [')
+            separator = b"\n    "
+            
+            tasks = [
+                asyncio.create_task(process_resume(semaphore, client, file_path, processed_at, extract_pool))
+                for file_path in resume_files
+            ]
+            for task in tasks:
+                result = await task
+                if "error" in result:
+                    failed += 1
+                    print(f"  ✗ Failed to process {result['filename']}")
+                else:
+                    successful += 1
+                    print(f"  ✓ Successfully processed {result['filename']}")
+                
+                f.write(separator + orjson.dumps(result))
+                separator = b",\n    "
+            
+            metadata = {
+                "total_files": len(resume_files),
+                "successful": successful,
+                "failed": failed,
+                "processed_at": processed_at
+            }
+            f.write(b"\n  ],\n  \"metadata\": " + orjson.dumps(metadata) + b"\n}\n")
+        os.replace(temp_path, output_path)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        # Leave any previous output untouched rather than a half-written array
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        if extract_pool is not None:
+            extract_pool.shutdown()
+    
+    return successful, failed
+
+
 def main():
     """Main function to process all PDFs in a folder"""
     # Load environment variables
     load_dotenv()
     
+    # One timestamp identifies the whole run
+    run_ts = datetime.now(timezone.utc).isoformat()
+    
     # Set up command line arguments
     parser = argparse.ArgumentParser(
-        description="Parse Standard Form 330 Section E resumes (PDF and Word docs) using OpenAI GPT-4-turbo"
+        description="Parse Standard Form 330 Section E resumes (PDF and Word docs) using OpenAI gpt-4o-mini"
     )
     parser.add_argument("--folder", required=True, help="Path to folder containing resume files (PDF, DOCX, DOC)")
     parser.add_argument("--output", required=True, help="Output JSON file path")
     parser.add_argument("--file", help="Process only this specific file (optional)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum concurrent OpenAI requests (default: {DEFAULT_CONCURRENCY})")
     args = parser.parse_args()
 
     # Initialize OpenAI client
@@ -225,7 +217,7 @@ def main():
         print("OPENAI_API_KEY=your_api_key_here")
         return
 
-    client = OpenAI(api_key=api_key)
+    client = AsyncOpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES, timeout=OPENAI_TIMEOUT_SECONDS)
     
     # Find resume files (PDF and Word documents)
     folder_path = Path(args.folder)
@@ -233,33 +225,31 @@ def main():
         print(f"Error: Folder {args.folder} does not exist.")
         return
     
-    # Supported file extensions
-    supported_extensions = ['.pdf', '.docx', '.doc']
-    
     if args.file:
         # Process only the specified file
         target_file = folder_path / args.file
         if not target_file.exists():
             print(f"Error: File {args.file} not found in {args.folder}")
             return
-        if target_file.suffix.lower() not in supported_extensions:
-            print(f"Error: {args.file} is not a supported file type. Supported: {', '.join(supported_extensions)}")
+        if target_file.suffix.lower() not in SUPPORTED_EXTENSIONS:
+            print(f"Error: {args.file} is not a supported file type. Supported: {', '.join(SUPPORTED_SUFFIXES)}")
             return
         resume_files = [target_file]
         print(f"Processing single file: {args.file}")
     else:
-        # Process all supported files in folder
-        resume_files = []
-        for ext in supported_extensions:
-            resume_files.extend(folder_path.glob(f"*{ext}"))
+        # Process all supported files in folder (one directory scan for every extension)
+        resume_files = [
+            Path(entry.path) for entry in os.scandir(folder_path)
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS
+        ]
         
         if not resume_files:
             print(f"No supported resume files found in {args.folder}")
-            print(f"Supported formats: {', '.join(supported_extensions)}")
+            print(f"Supported formats: {', '.join(SUPPORTED_SUFFIXES)}")
             return
         
         # Sort files for consistent processing order
-        resume_files.sort(key=lambda x: x.name)
+        resume_files.sort(key=attrgetter('name'))
         
         # Show breakdown by file type
         file_counts = {}
@@ -271,36 +261,14 @@ def main():
         for ext, count in file_counts.items():
             print(f"  {ext.upper()}: {count} files")
     
-    # Process all resume files
-    results = []
-    successful = 0
-    failed = 0
-    
-    for file_path in resume_files:
-        result = process_resume(client, file_path)
-        results.append(result)
-        
-        if "error" in result:
-            failed += 1
-            print(f"  ✗ Failed to process {file_path.name}")
-        else:
-            successful += 1
-            print(f"  ✓ Successfully processed {file_path.name}")
-    
-    # Create final output with metadata
-    output_data = {
-        "resumes": results,
-        "metadata": {
-            "total_files": len(resume_files),
-            "successful": successful,
-            "failed": failed,
-            "processed_at": datetime.utcnow().isoformat()
-        }
-    }
-
-    # Save results
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    # Process all resume files, streaming results into the output file
+    try:
+        successful, failed = asyncio.run(
+            process_all_resumes(client, resume_files, max(1, args.concurrency), args.output, run_ts)
+        )
+    except FATAL_OPENAI_ERRORS as e:
+        print(f"❌ OpenAI rejected the request, stopping: {e}")
+        sys.exit(1)
 
     print(f"\n🎉 Processing complete!")
     print(f"Results saved to: {args.output}")
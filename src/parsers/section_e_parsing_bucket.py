@@ -4,36 +4,54 @@ Standard Form 330 Section E Resume Parser for Supabase Storage Bucket
 
 This script processes PDF and Word document resumes stored in a Supabase bucket by:
 1. Connecting to Supabase storage bucket "msmm-resumes"
-2. Downloading files temporarily for processing
+2. Downloading files into memory and extracting their text without touching disk
 3. Using the same parsing logic as section_e_parser.py
 4. Uploading results JSON to "ParsedFiles" folder in the same bucket
-5. Cleaning up temporary files
+5. Removing the run checkpoint once the results are saved
 
 Requirements:
 - SUPABASE_URL and SUPABASE_KEY environment variables must be set
-- pip install supabase openai pdfminer.six python-dotenv python-docx docx2txt pymupdf pdfplumber
+- pip install supabase openai orjson pdfminer.six python-dotenv python-docx docx2txt pymupdf pdfplumber
 
 Usage:
-python section_e_parsing_bucket.py --output parsed_results.json
+python section_e_parsing_bucket.py --output parsed_results.json [--concurrency 20]
+
+Finished results are appended to <output>.checkpoint.jsonl as they complete. If a run
+dies, rerunning with the same --output skips every file already parsed successfully.
 """
 
 import os
 import sys
-import json
+import hashlib
+import orjson
+import time
+import random
+import asyncio
 import argparse
-import tempfile
-import shutil
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
 
 # Add project root to Python path for src module imports
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
-from src.parsers.enhanced_text_extractor import EnhancedTextExtractor
+from src.parsers._parser_core import (
+    FATAL_OPENAI_ERRORS,
+    OPENAI_TIMEOUT_SECONDS,
+    SYSTEM_PROMPT,
+    RESUME_REQUEST_VERSION,
+    MAX_COMPLETION_TOKENS,
+    RESUME_RESPONSE_FORMAT,
+    build_chat_request,
+    request_fingerprint,
+    decode_json_response,
+    extract_text,
+    looks_like_resume,
+)
 
 try:
     from supabase import create_client, Client
@@ -41,81 +59,175 @@ except ImportError:
     print("Missing required package. Please install: pip install supabase")
     exit(1)
 
-# System prompt for OpenAI (same as original parser)
-SYSTEM_PROMPT = """You are a structured resume parser for U.S. Government Standard Form 330 Section E resumes.
-Extract the following fields from the provided text and return them as a JSON object.
+# Maximum number of OpenAI requests in flight at once
+DEFAULT_CONCURRENCY = 20
+
+# OpenAI quota pacing (see openai-cookbook api_request_parallel_processor.py)
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 500
+DEFAULT_MAX_TOKENS_PER_MINUTE = 150_000
+DEFAULT_MAX_ATTEMPTS = 5
+SECONDS_TO_PAUSE_AFTER_RATE_LIMIT_ERROR = 15
+SECONDS_TO_SLEEP_EACH_LOOP = 0.05
+
+# Batch mode packs several resumes into one request; the shared prompt is sent
+# once per batch. Each resume needs its own MAX_COMPLETION_TOKENS of output, and
+# the model's completion limit caps the whole reply, so that bounds the batch too.
+DEFAULT_BATCH_SIZE = 1
+MAX_BATCH_INPUT_TOKENS = 80_000
+MAX_BATCH_COMPLETION_TOKENS = 16_384
+MAX_BATCH_DOCUMENTS = MAX_BATCH_COMPLETION_TOKENS // MAX_COMPLETION_TOKENS
+BATCH_RESUME_DELIMITER = "===RESUME {filename}==="
+
+# Errors worth retrying; anything else fails the file immediately (FATAL_OPENAI_ERRORS stop the run)
+RETRYABLE_OPENAI_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
 
-IMPORTANT PARSING INSTRUCTIONS:
-- Look for ACTUAL detailed project descriptions, NOT placeholder text
-- Ignore text like "Brief scope, size, cost, etc." - find the real project details
-- For project scope, extract the detailed technical description that follows "Scope:" 
-- Extract specific technical details, methodologies, and project deliverables
-- For costs and fees, look for actual dollar amounts (e.g., "$4.1M", "$349k")
-- If information is not provided or unclear, use empty string "" rather than placeholder text
+# Batch variant keeps SYSTEM_PROMPT as its unchanged prefix
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + """
 
-{
-  "name": "",
-  "role_in_contract": "",
-  "years_experience": {
-    "total": "",
-    "with_current_firm": ""
-  },
-  "firm_name_and_location": "",
-  "education": "",
-  "current_professional_registration": "",
-  "other_professional_qualifications": "",
-  "relevant_projects": [
-    {
-      "title_and_location": "",
-      "year_completed": {
-        "professional_services": "",
-        "construction": ""
-      },
-      "description": {
-        "scope": "",  
-        "cost": "",
-        "fee": "",
-        "role": ""
-      }
-    }
-  ]
-}
+BATCH MODE: The user message contains several resumes, each introduced by a line of the form
+"===RESUME <filename>===". Return a single JSON object whose keys are the filenames exactly as given
+and whose values are the JSON objects described above for each resume."""
 
-CRITICAL: For the "scope" field, extract the FULL detailed project description that appears after "Scope:" in the document. 
-This should include specific technical details about what work was performed, methodologies used, project components, etc.
-DO NOT use placeholder text like "Brief scope, size, cost, etc." - extract the actual detailed project information.
+# Batch replies are keyed by filename, which a fixed schema cannot express
+BATCH_RESPONSE_FORMAT = {"type": "json_object"}
 
-There can be multiple relevant projects. Use best effort to extract and normalize each section.
-Return only the JSON object, no additional text or formatting."""
+# Batch results were never validated against RESUME_SCHEMA, so they are cached
+# apart from single-resume results and only read back by batch runs
+BATCH_REQUEST_VERSION = request_fingerprint(BATCH_SYSTEM_PROMPT, BATCH_RESPONSE_FORMAT)
+
+
+class APIRateLimiter:
+    """
+    Token-bucket pacing for OpenAI requests per minute and tokens per minute
+    
+    Capacity refills continuously at rate/60 per second, so requests are spread
+    out ahead of time instead of being bounced back as 429s.
+    """
+    
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = max_requests_per_minute
+        self.available_token_capacity = max_tokens_per_minute
+        self.last_update_time = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.available_request_capacity = min(
+            self.available_request_capacity + elapsed * self.max_requests_per_minute / 60.0,
+            self.max_requests_per_minute
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + elapsed * self.max_tokens_per_minute / 60.0,
+            self.max_tokens_per_minute
+        )
+        self.last_update_time = now
+    
+    async def acquire(self, token_estimate: int) -> None:
+        """Wait until one request and token_estimate tokens of capacity are available"""
+        # A single oversized request may use the whole bucket but never wait forever
+        token_estimate = min(token_estimate, self.max_tokens_per_minute)
+        
+        # Holding the lock while waiting keeps callers in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                
+                self._refill()
+                if self.available_request_capacity >= 1 and self.available_token_capacity >= token_estimate:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= token_estimate
+                    return
+                
+                await asyncio.sleep(SECONDS_TO_SLEEP_EACH_LOOP)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every new request after the API reports a rate limit"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
 
 
 class SupabaseBucketParser:
     """Parse resumes from Supabase storage bucket"""
     
-    def __init__(self, supabase_url: str, supabase_key: str, openai_client: OpenAI):
+    # Tuple for str.endswith, frozenset for per-file membership tests
+    SUPPORTED_SUFFIXES: tuple = ('.pdf', '.docx', '.doc')
+    SUPPORTED_EXTENSIONS: frozenset = frozenset(SUPPORTED_SUFFIXES)
+    
+    def __init__(self, supabase_url: str, supabase_key: str, openai_client: AsyncOpenAI,
+                 max_concurrency: int = DEFAULT_CONCURRENCY,
+                 max_requests_per_minute: float = DEFAULT_MAX_REQUESTS_PER_MINUTE,
+                 max_tokens_per_minute: float = DEFAULT_MAX_TOKENS_PER_MINUTE,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 checkpoint_path: Optional[str] = None):
         """
         Initialize the bucket parser
         
         Args:
             supabase_url (str): Supabase project URL
             supabase_key (str): Supabase service role key
-            openai_client (OpenAI): OpenAI client instance
+            openai_client (AsyncOpenAI): Async OpenAI client instance
+            max_concurrency (int): Maximum number of concurrent OpenAI requests
+            max_requests_per_minute (float): OpenAI request quota to pace against
+            max_tokens_per_minute (float): OpenAI token quota to pace against
+            max_attempts (int): Attempts per file for rate-limited or failed requests
+            batch_size (int): Resumes packed into each OpenAI request, at most MAX_BATCH_DOCUMENTS
+            checkpoint_path (str): JSONL file finished results are appended to, and
+                resumed from on the next run; None disables checkpointing
         """
         self.supabase: Client = create_client(supabase_url, supabase_key)
         self.openai_client = openai_client
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = APIRateLimiter(max_requests_per_minute, max_tokens_per_minute)
+        self.max_attempts = max(1, max_attempts)
+        self.batch_size = min(max(1, batch_size), MAX_BATCH_DOCUMENTS)
         self.bucket_name = "msmm-resumes"
         self.parsed_files_folder = "ParsedFiles"
-        self.supported_extensions = ['.pdf', '.docx', '.doc']
         
-        # Create temporary directory for processing
-        self.temp_dir = Path(tempfile.mkdtemp(prefix="section_e_parser_"))
-        print(f"Created temporary directory: {self.temp_dir}")
+        # Completed results are appended here as they finish, so a crashed run can resume
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+    
+    def load_checkpoint(self) -> Dict[str, dict]:
+        """
+        Read the results a previous, interrupted run finished successfully
+        
+        A line cut short by the crash is discarded; failed results are dropped
+        so those files are tried again.
+        
+        Returns:
+            dict: Results keyed by filename
+        """
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return {}
+        
+        results = {}
+        complete_length = 0
+        with open(self.checkpoint_path, "r+b") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Drop the partial line so this run's appends start on a fresh one
+                    f.truncate(complete_length)
+                    break
+                complete_length += len(line)
+                try:
+                    result = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                if isinstance(result, dict) and "filename" in result and "error" not in result:
+                    results[result["filename"]] = result
+        return results
     
-    def cleanup(self):
-        """Clean up temporary directory"""
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir)
-            print(f"Cleaned up temporary directory: {self.temp_dir}")
+    def remove_checkpoint(self) -> None:
+        """Delete the checkpoint once the run's results have been saved"""
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+            print(f"Removed checkpoint: {self.checkpoint_path}")
     
     def list_bucket_files(self) -> list:
         """
@@ -139,7 +251,7 @@ class SupabaseBucketParser:
                 file_path = Path(file_name)
                 
                 # Skip directories and unsupported files
-                if file_path.suffix.lower() in self.supported_extensions:
+                if file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
                     resume_files.append(file_name)
             
             return resume_files
@@ -148,15 +260,15 @@ class SupabaseBucketParser:
             print(f"Error listing bucket files: {e}")
             return []
     
-    def download_file(self, file_path: str) -> Path:
+    def download_bytes(self, file_path: str) -> Tuple[bytes, str]:
         """
-        Download a file from the bucket to temporary directory
+        Download a file from the bucket into memory
         
         Args:
             file_path (str): Path to file in bucket
             
         Returns:
-            Path: Local path to downloaded file
+            Tuple[bytes, str]: File content and its SHA-256
         """
         try:
             # Download file from bucket
@@ -165,18 +277,61 @@ class SupabaseBucketParser:
             if not response:
                 raise Exception(f"Failed to download {file_path}")
             
-            # Save to temporary directory
-            local_file_path = self.temp_dir / Path(file_path).name
-            with open(local_file_path, 'wb') as f:
-                f.write(response)
+            content_hash = hashlib.sha256(response).hexdigest()
             
-            print(f"  📥 Downloaded {file_path} to {local_file_path}")
-            return local_file_path
+            print(f"  📥 Downloaded {file_path} ({len(response)} bytes)")
+            return response, content_hash
             
         except Exception as e:
             print(f"Error downloading {file_path}: {e}")
             raise
     
+    def cache_path(self, content_hash: str, request_version: str = RESUME_REQUEST_VERSION) -> str:
+        """Bucket path of the cached parse for a document; the request fingerprint invalidates old entries"""
+        return f"{self.parsed_files_folder}/cache/{request_version}_{content_hash}.json"
+    
+    def cache_get(self, content_hash: str) -> Optional[dict]:
+        """
+        Look up a previously parsed document by content hash
+        
+        Schema-validated single-resume results are preferred; batch runs also
+        accept results cached by earlier batch requests.
+        
+        Args:
+            content_hash (str): SHA-256 of the document bytes
+            
+        Returns:
+            Optional[dict]: Cached resume data, or None on a miss
+        """
+        request_versions = [RESUME_REQUEST_VERSION]
+        if self.batch_size > 1:
+            request_versions.append(BATCH_REQUEST_VERSION)
+        
+        for request_version in request_versions:
+            try:
+                response = self.supabase.storage.from_(self.bucket_name).download(
+                    self.cache_path(content_hash, request_version)
+                )
+                cached = orjson.loads(response) if response else None
+            except Exception:
+                continue
+            if isinstance(cached, dict) and cached:
+                return cached
+        return None
+    
+    def cache_put(self, content_hash: str, parsed_data: dict,
+                  request_version: str = RESUME_REQUEST_VERSION) -> None:
+        """Store parsed resume data under the document's content hash and the request that produced it"""
+        try:
+            self.supabase.storage.from_(self.bucket_name).upload(
+                self.cache_path(content_hash, request_version),
+                orjson.dumps(parsed_data)
+            )
+        except Exception as e:
+            # Content-addressed: an existing entry already holds the same result
+            if "already exists" not in str(e).lower():
+                print(f"  ⚠ Could not cache parse result: {e}")
+    
     def upload_results(self, json_data: dict, output_filename: str) -> bool:
         """
         Upload parsing results to the ParsedFiles folder in the bucket
@@ -189,28 +344,22 @@ class SupabaseBucketParser:
             bool: Success status
         """
         try:
-            # Convert to JSON string
-            json_content = json.dumps(json_data, indent=2, ensure_ascii=False)
-            json_bytes = json_content.encode('utf-8')
+            # Serialize straight to UTF-8 bytes
+            json_bytes = orjson.dumps(json_data, option=orjson.OPT_INDENT_2)
             
             # Upload to ParsedFiles folder
             bucket_path = f"{self.parsed_files_folder}/{output_filename}"
             
-            # Try to upload (upsert to overwrite if exists)
-            try:
-                response = self.supabase.storage.from_(self.bucket_name).upload(
-                    bucket_path, 
-                    json_bytes
-                )
-            except Exception as upload_error:
-                # If upload fails, try to update existing file
-                if "already exists" in str(upload_error).lower():
-                    response = self.supabase.storage.from_(self.bucket_name).update(
-                        bucket_path,
-                        json_bytes
-                    )
-                else:
-                    raise upload_error
+            # Single upsert request overwrites any previous results; no caching so readers see fresh data
+            response = self.supabase.storage.from_(self.bucket_name).upload(
+                bucket_path,
+                json_bytes,
+                file_options={
+                    "content-type": "application/json",
+                    "cache-control": "0",
+                    "upsert": "true"
+                }
+            )
             
             if response:
                 print(f"  ✅ Uploaded results to {bucket_path}")
@@ -223,9 +372,35 @@ class SupabaseBucketParser:
             print(f"Error uploading results: {e}")
             return False
     
-    def parse_resume_with_openai(self, text: str) -> dict:
+    async def _create_chat_completion(self, request: dict, token_estimate: int):
+        """
+        Send one chat completion, paced by the rate limiter and retried with
+        exponential backoff on rate limits, server errors and dropped connections
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            await self.rate_limiter.acquire(token_estimate)
+            try:
+                return await self.openai_client.chat.completions.create(**request)
+            except RETRYABLE_OPENAI_ERRORS as e:
+                if isinstance(e, RateLimitError):
+                    self.rate_limiter.pause(SECONDS_TO_PAUSE_AFTER_RATE_LIMIT_ERROR)
+                if attempt == self.max_attempts:
+                    raise
+                delay = 2 ** attempt + random.uniform(0, 1)
+                print(f"  ⏳ OpenAI {type(e).__name__}, retrying in {delay:.1f}s "
+                      f"(attempt {attempt}/{self.max_attempts})")
+                await asyncio.sleep(delay)
+    
+    def write_checkpoint(self, result: dict) -> None:
+        """Append a finished result to the JSONL checkpoint file"""
+        if self.checkpoint_path is None:
+            return
+        with open(self.checkpoint_path, "ab") as f:
+            f.write(orjson.dumps(result) + b"\n")
+    
+    async def parse_resume_with_openai(self, text: str) -> dict:
         """
-        Parse resume text using OpenAI GPT-4-turbo
+        Parse resume text using OpenAI gpt-4o-mini with structured outputs
         
         Args:
             text (str): Extracted document text
@@ -233,135 +408,308 @@ class SupabaseBucketParser:
         Returns:
             dict: Parsed resume data as dictionary
         """
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4-turbo",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": text}
-                ],
-                temperature=0,
-                max_tokens=4000
-            )
-            content = response.choices[0].message.content
-            
-            # Check if content is valid
-            if not content:
-                print("Error: Empty response from OpenAI")
-                return {}
-            
-            # Try to parse the JSON response
-            parsed_data = json.loads(content)
-            return parsed_data
-            
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing failed: {e}")
-            content_preview = content[:200] if content else "None"
-            print(f"Raw response: {content_preview}...")
-            return {}
-        except Exception as e:
-            print(f"OpenAI parsing failed: {e}")
-            return {}
+        parsed_data, _ = await self._request_json(SYSTEM_PROMPT, text, RESUME_RESPONSE_FORMAT)
+        return parsed_data
     
-    def extract_text_from_document(self, file_path: Path) -> str:
+    async def parse_resume_batch(self, items: List[Tuple[str, str]]) -> Optional[Dict[str, dict]]:
         """
-        Extract text from PDF or Word document using enhanced extraction
+        Parse several resumes with a single OpenAI request
         
         Args:
-            file_path (Path): Path to document file
+            items (list): (filename, extracted text) pairs
             
         Returns:
-            str: Extracted and cleaned text content
+            Optional[dict]: Parsed resume data keyed by filename; resumes the model
+                skipped are absent. None if the reply was cut off at max_tokens.
+        """
+        user_content = "\n\n".join(
+            f"{BATCH_RESUME_DELIMITER.format(filename=filename)}\n{text}" for filename, text in items
+        )
+        parsed_batch, finish_reason = await self._request_json(
+            BATCH_SYSTEM_PROMPT, user_content, BATCH_RESPONSE_FORMAT, len(items) * MAX_COMPLETION_TOKENS
+        )
+        if finish_reason == "length":
+            return None
+        
+        return {
+            filename: parsed_batch[filename]
+            for filename, _ in items
+            if isinstance(parsed_batch.get(filename), dict) and parsed_batch[filename]
+        }
+    
+    async def _request_json(self, system_prompt: str, user_content: str, response_format: dict,
+                            max_tokens: int = MAX_COMPLETION_TOKENS) -> Tuple[dict, Optional[str]]:
         """
+        Send one prompt to OpenAI and decode the JSON object it returns
+        
+        Returns:
+            Tuple[dict, Optional[str]]: Parsed data ({} on failure) and the
+                completion's finish_reason (None if the request failed)
+        """
+        request = build_chat_request(system_prompt, user_content, response_format, max_tokens)
+        # Prompt at ~4 characters per token plus the worst-case completion
+        token_estimate = (len(system_prompt) + len(user_content)) // 4 + max_tokens
+        
         try:
-            extractor = EnhancedTextExtractor()
-            text, method_used = extractor.extract_text_with_fallback(str(file_path))
-            
-            if text:
-                file_type = file_path.suffix.upper()
-                print(f"  ✓ {file_type} text extracted using {method_used} (length: {len(text)})")
-                
-                # Analyze text quality for reporting
-                quality = extractor.analyze_text_quality(text)
-                if quality['issues']:
-                    print(f"  ⚠ Text quality: {quality['quality']} - {', '.join(quality['issues'])}")
-                else:
-                    print(f"  ✓ Text quality: {quality['quality']}")
-                    
-                return text
-            else:
-                print(f"  ✗ Failed to extract text using enhanced extractor")
-                return ""
-                
+            response = await self._create_chat_completion(request, token_estimate)
+        except FATAL_OPENAI_ERRORS:
+            raise
         except Exception as e:
-            print(f"Error extracting text from {file_path}: {e}")
-            return ""
+            print(f"OpenAI parsing failed: {e}")
+            return {}, None
+        
+        return decode_json_response(response), response.choices[0].finish_reason
     
-    def process_resume(self, file_path: str) -> dict:
+    def record_result(self, results: Dict[str, dict], result: dict) -> None:
+        """Store a finished result and append it to the checkpoint"""
+        results[result["filename"]] = result
+        self.write_checkpoint(result)
+    
+    async def _download_stage(self, download_q: asyncio.Queue, extract_q: asyncio.Queue,
+                              results: Dict[str, dict], processed_at: str) -> None:
         """
-        Process a single resume file from the bucket
+        Pipeline stage 1: download documents and check the parse cache
         
-        Args:
-            file_path (str): Path to resume file in bucket
+        Cache misses are handed to the extraction stage; cache hits and
+        download failures are finished here.
+        """
+        while True:
+            file_path = await download_q.get()
+            if file_path is None:
+                return
             
-        Returns:
-            dict: Processing result with filename, data, and metadata
+            print(f"Processing {file_path}...")
+            try:
+                data, content_hash = await asyncio.to_thread(self.download_bytes, file_path)
+                cached_data = await asyncio.to_thread(self.cache_get, content_hash)
+            except Exception as e:
+                print(f"Failed to process {file_path}: {e}")
+                self.record_result(results, {
+                    "filename": file_path,
+                    "error": str(e),
+                    "processed_at": processed_at
+                })
+                continue
+            
+            if cached_data:
+                print(f"  ♻️  Cache hit for {file_path}, skipping extraction and OpenAI")
+                self.record_result(results, {
+                    "filename": file_path,
+                    "data": cached_data,
+                    "processed_at": processed_at,
+                    "cache_hit": True
+                })
+                continue
+            
+            await extract_q.put((file_path, content_hash, data))
+    
+    async def _extract_stage(self, extract_q: asyncio.Queue, llm_q: asyncio.Queue, results: Dict[str, dict],
+                             processed_at: str, extract_pool: Optional[Executor]) -> None:
         """
-        print(f"Processing {file_path}...")
+        Pipeline stage 2: extract text from downloaded documents
         
-        try:
-            # Download file to temporary directory
-            local_file_path = self.download_file(file_path)
+        Extraction is CPU-bound, so it runs in extract_pool (the event loop's
+        thread pool when None).
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await extract_q.get()
+            if item is None:
+                return
+            
+            file_path, content_hash, data = item
+            try:
+                text = await loop.run_in_executor(extract_pool, extract_text, data, file_path)
+            except Exception as e:
+                print(f"Failed to process {file_path}: {e}")
+                self.record_result(results, {
+                    "filename": file_path,
+                    "error": str(e),
+                    "processed_at": processed_at
+                })
+                continue
             
-            # Extract text from document
-            text = self.extract_text_from_document(local_file_path)
             if not text:
                 print(f"Warning: No text extracted from {file_path}")
-                return {
+                self.record_result(results, {
                     "filename": file_path,
                     "error": "No text extracted from document",
-                    "processed_at": datetime.utcnow().isoformat()
-                }
+                    "processed_at": processed_at
+                })
+                continue
             
-            # Parse with OpenAI
-            parsed_data = self.parse_resume_with_openai(text)
+            if not looks_like_resume(text):
+                print(f"Warning: Skipping {file_path}, text too short or not a resume")
+                self.record_result(results, {
+                    "filename": file_path,
+                    "error": "text too short or non-resume",
+                    "processed_at": processed_at
+                })
+                continue
             
-            if not parsed_data:
-                return {
+            await llm_q.put((file_path, content_hash, text))
+    
+    async def _llm_stage(self, llm_q: asyncio.Queue, results: Dict[str, dict], processed_at: str) -> None:
+        """
+        Pipeline stage 3: parse extracted text with OpenAI
+        
+        With batch_size > 1, documents already waiting in the queue are packed
+        into the same request while they fit in MAX_BATCH_INPUT_TOKENS (the
+        completion budget is bounded by batch_size itself).
+        """
+        carried = None
+        while True:
+            item = carried if carried is not None else await llm_q.get()
+            carried = None
+            if item is None:
+                return
+            
+            batch = [item]
+            batch_tokens = (len(BATCH_SYSTEM_PROMPT) + len(item[2])) // 4
+            stop = False
+            while len(batch) < self.batch_size and not llm_q.empty():
+                item = llm_q.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                text_tokens = len(item[2]) // 4
+                if batch_tokens + text_tokens > MAX_BATCH_INPUT_TOKENS:
+                    # Starts the next request instead
+                    carried = item
+                    break
+                batch.append(item)
+                batch_tokens += text_tokens
+            
+            await self.parse_documents(batch, results, processed_at)
+            if stop:
+                return
+    
+    async def parse_documents(self, batch: List[Tuple[str, str, str]], results: Dict[str, dict],
+                              processed_at: str) -> None:
+        """
+        Parse one OpenAI request's worth of documents and record their results
+        
+        Args:
+            batch (list): (file_path, content_hash, text) triples
+            results (dict): Results collected so far, keyed by file path
+            processed_at (str): Run timestamp recorded on each result
+        """
+        request_version = RESUME_REQUEST_VERSION
+        if len(batch) == 1:
+            file_path, _, text = batch[0]
+            parsed_data = await self.parse_resume_with_openai(text)
+            parsed_batch = {file_path: parsed_data} if parsed_data else {}
+        else:
+            parsed_batch = await self.parse_resume_batch([(file_path, text) for file_path, _, text in batch])
+            request_version = BATCH_REQUEST_VERSION
+            if parsed_batch is None:
+                # The combined reply ran out of completion tokens; parse each file on its own
+                print(f"  ⚠ Batch reply for {len(batch)} files was truncated, parsing them individually")
+                parsed = await asyncio.gather(*(self.parse_resume_with_openai(text) for _, _, text in batch))
+                parsed_batch = {file_path: data for (file_path, _, _), data in zip(batch, parsed) if data}
+                request_version = RESUME_REQUEST_VERSION
+        
+        for file_path, content_hash, _ in batch:
+            if file_path in parsed_batch:
+                await asyncio.to_thread(self.cache_put, content_hash, parsed_batch[file_path], request_version)
+                self.record_result(results, {
+                    "filename": file_path,
+                    "data": parsed_batch[file_path],
+                    "processed_at": processed_at
+                })
+            else:
+                self.record_result(results, {
                     "filename": file_path,
                     "error": "Failed to parse resume data",
-                    "processed_at": datetime.utcnow().isoformat()
-                }
-            
-            return {
-                "filename": file_path,
-                "data": parsed_data,
-                "processed_at": datetime.utcnow().isoformat()
-            }
+                    "processed_at": processed_at
+                })
+    
+    async def run_pipeline(self, resume_files: List[str], processed_at: str) -> List[dict]:
+        """
+        Push files through overlapping download, extraction and OpenAI stages
+        
+        Each stage is a pool of workers joined to the next by a bounded queue,
+        so while one file waits on OpenAI the next is extracting and the one
+        after that is downloading, and a slow stage holds back the ones before
+        it instead of piling documents up in memory. Each finished stage sends
+        one None sentinel per downstream worker to shut the next stage down.
+        
+        Args:
+            resume_files (list): Paths to resume files in bucket
+            processed_at (str): Run timestamp recorded on every result
             
-        except Exception as e:
-            print(f"Failed to process {file_path}: {e}")
-            return {
-                "filename": file_path,
-                "error": str(e),
-                "processed_at": datetime.utcnow().isoformat()
-            }
+        Returns:
+            list: Processing results in the same order as resume_files
+        """
+        queue_size = 2 * self.max_concurrency
+        download_q = asyncio.Queue(maxsize=queue_size)
+        extract_q = asyncio.Queue(maxsize=queue_size)
+        llm_q = asyncio.Queue(maxsize=queue_size)
+        
+        # Files finished by an interrupted earlier run are not downloaded or parsed again
+        checkpointed = self.load_checkpoint()
+        results = {file_path: checkpointed[file_path] for file_path in resume_files if file_path in checkpointed}
+        if results:
+            print(f"Resuming from checkpoint: {len(results)} of {len(resume_files)} files already parsed")
+        pending_files = [file_path for file_path in resume_files if file_path not in results]
+        
+        # Downloads and OpenAI calls are I/O-bound; extraction gets one worker per core
+        download_workers = self.max_concurrency
+        extract_workers = os.cpu_count() or 1
+        llm_workers = self.max_concurrency
+        
+        async def feed() -> None:
+            for file_path in pending_files:
+                await download_q.put(file_path)
+            for _ in range(download_workers):
+                await download_q.put(None)
+        
+        async def run_stage(workers: list, downstream: asyncio.Queue, downstream_workers: int) -> None:
+            await asyncio.gather(*workers)
+            for _ in range(downstream_workers):
+                await downstream.put(None)
+        
+        # A single file is not worth the worker start-up cost
+        extract_pool = ProcessPoolExecutor(max_workers=extract_workers) if len(pending_files) > 1 else None
+        try:
+            await asyncio.gather(
+                feed(),
+                run_stage(
+                    [self._download_stage(download_q, extract_q, results, processed_at) for _ in range(download_workers)],
+                    extract_q, extract_workers
+                ),
+                run_stage(
+                    [self._extract_stage(extract_q, llm_q, results, processed_at, extract_pool) for _ in range(extract_workers)],
+                    llm_q, llm_workers
+                ),
+                *(self._llm_stage(llm_q, results, processed_at) for _ in range(llm_workers))
+            )
+        finally:
+            if extract_pool is not None:
+                extract_pool.shutdown()
+        
+        return [results[file_path] for file_path in resume_files]
     
-    def process_all_resumes(self, specific_file: Optional[str] = None) -> dict:
+    async def process_all_resumes(self, specific_file: Optional[str] = None,
+                                  processed_at: Optional[str] = None) -> dict:
         """
         Process all resume files in the bucket
         
         Args:
             specific_file (str): Optional specific file to process
+            processed_at (str): Run timestamp recorded on every result; defaults to now
             
         Returns:
             dict: Processing results with metadata
         """
+        if processed_at is None:
+            processed_at = datetime.now(timezone.utc).isoformat()
+        
         try:
             # Get list of files to process
             if specific_file:
-                if not specific_file.endswith(tuple(self.supported_extensions)):
-                    print(f"Error: {specific_file} is not a supported file type. Supported: {', '.join(self.supported_extensions)}")
+                if not specific_file.endswith(self.SUPPORTED_SUFFIXES):
+                    print(f"Error: {specific_file} is not a supported file type. Supported: {', '.join(self.SUPPORTED_SUFFIXES)}")
                     return {"error": "Unsupported file type"}
                 
                 resume_files = [specific_file]
@@ -383,15 +731,12 @@ class SupabaseBucketParser:
                 for ext, count in file_counts.items():
                     print(f"  {ext.upper()}: {count} files")
             
-            # Process all resume files
-            results = []
+            # Download, extract and parse concurrently, each stage overlapping the next
+            results = await self.run_pipeline(resume_files, processed_at)
             successful = 0
             failed = 0
             
-            for file_path in resume_files:
-                result = self.process_resume(file_path)
-                results.append(result)
-                
+            for file_path, result in zip(resume_files, results):
                 if "error" in result:
                     failed += 1
                     print(f"  ✗ Failed to process {file_path}")
@@ -406,7 +751,7 @@ class SupabaseBucketParser:
                     "total_files": len(resume_files),
                     "successful": successful,
                     "failed": failed,
-                    "processed_at": datetime.utcnow().isoformat(),
+                    "processed_at": processed_at,
                     "bucket_name": self.bucket_name,
                     "source": "supabase_bucket"
                 }
@@ -433,12 +778,25 @@ def main():
     # Load environment variables
     load_dotenv()
     
+    # One timestamp identifies the whole run
+    run_ts = datetime.now(timezone.utc).isoformat()
+    
     # Set up command line arguments
     parser = argparse.ArgumentParser(
-        description="Parse Standard Form 330 Section E resumes from Supabase bucket using OpenAI GPT-4-turbo"
+        description="Parse Standard Form 330 Section E resumes from Supabase bucket using OpenAI gpt-4o-mini"
     )
     parser.add_argument("--output", required=True, help="Output JSON filename (will be uploaded to ParsedFiles folder)")
     parser.add_argument("--file", help="Process only this specific file (optional)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum concurrent OpenAI requests (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_MAX_REQUESTS_PER_MINUTE,
+                        help=f"OpenAI requests per minute to pace against (default: {DEFAULT_MAX_REQUESTS_PER_MINUTE})")
+    parser.add_argument("--tpm", type=float, default=DEFAULT_MAX_TOKENS_PER_MINUTE,
+                        help=f"OpenAI tokens per minute to pace against (default: {DEFAULT_MAX_TOKENS_PER_MINUTE})")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"Attempts per file on rate limits or server errors (default: {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Resumes packed into each OpenAI request, at most {MAX_BATCH_DOCUMENTS} (default: {DEFAULT_BATCH_SIZE})")
     args = parser.parse_args()
 
     # Get credentials from environment variables
@@ -461,12 +819,20 @@ def main():
         return
 
     # Initialize clients
-    openai_client = OpenAI(api_key=openai_api_key)
+    # Retries are handled by the bucket parser so they can respect the rate limiter
+    openai_client = AsyncOpenAI(api_key=openai_api_key, max_retries=0, timeout=OPENAI_TIMEOUT_SECONDS)
     
     # Create bucket parser
-    bucket_parser = None
     try:
-        bucket_parser = SupabaseBucketParser(supabase_url, supabase_key, openai_client)
+        bucket_parser = SupabaseBucketParser(
+            supabase_url, supabase_key, openai_client,
+            max_concurrency=args.concurrency,
+            max_requests_per_minute=args.rpm,
+            max_tokens_per_minute=args.tpm,
+            max_attempts=args.max_attempts,
+            batch_size=args.batch_size,
+            checkpoint_path=f"{args.output}.checkpoint.jsonl"
+        )
         
         print(f"🚀 Starting Section E Resume Parser (Supabase Bucket)")
         print(f"📦 Bucket: {bucket_parser.bucket_name}")
@@ -474,7 +840,7 @@ def main():
         print(f"📄 Output file: {args.output}")
         
         # Process resumes
-        results = bucket_parser.process_all_resumes(args.file)
+        results = asyncio.run(bucket_parser.process_all_resumes(args.file, run_ts))
         
         if "error" in results:
             print(f"❌ Processing failed: {results['error']}")
@@ -484,6 +850,7 @@ def main():
         upload_success = bucket_parser.upload_results(results, args.output)
         
         if upload_success:
+            bucket_parser.remove_checkpoint()
             print(f"\n✅ Results successfully uploaded to bucket!")
             print(f"📍 Location: {bucket_parser.bucket_name}/{bucket_parser.parsed_files_folder}/{args.output}")
         else:
@@ -491,17 +858,14 @@ def main():
             
             # Save locally as fallback
             local_path = args.output
-            with open(local_path, "w", encoding="utf-8") as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            with open(local_path, "wb") as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
             print(f"💾 Results saved locally as fallback: {local_path}")
+            bucket_parser.remove_checkpoint()
     
     except Exception as e:
+        # The checkpoint is kept so the next run resumes where this one stopped
         print(f"❌ Error: {e}")
-        
-    finally:
-        # Clean up temporary files
-        if bucket_parser:
-            bucket_parser.cleanup()
 
 
 if __name__ == "__main__":
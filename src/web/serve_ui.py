@@ -5,16 +5,28 @@ Reads environment variables from .env and serves the HTML with credentials injec
 """
 
 import os
+import io
 import sys
 import re
+import json
+import tempfile
+import traceback
+import subprocess
+import errno
+import gzip
+import time
+import threading
 import http.server
-import socketserver
 import webbrowser
-from urllib.parse import urlparse
+from urllib.parse import urlparse, unquote
 from dotenv import load_dotenv
 import uuid
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import warnings
+import logging
+import orjson
 
 # Suppress the pkg_resources deprecation warning that might cause issues
 warnings.filterwarnings("ignore", message="pkg_resources is deprecated as an API.*")
@@ -24,11 +36,15 @@ warnings.filterwarnings("ignore", category=DeprecationWarning, module="pkg_resou
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
-# Load environment variables
+logger = logging.getLogger(__name__)
+
+# Load environment variables once; handlers read the constants below
 load_dotenv()
+_SUPABASE_URL = os.getenv('SUPABASE_URL')
+_SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
-# Import template downloader
-from utils.supabase_template_downloader import SupabaseTemplateDownloader
+# Running as a Netlify Function (or any AWS Lambda) rather than the local server
+IS_SERVERLESS = os.getenv('NETLIFY') == 'true' or bool(os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
 
 def get_file_path(relative_path):
     """
@@ -45,10 +61,7 @@ def get_file_path(relative_path):
     Returns:
         Absolute path that works in current environment
     """
-    # Check if we're running in Netlify Functions environment
-    is_netlify = os.getenv('NETLIFY') == 'true' or os.getenv('AWS_LAMBDA_FUNCTION_NAME')
-    
-    if is_netlify:
+    if IS_SERVERLESS:
         # In Netlify Functions, working directory is project root
         # HTML files are in dist/, other files in their original locations
         if relative_path.endswith('.html'):
@@ -59,124 +72,580 @@ def get_file_path(relative_path):
         # Local development - use absolute paths from project root
         return os.path.join(project_root, relative_path)
 
+# Files read by the handlers, resolved once for the current environment
+INDEX_HTML_PATH = get_file_path('index.html')
+PARSED_RESULTS_PATH = get_file_path('data/ParsedFiles/real_parsed_results.json')
+TEMPLATES_CONFIG_PATH = get_file_path('templates/templates.json')
+SPLIT_ROLES_SCRIPT_PATH = get_file_path('utils/split_roles.py')
+
+# Chunk size for copying files to a response when sendfile is unavailable
+FILE_COPY_CHUNK_SIZE = 1 << 17
+
+# JSON bodies below this size are sent uncompressed; gzip framing would eat the savings
+GZIP_MIN_SIZE = 1024
+
+# How long a template that could not be found is reported missing before it is looked up again
+MISSING_TEMPLATE_RETRY_SECONDS = 30
+
+# Write buffer for uploads streamed to temporary files; small tail writes are coalesced
+UPLOAD_BUFFER_SIZE = 1 << 17
+
+# Parsed JSON documents by path: ((mtime_ns, size), parsed data)
+_JSON_CACHE = {}
+
+def load_json_cached(path):
+    """
+    Load a JSON file, parsing it again only when its modification time or size changes
+    
+    The parsed data is shared between requests and must be treated as read-only.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON data
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _JSON_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        data = orjson.loads(f.read())
+    _JSON_CACHE[path] = (key, data)
+    return data
+
+# Views built from a cached JSON document: (path, view name) -> (source data, view)
+_JSON_VIEW_CACHE = {}
+
+def load_json_view(path, name, build):
+    """
+    Return a view derived from a cached JSON file, rebuilding it only when the file is re-parsed
+    
+    Args:
+        path: Path to the JSON file
+        name: Name distinguishing this view from others built from the same file
+        build: Function taking the parsed data and returning the view
+        
+    Returns:
+        The view built by build()
+    """
+    data = load_json_cached(path)
+    cached = _JSON_VIEW_CACHE.get((path, name))
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    
+    view = build(data)
+    _JSON_VIEW_CACHE[(path, name)] = (data, view)
+    return view
+
+def build_resume_name_index(data):
+    """Map each employee name to its resume; the first resume with a name wins"""
+    index = {}
+    for resume in data.get('resumes', []):
+        name = resume.get('data', {}).get('name')
+        if name not in index:
+            index[name] = resume
+    return index
+
+def normalize_employee_name(name):
+    """Fold an employee name for lookups that ignore case and surrounding whitespace"""
+    return name.strip().casefold()
+
+def build_resume_folded_name_index(data):
+    """Map each normalized employee name to its resume; the first match wins"""
+    index = {}
+    for resume in data.get('resumes', []):
+        name = resume.get('data', {}).get('name')
+        if isinstance(name, str):
+            index.setdefault(normalize_employee_name(name), resume)
+    return index
+
+def build_gzip_payload(data):
+    """Serialize data to JSON and gzip it, for cached responses to clients accepting gzip"""
+    return gzip.compress(orjson.dumps(data))
+
+def find_default_docx_template(data):
+    """Return the first DOCX (traditional or Jinja) template, or None if there is none"""
+    for template in data.get('templates', []):
+        if template.get('type') in ['docx', 'jinja_docx']:
+            return template
+    return None
+
+def build_template_id_index(data):
+    """Map each template ID to its metadata; the first template with an ID wins"""
+    index = {}
+    for template in data.get('templates', []):
+        template_id = template.get('id')
+        if template_id not in index:
+            index[template_id] = template
+    return index
+
+# /api/config response; the environment is loaded once above and does not change
+CONFIG_RESPONSE = orjson.dumps({
+    "supabaseConfigured": bool(_SUPABASE_URL and _SUPABASE_KEY),
+    "hasUrl": bool(_SUPABASE_URL),
+    "hasKey": bool(_SUPABASE_KEY)
+})
+
+# Supabase client shared by all request threads; created on first use
+_SUPABASE_CLIENT = None
+_SUPABASE_CLIENT_LOCK = threading.Lock()
+
+def get_supabase_client():
+    """
+    Return the process-wide Supabase client, or None if Supabase is not configured
+    
+    Returns:
+        Supabase client, or None when SUPABASE_URL or SUPABASE_KEY is missing
+    """
+    global _SUPABASE_CLIENT
+    if _SUPABASE_CLIENT is None:
+        if not _SUPABASE_URL or not _SUPABASE_KEY:
+            return None
+        # Concurrent first requests would otherwise each build a client
+        with _SUPABASE_CLIENT_LOCK:
+            if _SUPABASE_CLIENT is None:
+                from supabase import create_client
+                _SUPABASE_CLIENT = create_client(_SUPABASE_URL, _SUPABASE_KEY)
+    return _SUPABASE_CLIENT
+
+# Serialized /api/all-projects response from Supabase, reused for ALL_PROJECTS_TTL_SECONDS
+ALL_PROJECTS_TTL_SECONDS = 30
+_ALL_PROJECTS_CACHE = {'expires': 0.0, 'body': b''}
+
+def expire_all_projects_cache():
+    """Drop the cached /api/all-projects response after assignments or projects change"""
+    _ALL_PROJECTS_CACHE['expires'] = 0.0
+
+# Serialized merge-tool listings; the duplicate search is a slow similarity scan over
+# data that changes far less often than admins refresh it
+POTENTIAL_DUPLICATES_TTL_SECONDS = 30
+_POTENTIAL_DUPLICATES_CACHE = {'expires': 0.0, 'body': b''}
+EMPLOYEES_FOR_MERGE_TTL_SECONDS = 15
+_EMPLOYEES_FOR_MERGE_CACHE = {'expires': 0.0, 'body': b''}
+
+def expire_merge_caches():
+    """Drop the cached merge-tool listings after employees or their roles change"""
+    _POTENTIAL_DUPLICATES_CACHE['expires'] = 0.0
+    _EMPLOYEES_FOR_MERGE_CACHE['expires'] = 0.0
+
+@lru_cache(maxsize=None)
+def load_reportlab():
+    """
+    Import and configure ReportLab for the fallback PDFs once, on first use
+    
+    Returns:
+        Tuple of (Canvas class, US letter page size)
+        
+    Raises:
+        ImportError: If ReportLab is not installed
+    """
+    from reportlab import rl_config
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.lib.pagesizes import letter
+    
+    # The fallback PDFs only draw text; skip validation of graphics shapes
+    rl_config.shapeChecking = 0
+    return Canvas, letter
+
+@lru_cache(maxsize=64)
+def render_pdf_preview_png(pdf_path, mtime_ns, dpi=150):
+    """
+    Render the first page of a PDF to PNG bytes, cached per file version
+    
+    Args:
+        pdf_path: Path to the PDF file
+        mtime_ns: Modification time of the file, so edits invalidate the cache
+        dpi: Render resolution
+        
+    Returns:
+        PNG bytes, or None if the PDF has no pages
+        
+    Raises:
+        ImportError: If neither pypdfium2 nor pdf2image is installed
+    """
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+    
+    if pdfium is not None:
+        # Render in-process instead of forking pdftoppm for every request
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            if len(pdf) == 0:
+                return None
+            image = pdf[0].render(scale=dpi / 72).to_pil()
+        finally:
+            pdf.close()
+    else:
+        from pdf2image import convert_from_path
+        images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=dpi)
+        if not images:
+            return None
+        image = images[0]
+    
+    # Previews don't need maximum compression; level 1 is far cheaper to encode
+    img_buffer = io.BytesIO()
+    image.save(img_buffer, format='PNG', compress_level=1)
+    return img_buffer.getvalue()
+
+# PDF/DOCX generation from handler threads runs here, capping concurrent CPU-heavy renders
+GENERATOR_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4), thread_name_prefix='generator')
+
+@lru_cache(maxsize=32)
+def get_pdf_generator(template_path=None):
+    """
+    Return a SectionEPDFGenerator for a template, created once per template path
+    
+    Args:
+        template_path: PDF template to fill, or None for the generator's default
+        
+    Returns:
+        SectionEPDFGenerator shared by all requests for that template
+    """
+    from src.generators.pdf_form_filler import SectionEPDFGenerator
+    generator = SectionEPDFGenerator()
+    if template_path:
+        generator.template_path = template_path  # Override the template path
+    return generator
+
+@lru_cache(maxsize=32)
+def get_docx_generator(template_type, template_path):
+    """
+    Return the DOCX generator for a template, created once per template type and path
+    
+    Args:
+        template_type: 'jinja_docx' for {{ variable }} templates, otherwise cell-mapping
+        template_path: DOCX template to fill
+        
+    Returns:
+        JinjaDOCXSectionEGenerator or DOCXSectionEGenerator shared by all requests for that template
+    """
+    if template_type == 'jinja_docx':
+        from src.generators.jinja_docx_generator import JinjaDOCXSectionEGenerator
+        return JinjaDOCXSectionEGenerator(template_path)
+    
+    from src.generators.docx_section_e_generator import DOCXSectionEGenerator
+    return DOCXSectionEGenerator(template_path)
+
+# OpenAI requests from handler threads run here, capping concurrent API calls
+OPENAI_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='openai')
+
+# Solicitation keyword extraction; the output shape is enforced by a strict JSON schema
+KEYWORD_EXTRACTION_MODEL = os.getenv('OPENAI_KEYWORD_MODEL') or 'gpt-4o-mini'
+
+KEYWORD_EXTRACTION_PROMPT = (
+    "Extract 10-15 specific keywords from this government solicitation for construction and "
+    "engineering work, for matching against project descriptions: project locations, required "
+    "roles, technologies and methodologies, industry sectors, skills, and certifications or licenses."
+)
+
+KEYWORD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "keywords": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "category": {
+                        "type": "string",
+                        "enum": ["location", "role", "technology", "industry", "skill", "certification"]
+                    },
+                    "text": {"type": "string"}
+                },
+                "required": ["category", "text"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["keywords"],
+    "additionalProperties": False
+}
+
+# OpenAI client shared by all requests so its connection pool is reused
+_OPENAI_CLIENT = None
+
+def get_openai_client():
+    """
+    Return the process-wide OpenAI client, or None if OPENAI_API_KEY is not set
+    
+    Returns:
+        OpenAI client, or None when no API key is configured
+    """
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            return None
+        from openai import OpenAI
+        _OPENAI_CLIENT = OpenAI(api_key=api_key)
+    return _OPENAI_CLIENT
+
+@lru_cache(maxsize=None)
+def get_text_extractor():
+    """
+    Return the process-wide PDF text extractor, created on first use
+    
+    Returns:
+        EnhancedTextExtractor instance shared across requests
+    """
+    from src.parsers.enhanced_text_extractor import EnhancedTextExtractor
+    return EnhancedTextExtractor()
+
+# URL-decoding of path segments; the same employee names and IDs repeat across requests
+unquote_cached = lru_cache(maxsize=512)(unquote)
+
+# Whitespace runs in download filenames; a newline must never reach a header
+FILENAME_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+@lru_cache(maxsize=512)
+def filename_slug(name):
+    """Underscore-joined form of an employee or template name for Content-Disposition filenames"""
+    return FILENAME_WHITESPACE_PATTERN.sub('_', name)
+
+def request_output_filename(extension):
+    """
+    Unique name for a file generated for one request
+    
+    Generators write into a shared output directory, so a fixed per-employee
+    name would let two concurrent requests for the same employee overwrite
+    the file while the other is still streaming it.
+    """
+    return f"SectionE_{uuid.uuid4().hex}{extension}"
+
+def truncate_text(text, limit, suffix=''):
+    """
+    Cut text to a maximum length for the fallback PDFs
+    
+    Args:
+        text: String to shorten (None is treated as empty)
+        limit: Maximum number of characters kept
+        suffix: Appended only when the text was actually cut
+        
+    Returns:
+        The original string when it already fits, otherwise the shortened one
+    """
+    text = text or ''
+    if len(text) <= limit:
+        return text
+    return text[:limit] + suffix
+
+# Checkbox marks for the "performed with same firm" line of the fallback PDFs
+CHECKBOX_CHECKED = "☑"
+CHECKBOX_UNCHECKED = "☐"
+
+# Credential placeholders in index.html, replaced in a single pass per render
+INDEX_PLACEHOLDER_PATTERN = re.compile(r'(\{\{SUPABASE_URL\}\}|\{\{SUPABASE_KEY\}\})')
+
+def compile_route_table(routes):
+    """
+    Compile route patterns into a single regex so a path is scanned once
+    
+    The regex must match the whole path (use it with match()). Each pattern is wrapped in a named group, so match.lastgroup identifies the
+    route that matched; its own capture groups are located by their position
+    in match.groups().
+    
+    Args:
+        routes: Sequence of (pattern, handler method name) pairs
+        
+    Returns:
+        Tuple of (compiled pattern, {group name: (handler name, first arg index, end arg index)})
+    """
+    alternatives = []
+    handlers = {}
+    next_group = 0
+    for number, (pattern, handler) in enumerate(routes):
+        name = f'route{number}'
+        arg_count = re.compile(pattern).groups
+        alternatives.append(f'(?P<{name}>{pattern})')
+        # groups() index of this route's first argument, after its wrapping group
+        first_arg = next_group + 1
+        handlers[name] = (handler, first_arg, first_arg + arg_count)
+        next_group = first_arg + arg_count
+    return re.compile('(?:' + '|'.join(alternatives) + r')\Z', re.DOTALL), handlers
+
 class UIHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler that injects environment variables into HTML"""
     
-    def __init__(self, *args, **kwargs):
-        # Initialize template downloader
-        self.template_downloader = SupabaseTemplateDownloader()
-        super().__init__(*args, **kwargs)
+    # Persistent connections: the page and its API calls share one TCP connection
+    protocol_version = 'HTTP/1.1'
+    
+    # Set TCP_NODELAY in setup() so small responses on a kept-alive connection aren't held back
+    disable_nagle_algorithm = True
+    
+    # Set once a GET has been routed; its request is fully read, so a 4xx need not close the connection
+    _error_keeps_alive = False
+    
+    # index.html split around its placeholders; read from disk on first request
+    _INDEX_SEGMENTS = None
+    
+    # Shared template downloader, created on first use rather than per request
+    _template_downloader = None
+    
+    # Cleared when the employees_for_merge view (sql/add_employees_for_merge_view.sql) isn't deployed
+    _employees_for_merge_view = True
+    
+    @property
+    def template_downloader(self):
+        """Return the process-wide SupabaseTemplateDownloader, importing it lazily"""
+        cls = type(self)
+        if cls._template_downloader is None:
+            from utils.supabase_template_downloader import SupabaseTemplateDownloader
+            cls._template_downloader = SupabaseTemplateDownloader()
+        return cls._template_downloader
+    
+    # Template paths resolved by the downloader, by filename
+    _template_paths = {}
+    
+    # Filenames the downloader could not find, with the time of the failed lookup
+    _missing_templates = {}
+    
+    def get_template_path(self, filename):
+        """
+        Resolve a template file through the downloader, remembering the result
+        
+        A resolved path is reused for as long as the file exists. A failed lookup
+        is remembered for MISSING_TEMPLATE_RETRY_SECONDS, so newly uploaded
+        templates are still picked up.
+        
+        Args:
+            filename: Template filename from templates.json
+            
+        Returns:
+            str: Local path to the template, or None if it was not found
+        """
+        path = self._template_paths.get(filename)
+        if path is not None and os.path.exists(path):
+            return path
+        
+        missed_at = self._missing_templates.get(filename)
+        if missed_at is not None and time.monotonic() - missed_at < MISSING_TEMPLATE_RETRY_SECONDS:
+            return None
+        
+        path = self.template_downloader.get_template_path(filename)
+        if path:
+            self._template_paths[filename] = path
+            self._missing_templates.pop(filename, None)
+        else:
+            self._missing_templates[filename] = time.monotonic()
+        return path
+    
+    # Exact-match GET routes: path -> handler method name
+    _GET_ROUTES = {
+        '/': 'serve_html_with_env',
+        '/index.html': 'serve_html_with_env',
+        '/login.html': 'serve_login_page',
+        '/signup.html': 'serve_signup_page',
+        '/api/config': 'serve_config_api',
+        '/api/employees': 'serve_employees_api',
+        '/api/all-projects': 'serve_all_projects_api',
+        '/api/templates': 'serve_templates_api',
+        '/api/employees-for-merge': 'serve_employees_for_merge_api',
+        '/api/potential-duplicates': 'serve_potential_duplicates_api',
+        '/api/teams-for-merge': 'serve_teams_for_merge_api',
+        '/api/potential-duplicate-teams': 'serve_potential_duplicate_teams_api',
+        '/api/roles-for-merge': 'serve_roles_for_merge_api',
+        '/api/potential-duplicate-roles': 'serve_potential_duplicate_roles_api',
+        '/health': 'serve_health_check',
+    }
+    
+    # Prefix GET routes compiled into one anchored alternation: (pattern,
+    # handler method name); the pattern's capture groups become the handler's
+    # arguments, and the first matching alternative wins
+    _GET_PREFIX_PATTERN, _GET_PREFIX_HANDLERS = compile_route_table((
+        (r'/api/employee/(.*)', 'serve_employee_detail_api'),
+        (r'/api/generate-pdf/(.*)', 'serve_pdf_generation_api'),
+        (r'/api/template-preview/(.*)', 'serve_template_preview_api'),
+        (r'/api/employee-qualifications/(.*)', 'serve_employee_qualifications_api'),
+        (r'/api/merge-preview/([^/]*)/([^/]*)', 'serve_merge_preview_api'),
+        (r'/api/team-merge-preview/([^/]*)/([^/]*)', 'serve_team_merge_preview_api'),
+        (r'/api/role-merge-preview/([^/]*)/([^/]*)', 'route_role_merge_preview'),
+        (r'/api/(?:team-|role-)?merge-preview/.*', 'reject_merge_preview_url'),
+        (r'/api/delete-employee-preview/(.*)', 'serve_delete_employee_preview_api'),
+    ))
+    
+    # POST routes: path -> handler method name
+    _POST_ROUTES = {
+        '/api/generate-custom-pdf': 'serve_custom_pdf_generation_api',
+        '/api/generate-custom-pdf-with-template': 'serve_custom_pdf_with_template_api',
+        '/api/generate-custom-docx-with-template': 'serve_custom_docx_with_template_api',
+        '/api/analyze-solicitation': 'serve_solicitation_analysis_api',
+        '/api/set-primary-qualification': 'serve_set_primary_qualification_api',
+        '/api/merge-employees': 'serve_merge_employees_api',
+        '/api/merge-employees-with-preview': 'serve_merge_employees_with_preview_api',
+        '/api/merge-teams': 'serve_merge_teams_api',
+        '/api/merge-roles': 'serve_merge_roles_api',
+        '/api/split-compound-roles': 'serve_split_compound_roles_api',
+        '/api/normalize-roles': 'serve_normalize_roles_api',
+        '/api/execute-split-roles': 'serve_execute_split_roles_api',
+        '/api/delete-employee': 'serve_delete_employee_api',
+        '/api/delete-project': 'serve_delete_project_api',
+        '/api/trigger-processing': 'serve_trigger_processing_api',
+        '/api/upload-template': 'serve_upload_template_api',
+        '/api/ai-rewrite': 'serve_ai_rewrite_api',
+    }
     
     def do_GET(self):
         """Handle GET requests"""
-        if self.path == '/' or self.path == '/index.html':
-            self.serve_html_with_env()
-        elif self.path == '/login.html':
-            self.serve_login_page()
-        elif self.path == '/signup.html':
-            self.serve_signup_page()
-        elif self.path == '/api/config':
-            self.serve_config_api()
-        elif self.path == '/api/employees':
-            self.serve_employees_api()
-        elif self.path == '/api/all-projects':
-            self.serve_all_projects_api()
-        elif self.path.startswith('/api/employee/'):
-            employee_name = self.path.split('/api/employee/')[1]
-            self.serve_employee_detail_api(employee_name)
-        elif self.path.startswith('/api/generate-pdf/'):
-            employee_name = self.path.split('/api/generate-pdf/')[1]
-            self.serve_pdf_generation_api(employee_name)
-        elif self.path == '/api/templates':
-            self.serve_templates_api()
-        elif self.path.startswith('/api/template-preview/'):
-            template_id = self.path.split('/api/template-preview/')[1]
-            self.serve_template_preview_api(template_id)
-        elif self.path.startswith('/api/employee-qualifications/'):
-            employee_id = self.path.split('/api/employee-qualifications/')[1]
-            self.serve_employee_qualifications_api(employee_id)
-        elif self.path == '/api/employees-for-merge':
-            self.serve_employees_for_merge_api()
-        elif self.path == '/api/potential-duplicates':
-            self.serve_potential_duplicates_api()
-        elif self.path.startswith('/api/merge-preview/'):
-            # Expects format: /api/merge-preview/primary_id/secondary_id
-            path_parts = self.path.split('/api/merge-preview/')[1].split('/')
-            if len(path_parts) == 2:
-                self.serve_merge_preview_api(path_parts[0], path_parts[1])
-            else:
-                self.send_error(400, "Invalid merge preview URL format")
-        elif self.path == '/api/teams-for-merge':
-            self.serve_teams_for_merge_api()
-        elif self.path == '/api/potential-duplicate-teams':
-            self.serve_potential_duplicate_teams_api()
-        elif self.path.startswith('/api/team-merge-preview/'):
-            # Expects format: /api/team-merge-preview/primary_id/secondary_id
-            path_parts = self.path.split('/api/team-merge-preview/')[1].split('/')
-            if len(path_parts) == 2:
-                self.serve_team_merge_preview_api(path_parts[0], path_parts[1])
-            else:
-                self.send_error(400, "Invalid team merge preview URL format")
-        elif self.path == '/api/roles-for-merge':
-            self.serve_roles_for_merge_api()
-        elif self.path == '/api/potential-duplicate-roles':
-            self.serve_potential_duplicate_roles_api()
-        elif self.path.startswith('/api/role-merge-preview/'):
-            # Expects format: /api/role-merge-preview/primary_role/secondary_role (URL encoded)
-            path_parts = self.path.split('/api/role-merge-preview/')[1].split('/')
-            if len(path_parts) == 2:
-                from urllib.parse import unquote
-                primary_role = unquote(path_parts[0])
-                secondary_role = unquote(path_parts[1])
-                self.serve_role_merge_preview_api(primary_role, secondary_role)
-            else:
-                self.send_error(400, "Invalid role merge preview URL format")
-        elif self.path.startswith('/api/delete-employee-preview/'):
-            # Expects format: /api/delete-employee-preview/employee_id
-            employee_id = self.path.split('/api/delete-employee-preview/')[1]
-            self.serve_delete_employee_preview_api(employee_id)
-        elif self.path == '/health':
-            self.serve_health_check()
-        else:
-            # Serve static files normally
-            super().do_GET()
+        self._error_keeps_alive = True
+        path = self.path
+        handler = self._GET_ROUTES.get(path)
+        if handler is not None:
+            getattr(self, handler)()
+            return
+        
+        match = self._GET_PREFIX_PATTERN.match(path)
+        if match is not None:
+            handler, first_arg, end_arg = self._GET_PREFIX_HANDLERS[match.lastgroup]
+            getattr(self, handler)(*match.groups()[first_arg:end_arg])
+            return
+        
+        # Serve static files normally
+        super().do_GET()
 
     def do_POST(self):
         """Handle POST requests"""
-        if self.path == '/api/generate-custom-pdf':
-            self.serve_custom_pdf_generation_api()
-        elif self.path == '/api/generate-custom-pdf-with-template':
-            self.serve_custom_pdf_with_template_api()
-        elif self.path == '/api/generate-custom-docx-with-template':
-            self.serve_custom_docx_with_template_api()
-        elif self.path == '/api/analyze-solicitation':
-            self.serve_solicitation_analysis_api()
-        elif self.path == '/api/set-primary-qualification':
-            self.serve_set_primary_qualification_api()
-        elif self.path == '/api/merge-employees':
-            self.serve_merge_employees_api()
-        elif self.path == '/api/merge-teams':
-            self.serve_merge_teams_api()
-        elif self.path == '/api/merge-roles':
-            self.serve_merge_roles_api()
-        elif self.path == '/api/split-compound-roles':
-            self.serve_split_compound_roles_api()
-        elif self.path == '/api/normalize-roles':
-            self.serve_normalize_roles_api()
-        elif self.path == '/api/execute-split-roles':
-            self.serve_execute_split_roles_api()
-        elif self.path == '/api/delete-employee':
-            self.serve_delete_employee_api()
-        elif self.path == '/api/delete-project':
-            self.serve_delete_project_api()
-        elif self.path == '/api/trigger-processing':
-            self.serve_trigger_processing_api()
-        elif self.path == '/api/upload-template':
-            self.serve_upload_template_api()
-        elif self.path == '/api/ai-rewrite':
-            self.serve_ai_rewrite_api()
+        try:
+            self._body_unread = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            self._body_unread = 1
+        
+        handler = self._POST_ROUTES.get(self.path)
+        if handler is not None:
+            getattr(self, handler)()
         else:
             self.send_error(404, "Not Found")
+        
+        # A handler that answered without reading its whole body leaves the rest
+        # on the socket, where it would be parsed as the next request
+        if self._body_unread > 0:
+            self.close_connection = True
+    
+    def read_request_body(self, size):
+        """Read up to size bytes of the POST body, tracking how much is left unread"""
+        data = self.rfile.read(size)
+        self._body_unread -= len(data)
+        return data
+    
+    def do_OPTIONS(self):
+        """Answer CORS preflight requests in a single write, without routing"""
+        self.log_request(204)
+        self.wfile.write(b'%sDate: %s\r\n\r\n' % (
+            self._preflight_head(),
+            self.date_time_string().encode('latin-1'),
+        ))
+    
+    def route_role_merge_preview(self, primary_role, secondary_role):
+        """Route /api/role-merge-preview/primary_role/secondary_role (URL encoded)"""
+        self.serve_role_merge_preview_api(unquote_cached(primary_role), unquote_cached(secondary_role))
+    
+    def reject_merge_preview_url(self):
+        """Reject merge preview URLs that don't have exactly two path segments"""
+        self.send_error(400, "Invalid merge preview URL format")
     
     def serve_html_with_env(self):
         """
@@ -187,57 +656,201 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
         without exposing credentials in the source code.
         """
         try:
-            # Read the HTML file from disk
-            # Use correct path for both local and Netlify environments
-            html_file_path = get_file_path('index.html')
-            with open(html_file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # Get environment variables from .env file
+            # Environment variables loaded from .env at startup
             # Use fallback values if not found (for demo/development mode)
-            supabase_url = os.getenv('SUPABASE_URL', '{{SUPABASE_URL}}')
-            supabase_key = os.getenv('SUPABASE_KEY', '{{SUPABASE_KEY}}')
+            supabase_url = '{{SUPABASE_URL}}' if _SUPABASE_URL is None else _SUPABASE_URL
+            supabase_key = '{{SUPABASE_KEY}}' if _SUPABASE_KEY is None else _SUPABASE_KEY
             
-            # Replace placeholder values in HTML with actual credentials
-            # This allows the frontend JavaScript to connect to Supabase
-            html_content = html_content.replace('{{SUPABASE_URL}}', supabase_url)
-            html_content = html_content.replace('{{SUPABASE_KEY}}', supabase_key)
+            # Rendered page with credentials injected, so the frontend
+            # JavaScript can connect to Supabase
+            html_bytes = self._get_index_bytes(supabase_url, supabase_key)
             
             # Send response
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.send_header('Content-Length', str(len(html_content.encode('utf-8'))))
-            self.end_headers()
-            self.wfile.write(html_content.encode('utf-8'))
+            self.send_cached_response(html_bytes, 'text/html; charset=utf-8')
             
             # Log the status
             if not supabase_url.startswith('{{') and not supabase_key.startswith('{{'):
-                print('✅ Environment variables loaded successfully')
-                print(f'📊 Supabase URL: {supabase_url}')
-                print(f'🔑 Supabase Key: {supabase_key[:20]}...')
+                logger.debug('✅ Environment variables loaded successfully')
+                logger.debug('📊 Supabase URL: %s', supabase_url)
+                logger.debug('🔑 Supabase Key: %s...', supabase_key[:20])
             else:
-                print('⚠️  Environment variables not found - showing demo mode')
+                logger.debug('⚠️  Environment variables not found - showing demo mode')
             
         except FileNotFoundError:
             self.send_error(404, "index.html not found")
         except Exception as e:
-            print(f"Error serving HTML: {e}")
+            logger.error("Error serving HTML: %s", e)
             self.send_error(500, f"Internal server error: {str(e)}")
     
+    @classmethod
+    @lru_cache(maxsize=4)
+    def _get_index_bytes(cls, supabase_url, supabase_key):
+        """
+        Render index.html with the given credentials as UTF-8 bytes
+        
+        The template is read and split once; each (url, key) pair is rendered
+        and encoded once and then served from the cache.
+        """
+        if cls._INDEX_SEGMENTS is None:
+            # Use correct path for both local and Netlify environments
+            with open(INDEX_HTML_PATH, 'rb') as f:
+                cls._INDEX_SEGMENTS = INDEX_PLACEHOLDER_PATTERN.split(f.read().decode('utf-8'))
+        
+        values = {'{{SUPABASE_URL}}': supabase_url, '{{SUPABASE_KEY}}': supabase_key}
+        return ''.join(values.get(segment, segment) for segment in cls._INDEX_SEGMENTS).encode('utf-8')
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_page_bytes(filename):
+        """Read a static HTML page once; later requests are served from memory"""
+        # Use correct path for both local and Netlify environments
+        with open(get_file_path(filename), 'rb') as f:
+            return f.read()
+    
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _cached_response_head(cls, content_type, cors, content_encoding=None, status=200):
+        """Status line and fixed headers of a response with the given shape, as bytes"""
+        head = (
+            f'{cls.protocol_version} {status} {cls.responses[status][0]}\r\n'
+            f'Server: {cls.server_version} {cls.sys_version}\r\n'
+            f'Content-type: {content_type}\r\n'
+        )
+        if cors:
+            head += 'Access-Control-Allow-Origin: *\r\n'
+        if content_encoding:
+            head += f'Content-Encoding: {content_encoding}\r\nVary: Accept-Encoding\r\n'
+        return head.encode('latin-1')
+    
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _preflight_head(cls):
+        """Status line and headers of the CORS preflight response, as bytes"""
+        return (
+            f'{cls.protocol_version} 204 No Content\r\n'
+            f'Server: {cls.server_version} {cls.sys_version}\r\n'
+            'Access-Control-Allow-Origin: *\r\n'
+            'Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n'
+            'Access-Control-Allow-Headers: Content-Type, Authorization\r\n'
+            'Access-Control-Max-Age: 86400\r\n'
+            'Content-Length: 0\r\n'
+        ).encode('latin-1')
+    
+    def send_cached_response(self, body, content_type, cors=False, content_encoding=None, status=200):
+        """
+        Send a response for an in-memory body in a single write
+        
+        Bypasses send_response/send_header: the status line and fixed headers
+        are built once per response shape, and only Date and Content-Length
+        are added per request.
+        
+        Args:
+            body (bytes): Response body
+            content_type (str): Content-type header value
+            cors (bool): Whether to allow cross-origin access
+            content_encoding (str): Content-Encoding of body, if it is compressed
+            status (int): HTTP status code
+        """
+        self.log_request(status)
+        self.wfile.write(b'%sDate: %s\r\nContent-Length: %d\r\n\r\n%s' % (
+            self._cached_response_head(content_type, cors, content_encoding, status),
+            self.date_time_string().encode('latin-1'),
+            len(body),
+            body,
+        ))
+    
+    def send_json_response(self, body, status=200):
+        """
+        Send a serialized JSON body with CORS enabled, in a single write
+        
+        Args:
+            body (bytes): JSON response body
+            status (int): HTTP status code
+        """
+        self.send_cached_response(body, 'application/json', cors=True, status=status)
+    
+    def accepts_gzip(self):
+        """Whether the client listed gzip in its Accept-Encoding header"""
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+    
+    def write_file_body(self, file_obj, file_size):
+        """
+        Copy an open file to the response body after the headers are sent
+        
+        Uses zero-copy os.sendfile where the platform and socket support it,
+        otherwise copies in FILE_COPY_CHUNK_SIZE chunks; the file is never read whole.
+        
+        Exactly file_size bytes are sent, matching the Content-Length already
+        sent. If the file shrank and fewer bytes are available, the connection
+        is closed after the response so the client doesn't wait for the rest
+        or read the next response as part of this body.
+        
+        Args:
+            file_obj: File opened in binary mode
+            file_size: Number of bytes to send
+        """
+        offset = 0
+        try:
+            out_fd = self.wfile.fileno()
+            in_fd = file_obj.fileno()
+            # sendfile writes to the socket directly; anything buffered in wfile must go first
+            self.wfile.flush()
+            while offset < file_size:
+                sent = os.sendfile(out_fd, in_fd, offset, file_size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            if offset < file_size:
+                self.close_connection = True
+            return
+        except (AttributeError, io.UnsupportedOperation):
+            pass
+        except OSError as e:
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                raise
+        
+        # Copy at most the declared length, even if the file has grown since
+        file_obj.seek(offset)
+        while offset < file_size:
+            chunk = file_obj.read(min(FILE_COPY_CHUNK_SIZE, file_size - offset))
+            if not chunk:
+                self.close_connection = True
+                break
+            self.wfile.write(chunk)
+            offset += len(chunk)
+    
+    def send_generated_file(self, file_path, content_type, download_name, cors=True):
+        """
+        Stream a file generated for this request, then delete it
+        
+        Args:
+            file_path: Path of the generated file
+            content_type: Content-Type of the response
+            download_name: Filename offered to the client in Content-Disposition
+            cors: Whether to send Access-Control-Allow-Origin
+        """
+        try:
+            with open(file_path, 'rb') as generated_file:
+                file_size = os.fstat(generated_file.fileno()).st_size
+                
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Disposition', f'attachment; filename="{download_name}"')
+                self.send_header('Content-Length', str(file_size))
+                if cors:
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.write_file_body(generated_file, file_size)
+        finally:
+            os.remove(file_path)
+    
     def serve_login_page(self):
         """Serve the login page"""
         try:
-            # Read the login HTML file
-            login_file_path = get_file_path('login.html')
-            with open(login_file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+            html_bytes = self._get_page_bytes('login.html')
             
             # Send response
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.send_header('Content-Length', str(len(html_content.encode('utf-8'))))
-            self.end_headers()
-            self.wfile.write(html_content.encode('utf-8'))
+            self.send_cached_response(html_bytes, 'text/html; charset=utf-8')
             
         except FileNotFoundError:
             self.send_error(404, "login.html not found")
@@ -248,17 +861,10 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
     def serve_signup_page(self):
         """Serve the signup page"""
         try:
-            # Read the signup HTML file
-            signup_file_path = get_file_path('signup.html')
-            with open(signup_file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+            html_bytes = self._get_page_bytes('signup.html')
             
             # Send response
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.send_header('Content-Length', str(len(html_content.encode('utf-8'))))
-            self.end_headers()
-            self.wfile.write(html_content.encode('utf-8'))
+            self.send_cached_response(html_bytes, 'text/html; charset=utf-8')
             
         except FileNotFoundError:
             self.send_error(404, "signup.html not found")
@@ -268,24 +874,16 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
     
     def serve_config_api(self):
         """Serve configuration API endpoint"""
-        config = {
-            "supabaseConfigured": bool(os.getenv('SUPABASE_URL') and os.getenv('SUPABASE_KEY')),
-            "hasUrl": bool(os.getenv('SUPABASE_URL')),
-            "hasKey": bool(os.getenv('SUPABASE_KEY'))
-        }
-        
-        response = str(config).replace("'", '"').replace('True', 'true').replace('False', 'false')
-        
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(response.encode('utf-8'))
+        self.send_cached_response(CONFIG_RESPONSE, 'application/json', cors=True)
     
-    def deduplicate_role_string(self, role_string):
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def deduplicate_role_string(role_string):
         """
         Clean and deduplicate a comma-separated role string
         
+        Role strings repeat heavily across employees, so results are memoized.
+        
         Args:
             role_string: String like "Civil Engineer, Civil Engineer, Data Engineer"
             
@@ -294,15 +892,13 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
         """
         if not role_string:
             return role_string
-            
-        # Split by comma, clean each role, and deduplicate
-        roles = []
-        for role in role_string.split(','):
-            cleaned_role = role.strip()
-            if cleaned_role and cleaned_role not in roles:
-                roles.append(cleaned_role)
         
-        return ', '.join(roles)
+        # Most roles are a single entry
+        if ',' not in role_string:
+            return role_string.strip()
+            
+        # Split by comma, clean each role, and deduplicate keeping first-seen order
+        return ', '.join(dict.fromkeys(role.strip() for role in role_string.split(',') if role.strip()))
 
     def serve_employees_api(self):
         """
@@ -313,129 +909,116 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
         Used by: Employee list page, search functionality
         """
         try:
-            import json
-            from urllib.parse import unquote
-            
-            # Load parsed results from the JSON file created by section_e_parser.py
-            json_file_path = get_file_path('data/ParsedFiles/real_parsed_results.json')
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Transform raw parser data into frontend-friendly format
-            # Each resume becomes an employee record with flattened structure
-            employees = []
-            for resume in data.get('resumes', []):
-                employee_data = resume.get('data', {})
-                
-                # Skip resumes without names (parsing errors)
-                if employee_data.get('name'):
-                    # Create flattened employee object for table display
-                    raw_role = employee_data.get('role_in_contract', '')
-                    cleaned_role = self.deduplicate_role_string(raw_role)
-                    
-                    employees.append({
-                        'employee_name': employee_data.get('name'),
-                        'role_in_contract': cleaned_role,
-                        'total_years_experience': employee_data.get('years_experience', {}).get('total'),
-                        'firm_name': employee_data.get('firm_name_and_location'),
-                        'education': employee_data.get('education'),
-                        'professional_qualifications': employee_data.get('current_professional_registration'),
-                        'other_professional_qualifications': employee_data.get('other_professional_qualifications'),
-                        'filename': resume.get('filename'),
-                        'processed_at': resume.get('processed_at')
-                    })
-            
-            response = json.dumps(employees, indent=2)
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            # Load the employee list built from the JSON file created by section_e_parser.py;
+            # it is only rebuilt and re-serialized when the file changes
+            json_file_path = PARSED_RESULTS_PATH
+            response = load_json_view(json_file_path, 'employees_payload', self.build_employees_payload)
+            self.send_cached_response(response, 'application/json', cors=True)
             
         except Exception as e:
-            print(f"Error serving employees API: {e}")
-            error_response = json.dumps({"error": str(e)})
+            logger.error("Error serving employees API: %s", e)
+            error_response = orjson.dumps({"error": str(e)})
             self.send_response(500)
             self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(error_response)))
             self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.wfile.write(error_response)
+    
+    def build_employees_payload(self, data):
+        """
+        Build the serialized employees list for the frontend table
+        
+        Args:
+            data: Parsed results JSON
+            
+        Returns:
+            bytes: JSON array of flattened employee records
+        """
+        # Transform raw parser data into frontend-friendly format
+        # Each resume becomes an employee record with flattened structure
+        employees = []
+        append_employee = employees.append
+        deduplicate_roles = self.deduplicate_role_string
+        for resume in data.get('resumes', []):
+            employee_data = resume.get('data', {})
+            employee_name = employee_data.get('name')
+            
+            # Skip resumes without names (parsing errors)
+            if employee_name:
+                # Create flattened employee object for table display
+                append_employee({
+                    'employee_name': employee_name,
+                    'role_in_contract': deduplicate_roles(employee_data.get('role_in_contract', '')),
+                    'total_years_experience': employee_data.get('years_experience', {}).get('total'),
+                    'firm_name': employee_data.get('firm_name_and_location'),
+                    'education': employee_data.get('education'),
+                    'professional_qualifications': employee_data.get('current_professional_registration'),
+                    'other_professional_qualifications': employee_data.get('other_professional_qualifications'),
+                    'filename': resume.get('filename'),
+                    'processed_at': resume.get('processed_at')
+                })
+        
+        # Compact output: the table is the only consumer
+        return orjson.dumps(employees)
     
     def serve_employee_detail_api(self, employee_name):
         """Serve individual employee detail API endpoint"""
         try:
-            import json
-            from urllib.parse import unquote
-            
             # Decode URL-encoded name
-            employee_name = unquote(employee_name)
+            employee_name = unquote_cached(employee_name)
             
             # Load parsed results
             # Use correct path for both local and Netlify environments
-            json_file_path = get_file_path('data/ParsedFiles/real_parsed_results.json')
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            json_file_path = PARSED_RESULTS_PATH
+            name_index = load_json_view(json_file_path, 'name_index', build_resume_name_index)
             
             # Find employee data
             employee_detail = None
-            for resume in data.get('resumes', []):
+            resume = name_index.get(employee_name)
+            if resume is not None:
                 employee_data = resume.get('data', {})
-                if employee_data.get('name') == employee_name:
-                    employee_detail = {
-                        'employee_name': employee_data.get('name'),
-                        'role_in_contract': employee_data.get('role_in_contract'),
-                        'total_years_experience': employee_data.get('years_experience', {}).get('total'),
-                        'years_with_current_firm': employee_data.get('years_experience', {}).get('with_current_firm'),
-                        'firm_name': employee_data.get('firm_name_and_location'),
-                        'education': employee_data.get('education'),
-                        'professional_qualifications': employee_data.get('current_professional_registration'),
-                        'other_professional_qualifications': employee_data.get('other_professional_qualifications'),
-                        'relevant_projects': employee_data.get('relevant_projects', []),
-                        'filename': resume.get('filename'),
-                        'processed_at': resume.get('processed_at')
-                    }
-                    break
+                employee_detail = {
+                    'employee_name': employee_data.get('name'),
+                    'role_in_contract': employee_data.get('role_in_contract'),
+                    'total_years_experience': employee_data.get('years_experience', {}).get('total'),
+                    'years_with_current_firm': employee_data.get('years_experience', {}).get('with_current_firm'),
+                    'firm_name': employee_data.get('firm_name_and_location'),
+                    'education': employee_data.get('education'),
+                    'professional_qualifications': employee_data.get('current_professional_registration'),
+                    'other_professional_qualifications': employee_data.get('other_professional_qualifications'),
+                    'relevant_projects': employee_data.get('relevant_projects', []),
+                    'filename': resume.get('filename'),
+                    'processed_at': resume.get('processed_at')
+                }
             
             if employee_detail:
-                response = json.dumps(employee_detail, indent=2)
-                self.send_response(200)
+                response = orjson.dumps(employee_detail)
+                status = 200
             else:
-                response = json.dumps({"error": "Employee not found"})
-                self.send_response(404)
+                response = orjson.dumps({"error": "Employee not found"})
+                status = 404
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            print(f"Error serving employee detail API: {e}")
-            error_response = json.dumps({"error": str(e)})
+            logger.error("Error serving employee detail API: %s", e)
+            error_response = orjson.dumps({"error": str(e)})
             self.send_response(500)
             self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(error_response)))
             self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.wfile.write(error_response)
     
     def serve_all_projects_api(self):
         """Serve all projects across all employees from Supabase database"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
-            
-            if not supabase_url or not supabase_key:
+            if not _SUPABASE_URL or not _SUPABASE_KEY:
                 # Fallback to local data if Supabase not configured
                 try:
                     # Load parsed results from local JSON file
-                    json_file_path = get_file_path('data/ParsedFiles/real_parsed_results.json')
-                    with open(json_file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    json_file_path = PARSED_RESULTS_PATH
+                    data = load_json_cached(json_file_path)
                     
                     all_projects = []
                     for resume in data.get('resumes', []):
@@ -453,149 +1036,103 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                                     'source': 'local'
                                 })
                     
-                    response = json.dumps({'projects': all_projects}, indent=2)
+                    response = orjson.dumps({'projects': all_projects})
                 except Exception as e:
-                    print(f"Error loading local data: {e}")
-                    response = json.dumps({'projects': []})
+                    logger.error("Error loading local data: %s", e)
+                    response = orjson.dumps({'projects': []})
                 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(response.encode('utf-8'))
+                self.send_json_response(response)
                 return
             
-            # Connect to Supabase and get all projects with employee info
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
-            
-            print("🔍 Fetching all projects from Supabase...")
-            
-            # First try to get all projects directly
-            try:
-                project_result = supabase.table('projects').select('project_id, title_and_location, description_scope').execute()
-                employee_result = supabase.table('employees').select('employee_id, employee_name').execute()
-                assignment_result = supabase.table('employee_assignments').select('employee_id, project_id').execute()
-                
-                print(f"📊 Found {len(project_result.data) if project_result.data else 0} projects")
-                print(f"📊 Found {len(employee_result.data) if employee_result.data else 0} employees")
-                print(f"📊 Found {len(assignment_result.data) if assignment_result.data else 0} assignments")
-                
-                # Build lookup maps
-                employees_map = {emp['employee_id']: emp['employee_name'] for emp in employee_result.data or []}
-                projects_map = {proj['project_id']: proj for proj in project_result.data or []}
-                
-                all_projects = []
-                for assignment in assignment_result.data or []:
-                    employee_id = assignment.get('employee_id')
-                    project_id = assignment.get('project_id')
+            now = time.monotonic()
+            if now < _ALL_PROJECTS_CACHE['expires']:
+                body = _ALL_PROJECTS_CACHE['body']
+            else:
+                logger.debug("🔍 Fetching all projects from Supabase...")
+                
+                # One round trip: assignments with their project and employee embedded
+                try:
+                    result = get_supabase_client().table('employee_assignments').select(
+                        'employee_id, project_id, '
+                        'projects(project_id, title_and_location, description_scope), '
+                        'employees(employee_name)'
+                    ).execute()
                     
-                    if employee_id in employees_map and project_id in projects_map:
-                        project = projects_map[project_id]
-                        employee_name = employees_map[employee_id]
-                        
-                        all_projects.append({
-                            'project_id': project.get('project_id'),
-                            'title_and_location': project.get('title_and_location', ''),
-                            'description_scope': project.get('description_scope', ''),
-                            'employee_name': employee_name,
-                            'employee_id': employee_id,
+                    all_projects = [
+                        {
+                            'project_id': row['projects'].get('project_id'),
+                            'title_and_location': row['projects'].get('title_and_location') or '',
+                            'description_scope': row['projects'].get('description_scope') or '',
+                            'employee_name': row['employees'].get('employee_name'),
+                            'employee_id': row.get('employee_id'),
                             'source': 'database'
-                        })
-                
-                print(f"✅ Processed {len(all_projects)} valid projects")
-                response = json.dumps({'projects': all_projects}, indent=2)
-                
-            except Exception as join_error:
-                print(f"⚠️ Join query failed, trying simpler approach: {join_error}")
-                # Fallback to simple query without joins
-                result = supabase.table('employee_assignments').select('*').execute()
-            
-                print(f"📊 Fallback query result: {len(result.data) if result.data else 0} assignments found")
-                
-                if result.data:
-                    # This is the fallback case - we have assignment data but need to fetch projects/employees separately
-                    response = json.dumps({'projects': []})  # For now, return empty for fallback
-                else:
-                    response = json.dumps({'projects': []})
+                        }
+                        for row in result.data or []
+                        if row.get('projects') and row.get('employees')
+                    ]
+                    
+                    logger.debug("✅ Processed %d valid projects", len(all_projects))
+                    body = orjson.dumps({'projects': all_projects})
+                    _ALL_PROJECTS_CACHE['body'] = body
+                    _ALL_PROJECTS_CACHE['expires'] = now + ALL_PROJECTS_TTL_SECONDS
+                    
+                except Exception as join_error:
+                    # Not cached, so the next request retries the query
+                    logger.warning("⚠️ Projects query failed: %s", join_error)
+                    body = orjson.dumps({'projects': []})
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(body)
             
         except Exception as e:
-            print(f"Error serving all projects API: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            logger.error("Error serving all projects API: %s", e)
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
     
     def serve_custom_pdf_generation_api(self):
         """Generate and serve PDF from customized resume data received via POST"""
         try:
-            import json
-            
             # Read the POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            resume_data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            resume_data = orjson.loads(post_data)
             
-            print(f"🔄 Generating custom PDF with {len(resume_data.get('projects', []))} projects")
+            logger.debug("🔄 Generating custom PDF with %d projects", len(resume_data.get('projects', [])))
             
             # Transform frontend resume data to backend format
             employee_data = self.transform_resume_data(resume_data)
             
             # Try to generate PDF with custom data
             try:
-                from src.generators.pdf_form_filler import SectionEPDFGenerator
-                
-                generator = SectionEPDFGenerator()
-                pdf_path = generator.create_section_e_pdf(employee_data)
+                pdf_path = GENERATOR_POOL.submit(
+                    get_pdf_generator().create_section_e_pdf, employee_data, request_output_filename('.pdf')
+                ).result()
                 
                 if pdf_path and os.path.exists(pdf_path):
-                    # Read the PDF file
-                    with open(pdf_path, 'rb') as pdf_file:
-                        pdf_content = pdf_file.read()
-                    
-                    # Send PDF response
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/pdf')
-                    self.send_header('Content-Disposition', f'attachment; filename="SectionE_{employee_data.get("name", "Unknown").replace(" ", "_")}.pdf"')
-                    self.send_header('Content-Length', str(len(pdf_content)))
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(pdf_content)
+                    # Stream the PDF file to the client without loading it into memory
+                    self.send_generated_file(
+                        pdf_path, 'application/pdf',
+                        f'SectionE_{filename_slug(employee_data.get("name", "Unknown"))}.pdf'
+                    )
                     
-                    print(f"✅ Custom PDF served successfully")
+                    logger.debug("✅ Custom PDF served successfully")
                     return
                 else:
                     raise Exception("Failed to generate PDF")
                         
             except ImportError:
-                print("⚠️ PDF generator dependencies not installed")
+                logger.warning("⚠️ PDF generator dependencies not installed")
                 raise Exception("PDF generation dependencies not available")
             except Exception as e:
-                print(f"⚠️ PDF generation failed: {e}")
-                print("Falling back to simple PDF generation...")
+                logger.warning("⚠️ PDF generation failed, falling back to simple PDF generation: %s", e)
                 
                 # Fallback: Generate simple PDF
                 self.generate_custom_fallback_pdf(employee_data)
                 return
                 
         except Exception as e:
-            print(f"Error generating custom PDF: {e}")
-            import json
-            error_response = json.dumps({"error": str(e), "message": "Custom PDF generation failed"})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            logger.error("Error generating custom PDF: %s", e)
+            error_response = orjson.dumps({"error": str(e), "message": "Custom PDF generation failed"})
+            self.send_json_response(error_response, 500)
     
     def transform_resume_data(self, resume_data):
         """Transform frontend resume data format to backend format"""
@@ -621,7 +1158,12 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                     'performed_with_same_firm': project.get('performedWithSameFirm', False)
                 }
                 relevant_projects.append(project_data)
-                print(f"🔍 Backend transforming project: {project.get('title', '')} - Professional: {project.get('professionalServicesYear', '')} - Construction: {project.get('constructionYear', '')} - Checkbox: {project.get('performedWithSameFirm', False)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "🔍 Backend transforming project: %s - Professional: %s - Construction: %s - Checkbox: %s",
+                        project.get('title', ''), project.get('professionalServicesYear', ''),
+                        project.get('constructionYear', ''), project.get('performedWithSameFirm', False)
+                    )
         
         return {
             'name': personal_info.get('name', ''),
@@ -637,29 +1179,47 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             'relevant_projects': relevant_projects
         }
     
+    @staticmethod
+    def draw_pages(p, pages):
+        """
+        Draw laid-out pages, switching fonts once per font on each page
+        
+        Args:
+            p: ReportLab canvas
+            pages (list): One list per page of (font name, font size, x, y, text) tuples
+        """
+        for page_number, runs in enumerate(pages):
+            if page_number:
+                p.showPage()
+            current_font = None
+            for font_name, font_size, x, y, text in sorted(runs, key=lambda run: (run[0], run[1])):
+                if (font_name, font_size) != current_font:
+                    p.setFont(font_name, font_size)
+                    current_font = (font_name, font_size)
+                p.drawString(x, y, text)
+    
     def generate_custom_fallback_pdf(self, employee_data):
         """Generate a simple PDF when template filling fails with custom data"""
         try:
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import letter
-            import io
+            Canvas, letter = load_reportlab()
             
             # Create PDF in memory
             buffer = io.BytesIO()
-            p = canvas.Canvas(buffer, pagesize=letter)
+            p = Canvas(buffer, pagesize=letter)
             width, height = letter
             
+            # Layout pass: text runs are collected per page and drawn once layout is done
+            runs = []
+            pages = [runs]
+            
             # Title
-            p.setFont("Helvetica-Bold", 16)
-            p.drawString(50, height - 50, "STANDARD FORM 330 - SECTION E")
+            runs.append(("Helvetica-Bold", 16, 50, height - 50, "STANDARD FORM 330 - SECTION E"))
             
             # Employee information
             y_position = height - 100
-            p.setFont("Helvetica-Bold", 12)
-            p.drawString(50, y_position, "EMPLOYEE INFORMATION")
+            runs.append(("Helvetica-Bold", 12, 50, y_position, "EMPLOYEE INFORMATION"))
             
             y_position -= 30
-            p.setFont("Helvetica", 10)
             
             fields = [
                 ("Name:", employee_data.get('name', '')),
@@ -674,13 +1234,12 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             
             for label, value in fields:
                 if y_position < 100:  # Start new page if needed
-                    p.showPage()
+                    runs = []
+                    pages.append(runs)
                     y_position = height - 50
                 
-                p.setFont("Helvetica-Bold", 10)
-                p.drawString(50, y_position, label)
-                p.setFont("Helvetica", 10)
-                p.drawString(200, y_position, str(value)[:80])  # Truncate long text
+                runs.append(("Helvetica-Bold", 10, 50, y_position, label))
+                runs.append(("Helvetica", 10, 200, y_position, truncate_text(str(value), 80)))  # Truncate long text
                 y_position -= 20
             
             # Projects section - use the FILTERED projects from frontend
@@ -688,92 +1247,197 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             if projects:
                 y_position -= 20
                 if y_position < 100:
-                    p.showPage()
+                    runs = []
+                    pages.append(runs)
                     y_position = height - 50
                 
-                p.setFont("Helvetica-Bold", 12)
-                p.drawString(50, y_position, f"RELEVANT PROJECTS ({len(projects)} selected)")
+                runs.append(("Helvetica-Bold", 12, 50, y_position, f"RELEVANT PROJECTS ({len(projects)} selected)"))
                 y_position -= 30
                 
                 for i, project in enumerate(projects, 1):
                     if y_position < 150:
-                        p.showPage()
+                        runs = []
+                        pages.append(runs)
                         y_position = height - 50
                     
-                    p.setFont("Helvetica-Bold", 10)
-                    p.drawString(50, y_position, f"Project {i}:")
+                    runs.append(("Helvetica-Bold", 10, 50, y_position, f"Project {i}:"))
                     y_position -= 15
                     
-                    p.setFont("Helvetica", 9)
-                    title = project.get('title_and_location', '')
-                    p.drawString(70, y_position, f"Title: {title[:60]}")
-                    y_position -= 15
+                    # Rows without content are left out instead of drawing an empty label
+                    title = project.get('title_and_location')
+                    if title:
+                        runs.append(("Helvetica", 9, 70, y_position, f"Title: {truncate_text(title, 60)}"))
+                        y_position -= 15
                     
-                    year_info = project.get('year_completed', {})
-                    if year_info:
-                        prof_year = year_info.get('professional_services', '')
-                        year_text = f"Year: {prof_year}"
-                        p.drawString(70, y_position, year_text)
+                    year_info = project.get('year_completed') or {}
+                    prof_year = year_info.get('professional_services')
+                    if prof_year:
+                        runs.append(("Helvetica", 9, 70, y_position, f"Year: {prof_year}"))
                         y_position -= 15
                     
                     description = project.get('description', {})
-                    if description.get('scope'):
-                        desc_text = description['scope'][:100] + ('...' if len(description['scope']) > 100 else '')
-                        p.drawString(70, y_position, f"Description: {desc_text}")
+                    scope = description.get('scope')
+                    if scope:
+                        desc_text = truncate_text(scope, 100, '...')
+                        runs.append(("Helvetica", 9, 70, y_position, f"Description: {desc_text}"))
                         y_position -= 15
                     
-                    if description.get('role'):
-                        p.drawString(70, y_position, f"Role: {description['role'][:60]}")
+                    role = description.get('role')
+                    if role:
+                        runs.append(("Helvetica", 9, 70, y_position, f"Role: {truncate_text(role, 60)}"))
                         y_position -= 15
                     
                     # Add checkbox information
                     performed_with_same_firm = project.get('performed_with_same_firm', False)
-                    checkbox_symbol = "☑" if performed_with_same_firm else "☐"
-                    p.drawString(70, y_position, f"{checkbox_symbol} Performed with same firm")
+                    checkbox_symbol = CHECKBOX_CHECKED if performed_with_same_firm else CHECKBOX_UNCHECKED
+                    runs.append(("Helvetica", 9, 70, y_position, f"{checkbox_symbol} Performed with same firm"))
                     y_position -= 15
                     
                     y_position -= 10
             
+            self.draw_pages(p, pages)
             p.save()
             
-            # Get PDF content
-            pdf_content = buffer.getvalue()
-            buffer.close()
+            # Send the canvas buffer in place instead of copying it to a bytes object
+            pdf_content = buffer.getbuffer()
             
             # Send PDF response
             self.send_response(200)
             self.send_header('Content-Type', 'application/pdf')
-            self.send_header('Content-Disposition', f'attachment; filename="SectionE_{employee_data.get("name", "Unknown").replace(" ", "_")}.pdf"')
+            self.send_header('Content-Disposition', f'attachment; filename="SectionE_{filename_slug(employee_data.get("name", "Unknown"))}.pdf"')
             self.send_header('Content-Length', str(len(pdf_content)))
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             self.wfile.write(pdf_content)
+            pdf_content.release()
+            buffer.close()
             
             print(f"✅ Custom fallback PDF generated successfully")
             
         except Exception as e:
             print(f"Error in custom fallback PDF generation: {e}")
-            import json
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
 
+    def stream_multipart_file(self, content_length, boundary, out_file, chunk_size=1 << 20, required_prefix=b''):
+        """
+        Copy the first file field of a multipart/form-data request body to out_file
+        
+        The body is read in chunks and scanned with find() from where the last
+        scan stopped, keeping back only a tail that might hold a split
+        delimiter, so each byte is examined once and the upload is never held
+        in memory whole. Whatever follows the file is read and discarded so the
+        connection can serve another request.
+        
+        Args:
+            content_length (int): Length of the request body in bytes
+            boundary (str): Multipart boundary from the Content-Type header
+            out_file: Binary file object that receives the file's contents
+            chunk_size (int): Number of bytes read from the socket at a time
+            required_prefix (bytes): Leading bytes the file must start with
+                (e.g. a magic number); checked before anything is written
+            
+        Returns:
+            str: Filename of the uploaded file, or None if no file field was found
+            
+        Raises:
+            ValueError: If the file does not start with required_prefix
+        """
+        delimiter = f'--{boundary}'.encode()
+        # File contents end at the CRLF that precedes the next delimiter
+        data_end = b'\r\n' + delimiter
+        remaining = content_length
+        buf = bytearray()
+        pos = 0
+        filename = None
+        in_file = False
+        prefix_checked = not required_prefix
+        rejected = False
+        
+        while True:
+            if not in_file:
+                # Look for the headers of the next part
+                start = buf.find(delimiter, pos)
+                header_end = buf.find(b'\r\n\r\n', start) if start >= 0 else -1
+                if header_end >= 0:
+                    # Search the header block in place; only the filename itself is copied
+                    header_start = start + len(delimiter)
+                    pos = header_end + 4
+                    if (buf.find(b'Content-Disposition: form-data', header_start, header_end) >= 0
+                            and buf.find(b'filename=', header_start, header_end) >= 0):
+                        name_start = buf.find(b'filename="', header_start, header_end)
+                        name_end = buf.find(b'"', name_start + 10, header_end) if name_start >= 0 else -1
+                        if name_end >= 0:
+                            filename = buf[name_start + 10:name_end].decode('utf-8', errors='ignore')
+                        in_file = True
+                        del buf[:pos]
+                        pos = 0
+                    continue
+                
+                # Keep only the bytes that may still hold a delimiter or part headers
+                keep_from = start if start >= 0 else max(pos, len(buf) - len(delimiter) + 1)
+                del buf[:keep_from]
+                pos = 0
+            else:
+                end = buf.find(data_end)
+                if not prefix_checked and (end >= 0 or len(buf) >= len(required_prefix)):
+                    # Enough of the file has arrived to check its leading bytes
+                    if not buf.startswith(required_prefix, 0, end if end >= 0 else len(buf)):
+                        rejected = True
+                        break
+                    prefix_checked = True
+                
+                if prefix_checked:
+                    if end >= 0:
+                        with memoryview(buf) as view:
+                            out_file.write(view[:end])
+                        break
+                    
+                    # Everything but a possible partial delimiter at the end is file data
+                    safe_length = len(buf) - len(data_end) + 1
+                    if safe_length > 0:
+                        with memoryview(buf) as view:
+                            out_file.write(view[:safe_length])
+                        del buf[:safe_length]
+            
+            chunk = self.read_request_body(min(chunk_size, remaining)) if remaining > 0 else b''
+            if not chunk:
+                # Body ended before the closing delimiter; keep what arrived
+                if in_file:
+                    if prefix_checked or buf.startswith(required_prefix):
+                        out_file.write(buf)
+                    else:
+                        rejected = True
+                break
+            remaining -= len(chunk)
+            buf += chunk
+        
+        # Drain the rest of the body so the connection stays in sync
+        while remaining > 0:
+            chunk = self.read_request_body(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        
+        if rejected:
+            raise ValueError("Uploaded file is not a valid PDF")
+        
+        return filename
+    
     def serve_solicitation_analysis_api(self):
-        """Analyze uploaded solicitation PDF and extract keywords for project matching"""
+        """
+        Analyze uploaded solicitation PDF and extract keywords for project matching
+        
+        Clients that send 'Accept: text/event-stream' get the model output as it
+        is generated: 'delta' events carry JSON-encoded text fragments, followed
+        by a 'result' event with the final response (or an 'error' event).
+        """
+        # Whether the 200 event-stream headers have gone out; errors after that are sent as events
+        stream_started = False
         try:
-            import json
-            import tempfile
-            import os
-            import re
-            from src.parsers.enhanced_text_extractor import EnhancedTextExtractor
-            from openai import OpenAI
-            
             # Check for OpenAI API key
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
+            client = get_openai_client()
+            if client is None:
                 raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY in .env file.")
             
             # Parse multipart form data manually (since cgi module is deprecated)
@@ -793,51 +1457,29 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             if content_length == 0:
                 raise Exception("No file data received")
             
-            multipart_data = self.rfile.read(content_length)
-            
-            # Parse multipart data to extract file
-            boundary_bytes = f'--{boundary}'.encode()
-            parts = multipart_data.split(boundary_bytes)
-            
-            file_data = None
-            filename = None
-            
-            for part in parts:
-                if b'Content-Disposition: form-data' in part and b'filename=' in part:
-                    # Extract filename
-                    header_end = part.find(b'\r\n\r\n')
-                    if header_end == -1:
-                        continue
-                    
-                    headers = part[:header_end].decode('utf-8', errors='ignore')
-                    filename_match = re.search(r'filename="([^"]*)"', headers)
-                    if filename_match:
-                        filename = filename_match.group(1)
-                    
-                    # Extract file data (after double CRLF)
-                    file_data = part[header_end + 4:]
-                    # Remove trailing CRLF if present
-                    if file_data.endswith(b'\r\n'):
-                        file_data = file_data[:-2]
-                    break
-            
-            if not file_data or not filename:
-                raise Exception("No PDF file found in upload")
-            
-            # Validate file type
-            if not filename.lower().endswith('.pdf'):
-                raise Exception("Only PDF files are supported")
-            
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_file.write(file_data)
+            # Stream the uploaded file straight into a temporary file
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', buffering=UPLOAD_BUFFER_SIZE) as temp_file:
                 temp_file_path = temp_file.name
+                try:
+                    # Non-PDF uploads are rejected before any of their bytes hit the disk
+                    filename = self.stream_multipart_file(content_length, boundary, temp_file, required_prefix=b'%PDF-')
+                except Exception:
+                    temp_file.close()
+                    os.unlink(temp_file_path)
+                    raise
+                file_size = temp_file.tell()
             
             try:
+                if not file_size or not filename:
+                    raise Exception("No PDF file found in upload")
+                
+                # Validate file type
+                if not filename.lower().endswith('.pdf'):
+                    raise Exception("Only PDF files are supported")
+                
                 # Extract text from PDF
                 print(f"🔍 Analyzing solicitation PDF: {filename}")
-                extractor = EnhancedTextExtractor()
-                text, method_used = extractor.extract_text_with_fallback(temp_file_path)
+                text, method_used = get_text_extractor().extract_text_with_fallback(temp_file_path)
                 
                 if not text:
                     raise Exception("Failed to extract text from PDF")
@@ -845,89 +1487,62 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 print(f"✓ Extracted {len(text)} characters using {method_used}")
                 
                 # Handle large documents by chunking text
-                max_chars = 50000  # Conservative limit (~12-15K tokens)
-                if len(text) > max_chars:
-                    print(f"⚠️ Large document detected ({len(text)} chars). Chunking for analysis...")
-                    # Take the first portion and try to find a good break point
-                    chunk = text[:max_chars]
-                    # Try to break at a paragraph or sentence
-                    last_paragraph = chunk.rfind('\n\n')
-                    last_sentence = chunk.rfind('. ')
-                    if last_paragraph > max_chars * 0.8:  # If paragraph break is in last 20%
-                        text = chunk[:last_paragraph]
-                    elif last_sentence > max_chars * 0.8:  # If sentence break is in last 20%
-                        text = chunk[:last_sentence + 1]
-                    else:
-                        text = chunk  # Use full chunk if no good break point
-                    print(f"✓ Using first {len(text)} characters for analysis")
-                
-                # Analyze with OpenAI to extract keywords
-                client = OpenAI(api_key=api_key)
-                
-                analysis_prompt = """
-                You are an expert at analyzing government solicitation documents for construction and engineering projects.
-                
-                Extract key information from this solicitation document and return it as a JSON object with the following structure:
-                
-                {
-                  "keywords": [
-                    {
-                      "category": "location",
-                      "text": "specific location or geographic area"
-                    },
-                    {
-                      "category": "role", 
-                      "text": "specific role or position required"
-                    },
-                    {
-                      "category": "technology",
-                      "text": "specific technology, software, or methodology"
-                    },
-                    {
-                      "category": "industry",
-                      "text": "industry sector or type of work"
-                    },
-                    {
-                      "category": "skill",
-                      "text": "specific skill or expertise required"
-                    },
-                    {
-                      "category": "certification",
-                      "text": "certification or license requirement"
-                    }
-                  ]
-                }
-                
-                Focus on extracting:
-                - Project locations (cities, states, regions)
-                - Required roles/positions (Engineer, Project Manager, etc.)
-                - Technical skills and technologies
-                - Industry types (transportation, water, environmental, etc.)
-                - Required certifications or licenses
-                - Specific methodologies or approaches
-                
-                Extract 10-15 of the most relevant keywords that would be useful for matching against project descriptions.
-                Each keyword should be specific and actionable for project matching.
-                
-                Return only the JSON object, no additional text.
-                """
+                max_chars = 50000  # Conservative limit (~12-15K tokens)
+                if len(text) > max_chars:
+                    print(f"⚠️ Large document detected ({len(text)} chars). Chunking for analysis...")
+                    # Take the first portion, breaking at a paragraph or sentence in
+                    # its last 20%; search only that window of the original text
+                    window_start = int(max_chars * 0.8) + 1
+                    cut = text.rfind('\n\n', window_start, max_chars)
+                    if cut < 0:
+                        cut = text.rfind('. ', window_start, max_chars)
+                        cut = cut + 1 if cut >= 0 else max_chars  # Use full chunk if no good break point
+                    text = text[:cut]
+                    print(f"✓ Using first {len(text)} characters for analysis")
                 
-                response = client.chat.completions.create(
-                    model="gpt-4-turbo",
+                # Analyze with OpenAI to extract keywords
+                streaming = 'text/event-stream' in self.headers.get('Accept', '')
+                response = OPENAI_POOL.submit(
+                    client.chat.completions.create,
+                    model=KEYWORD_EXTRACTION_MODEL,
                     messages=[
-                        {"role": "system", "content": analysis_prompt},
+                        {"role": "system", "content": KEYWORD_EXTRACTION_PROMPT},
                         {"role": "user", "content": text}
                     ],
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {"name": "keywords", "schema": KEYWORD_SCHEMA, "strict": True}
+                    },
                     temperature=0,
-                    max_tokens=1500  # Reduced to leave more room for input tokens
-                )
+                    max_tokens=1500,  # Reduced to leave more room for input tokens
+                    stream=streaming
+                ).result()
+                
+                if streaming:
+                    # Forward tokens as they arrive; the stream ends when the connection closes
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/event-stream')
+                    self.send_header('Cache-Control', 'no-cache')
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.end_headers()
+                    stream_started = True
+                    
+                    parts = []
+                    for chunk in response:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            parts.append(delta)
+                            self.wfile.write(b'event: delta\ndata: ' + orjson.dumps(delta) + b'\n\n')
+                            self.wfile.flush()
+                    content = ''.join(parts)
+                else:
+                    content = response.choices[0].message.content
                 
-                content = response.choices[0].message.content
                 if not content:
                     raise Exception("Empty response from OpenAI")
                 
                 # Parse the JSON response
-                analysis_result = json.loads(content)
+                analysis_result = orjson.loads(content)
                 
                 # Validate the response structure
                 if 'keywords' not in analysis_result:
@@ -948,12 +1563,17 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                     "keywords": keywords
                 }
                 
-                response_json = json.dumps(result, indent=2)
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(response_json.encode('utf-8'))
+                response_json = orjson.dumps(result)
+                if stream_started:
+                    self.wfile.write(b'event: result\ndata: ' + response_json + b'\n\n')
+                    return
+                
+                if len(response_json) >= GZIP_MIN_SIZE and self.accepts_gzip():
+                    # One-off body: the fastest level still gets most of the size win
+                    response_json = gzip.compress(response_json, compresslevel=1)
+                    self.send_cached_response(response_json, 'application/json', cors=True, content_encoding='gzip')
+                else:
+                    self.send_json_response(response_json)
                 
             finally:
                 # Clean up temporary file
@@ -962,15 +1582,15 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 
         except json.JSONDecodeError as e:
             print(f"JSON parsing error: {e}")
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "error": "Failed to parse AI response", 
                 "details": str(e)
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            if stream_started:
+                self.wfile.write(b'event: error\ndata: ' + error_response + b'\n\n')
+                return
+            
+            self.send_json_response(error_response, 500)
             
         except Exception as e:
             print(f"Error analyzing solicitation: {e}")
@@ -978,128 +1598,107 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             # Provide specific error messages for common issues
             error_message = str(e)
             if "rate_limit_exceeded" in error_message or "Request too large" in error_message:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Document too large for analysis", 
                     "message": "The uploaded PDF is too large. Please try with a smaller document (under 50 pages) or a more focused solicitation section.",
                     "suggestion": "Consider uploading just the technical requirements or scope of work sections."
                 })
             elif "Invalid API key" in error_message or "Incorrect API key" in error_message:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "OpenAI API configuration issue", 
                     "message": "Please check your OpenAI API key configuration in the .env file."
                 })
             else:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": str(e), 
                     "message": "Solicitation analysis failed"
                 })
             
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            if stream_started:
+                self.wfile.write(b'event: error\ndata: ' + error_response + b'\n\n')
+                return
+            
+            self.send_json_response(error_response, 500)
 
     def serve_pdf_generation_api(self, employee_name):
         """Generate and serve PDF for an employee"""
         try:
-            import json
-            from urllib.parse import unquote
-            
             # Decode URL-encoded name
-            employee_name = unquote(employee_name)
+            employee_name = unquote_cached(employee_name)
             
             # Try to import and use the PDF generator
             try:
-                from src.generators.pdf_form_filler import SectionEPDFGenerator
-                
                 # Use the updated SectionEPDFGenerator (it handles both Supabase and JSON fallback internally)
-                generator = SectionEPDFGenerator()
-                pdf_path = generator.generate_resume_by_name(employee_name)
+                pdf_path = GENERATOR_POOL.submit(
+                    get_pdf_generator().generate_resume_by_name, employee_name, request_output_filename('.pdf')
+                ).result()
                 
                 if pdf_path and os.path.exists(pdf_path):
-                    # Read the PDF file
-                    with open(pdf_path, 'rb') as pdf_file:
-                        pdf_content = pdf_file.read()
-                    
-                    # Send PDF response
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/pdf')
-                    self.send_header('Content-Disposition', f'attachment; filename="SectionE_{employee_name.replace(" ", "_")}.pdf"')
-                    self.send_header('Content-Length', str(len(pdf_content)))
-                    self.end_headers()
-                    self.wfile.write(pdf_content)
+                    # Stream the PDF file to the client without loading it into memory
+                    self.send_generated_file(
+                        pdf_path, 'application/pdf', f'SectionE_{filename_slug(employee_name)}.pdf', cors=False
+                    )
                     
-                    print(f"✅ PDF served successfully for: {employee_name}")
+                    logger.debug("✅ PDF served successfully for: %s", employee_name)
                     return
                 else:
                     raise Exception("Failed to generate PDF")
                         
             except ImportError:
-                print("⚠️ PDF generator dependencies not installed")
+                logger.warning("⚠️ PDF generator dependencies not installed")
                 raise Exception("PDF generation dependencies not available")
             except Exception as e:
-                print(f"⚠️ Database PDF generation failed: {e}")
-                print("Falling back to JSON-based PDF generation...")
+                logger.warning("⚠️ Database PDF generation failed, falling back to JSON-based PDF generation: %s", e)
                 
                 # Fallback: Use JSON file for PDF generation
                 self.generate_pdf_from_json(employee_name)
                 return
                 
         except Exception as e:
-            print(f"Error generating PDF: {e}")
-            error_response = json.dumps({"error": str(e), "message": "PDF generation failed"})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            logger.error("Error generating PDF: %s", e)
+            error_response = orjson.dumps({"error": str(e), "message": "PDF generation failed"})
+            self.send_json_response(error_response, 500)
     
     def generate_pdf_from_json(self, employee_name):
         """Generate PDF from JSON data as fallback"""
         try:
-            import json
-            from urllib.parse import unquote
-            
             # Load parsed results
             # Use correct path for both local and Netlify environments
-            json_file_path = get_file_path('data/ParsedFiles/real_parsed_results.json')
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            json_file_path = PARSED_RESULTS_PATH
+            name_index = load_json_view(json_file_path, 'name_index', build_resume_name_index)
             
             # Find employee data
-            employee_data = None
-            for resume in data.get('resumes', []):
-                resume_data = resume.get('data', {})
-                if resume_data.get('name') == employee_name:
-                    employee_data = resume_data
-                    break
+            resume = name_index.get(employee_name)
+            if resume is None:
+                # Tolerate case and whitespace differences in the requested name
+                folded_index = load_json_view(json_file_path, 'folded_name_index', build_resume_folded_name_index)
+                resume = folded_index.get(normalize_employee_name(employee_name))
+            employee_data = resume.get('data', {}) if resume is not None else None
             
             if not employee_data:
                 raise Exception(f"Employee '{employee_name}' not found in parsed data")
             
             # Try to use reportlab to create a simple PDF
             try:
-                from reportlab.pdfgen import canvas
-                from reportlab.lib.pagesizes import letter
-                import io
+                Canvas, letter = load_reportlab()
                 
                 # Create PDF in memory
                 buffer = io.BytesIO()
-                p = canvas.Canvas(buffer, pagesize=letter)
+                p = Canvas(buffer, pagesize=letter)
                 width, height = letter
                 
+                # Layout pass: text runs are collected per page and drawn once layout is done
+                runs = []
+                pages = [runs]
+                
                 # Title
-                p.setFont("Helvetica-Bold", 16)
-                p.drawString(50, height - 50, "STANDARD FORM 330 - SECTION E")
+                runs.append(("Helvetica-Bold", 16, 50, height - 50, "STANDARD FORM 330 - SECTION E"))
                 
                 # Employee information
                 y_position = height - 100
-                p.setFont("Helvetica-Bold", 12)
-                p.drawString(50, y_position, "EMPLOYEE INFORMATION")
+                runs.append(("Helvetica-Bold", 12, 50, y_position, "EMPLOYEE INFORMATION"))
                 
                 y_position -= 30
-                p.setFont("Helvetica", 10)
                 
                 fields = [
                     ("Name:", employee_data.get('name', '')),
@@ -1114,13 +1713,12 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 
                 for label, value in fields:
                     if y_position < 100:  # Start new page if needed
-                        p.showPage()
+                        runs = []
+                        pages.append(runs)
                         y_position = height - 50
                     
-                    p.setFont("Helvetica-Bold", 10)
-                    p.drawString(50, y_position, label)
-                    p.setFont("Helvetica", 10)
-                    p.drawString(200, y_position, str(value)[:80])  # Truncate long text
+                    runs.append(("Helvetica-Bold", 10, 50, y_position, label))
+                    runs.append(("Helvetica", 10, 200, y_position, truncate_text(str(value), 80)))  # Truncate long text
                     y_position -= 20
                 
                 # Projects section
@@ -1128,152 +1726,114 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 if projects:
                     y_position -= 20
                     if y_position < 100:
-                        p.showPage()
+                        runs = []
+                        pages.append(runs)
                         y_position = height - 50
                     
-                    p.setFont("Helvetica-Bold", 12)
-                    p.drawString(50, y_position, "RELEVANT PROJECTS")
+                    runs.append(("Helvetica-Bold", 12, 50, y_position, "RELEVANT PROJECTS"))
                     y_position -= 30
                     
                     for i, project in enumerate(projects[:5], 1):
                         if y_position < 150:
-                            p.showPage()
+                            runs = []
+                            pages.append(runs)
                             y_position = height - 50
                         
-                        p.setFont("Helvetica-Bold", 10)
-                        p.drawString(50, y_position, f"Project {i}:")
+                        runs.append(("Helvetica-Bold", 10, 50, y_position, f"Project {i}:"))
                         y_position -= 15
                         
-                        p.setFont("Helvetica", 9)
-                        title = project.get('title_and_location', '')
-                        p.drawString(70, y_position, f"Title: {title[:60]}")
-                        y_position -= 15
+                        # Rows without content are left out instead of drawing an empty label
+                        title = project.get('title_and_location')
+                        if title:
+                            runs.append(("Helvetica", 9, 70, y_position, f"Title: {truncate_text(title, 60)}"))
+                            y_position -= 15
                         
-                        year_info = project.get('year_completed', {})
-                        if year_info:
-                            prof_year = year_info.get('professional_services', '')
-                            const_year = year_info.get('construction', '')
+                        year_info = project.get('year_completed') or {}
+                        prof_year = year_info.get('professional_services', '')
+                        const_year = year_info.get('construction', '')
+                        if prof_year or const_year:
                             year_text = f"Prof: {prof_year}, Const: {const_year}"
-                            p.drawString(70, y_position, f"Years: {year_text}")
+                            runs.append(("Helvetica", 9, 70, y_position, f"Years: {year_text}"))
                             y_position -= 15
                         
                         y_position -= 10
                 
+                self.draw_pages(p, pages)
                 p.save()
                 
-                # Get PDF content
-                pdf_content = buffer.getvalue()
-                buffer.close()
+                # Send the canvas buffer in place instead of copying it to a bytes object
+                pdf_content = buffer.getbuffer()
                 
                 # Send PDF response
                 self.send_response(200)
                 self.send_header('Content-Type', 'application/pdf')
-                self.send_header('Content-Disposition', f'attachment; filename="SectionE_{employee_name.replace(" ", "_")}.pdf"')
+                self.send_header('Content-Disposition', f'attachment; filename="SectionE_{filename_slug(employee_name)}.pdf"')
                 self.send_header('Content-Length', str(len(pdf_content)))
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
                 self.wfile.write(pdf_content)
+                pdf_content.release()
+                buffer.close()
                 
-                print(f"✅ Fallback PDF generated successfully for: {employee_name}")
+                logger.debug("✅ Fallback PDF generated successfully for: %s", employee_name)
                 
             except ImportError:
                 # If reportlab is not available, return a simple text response
-                response_text = f"PDF generation not available. Employee data for {employee_name} found but PDF libraries not installed."
+                response_text = f"PDF generation not available. Employee data for {employee_name} found but PDF libraries not installed.".encode('utf-8')
                 self.send_response(503)
-                self.send_header('Content-Type', 'text/plain')
+                self.send_header('Content-Type', 'text/plain; charset=utf-8')
                 self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Content-Length', str(len(response_text)))
                 self.end_headers()
-                self.wfile.write(response_text.encode('utf-8'))
+                self.wfile.write(response_text)
                 
         except Exception as e:
-            print(f"Error in fallback PDF generation: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            logger.error("Error in fallback PDF generation: %s", e)
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
     
     def serve_templates_api(self):
         """Serve available templates list API endpoint"""
         try:
-            import json
-            
-            # Load templates metadata
-            templates_file_path = get_file_path('templates/templates.json')
-            with open(templates_file_path, 'r', encoding='utf-8') as f:
-                templates_data = json.load(f)
-            
-            response = json.dumps(templates_data, indent=2)
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            # Templates metadata serialized (and compressed) once per change to the file
+            if self.accepts_gzip():
+                response = load_json_view(TEMPLATES_CONFIG_PATH, 'payload_gzip', build_gzip_payload)
+                self.send_cached_response(response, 'application/json', cors=True, content_encoding='gzip')
+            else:
+                response = load_json_view(TEMPLATES_CONFIG_PATH, 'payload', orjson.dumps)
+                self.send_cached_response(response, 'application/json', cors=True)
             
         except Exception as e:
             print(f"Error serving templates API: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
     
     def serve_template_preview_api(self, template_id):
         """Serve template preview (first page as image)"""
         try:
-            import json
-            from urllib.parse import unquote
-            
             # Decode URL-encoded template ID
-            template_id = unquote(template_id)
+            template_id = unquote_cached(template_id)
             
-            # Load templates metadata to find the file
-            templates_file_path = get_file_path('templates/templates.json')
-            with open(templates_file_path, 'r', encoding='utf-8') as f:
-                templates_data = json.load(f)
-            
-            template_info = None
-            for template in templates_data['templates']:
-                if template['id'] == template_id:
-                    template_info = template
-                    break
+            # Look up the template's metadata to find the file
+            template_info = load_json_view(TEMPLATES_CONFIG_PATH, 'id_index', build_template_id_index).get(template_id)
             
             if not template_info:
-                self.send_response(404)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                error_response = json.dumps({"error": "Template not found"})
-                self.wfile.write(error_response.encode('utf-8'))
+                error_response = orjson.dumps({"error": "Template not found"})
+                self.send_json_response(error_response, 404)
                 return
             
-            # Try to generate preview using pdf2image (skip in serverless environment)
+            # Try to generate preview (skip in serverless environment)
             try:
-                # Check if we're in a serverless environment
-                is_netlify = os.getenv('NETLIFY') == 'true' or os.getenv('AWS_LAMBDA_FUNCTION_NAME')
-                
-                if not is_netlify:
-                    # Only try pdf2image in local development
-                    from pdf2image import convert_from_path
-                    import io
-                    
+                if not IS_SERVERLESS:
                     # Get template path (local or download from Supabase)
-                    template_path = self.template_downloader.get_template_path(template_info['filename'])
+                    template_path = self.get_template_path(template_info['filename'])
                     if not template_path:
                         raise Exception(f"Template not found: {template_info['filename']}")
                     
-                    # Convert first page to image
-                    images = convert_from_path(template_path, first_page=1, last_page=1, dpi=150)
+                    # Render the first page, reusing the PNG while the file is unchanged
+                    img_bytes = render_pdf_preview_png(template_path, os.stat(template_path).st_mtime_ns)
                     
-                    if images:
-                        # Convert to PNG bytes
-                        img_buffer = io.BytesIO()
-                        images[0].save(img_buffer, format='PNG')
-                        img_bytes = img_buffer.getvalue()
-                        
+                    if img_bytes:
                         # Send image response
                         self.send_response(200)
                         self.send_header('Content-Type', 'image/png')
@@ -1283,68 +1843,49 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         self.wfile.write(img_bytes)
                         return
                 else:
-                    # In serverless environment, skip pdf2image
-                    raise ImportError("pdf2image not available in serverless environment")
+                    # In serverless environment, skip preview rendering
+                    raise ImportError("Preview rendering not available in serverless environment")
                 
             except ImportError:
-                # pdf2image not available or in serverless environment
+                # No renderer available or in serverless environment
                 pass
             except Exception as e:
                 print(f"Error generating preview: {e}")
             
             # Fallback: return template info as JSON
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
+            response = orjson.dumps({
                 "template": template_info,
                 "preview_available": False,
-                "message": "Preview generation not available - install pdf2image for previews"
-            }, indent=2)
-            self.wfile.write(response.encode('utf-8'))
+                "message": "Preview generation not available - install pypdfium2 for previews"
+            })
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error serving template preview: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
     
     def serve_custom_pdf_with_template_api(self):
         """Generate custom PDF with selected template"""
         try:
-            import json
-            
             # Read request body
             content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length).decode('utf-8')
-            request_data = json.loads(post_data)
+            post_data = self.read_request_body(content_length)
+            request_data = orjson.loads(post_data)
             
             # Extract template selection and employee data
             template_id = request_data.get('templateId', 'default')
             employee_data = self.transform_resume_data(request_data)
             
-            # Load template metadata
-            templates_file_path = get_file_path('templates/templates.json')
-            with open(templates_file_path, 'r', encoding='utf-8') as f:
-                templates_data = json.load(f)
-            
-            # Find selected template
-            template_info = None
-            for template in templates_data['templates']:
-                if template['id'] == template_id:
-                    template_info = template
-                    break
+            # Find selected template; metadata is parsed again only when the file changes
+            template_info = load_json_view(TEMPLATES_CONFIG_PATH, 'id_index', build_template_id_index).get(template_id)
             
             if not template_info:
                 # Default to first template if not found
-                template_info = templates_data['templates'][0]
+                template_info = load_json_cached(TEMPLATES_CONFIG_PATH)['templates'][0]
             
             # Get template path (local or download from Supabase)
-            template_path = self.template_downloader.get_template_path(template_info['filename'])
+            template_path = self.get_template_path(template_info['filename'])
             if not template_path:
                 raise Exception(f"Template not found: {template_info['filename']}")
             
@@ -1356,27 +1897,17 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             
             # Try to generate PDF with selected template
             try:
-                from src.generators.pdf_form_filler import SectionEPDFGenerator
-                
-                # Create a custom generator with the selected template
-                generator = SectionEPDFGenerator()
-                generator.template_path = template_path  # Override the template path
-                
-                pdf_path = generator.create_section_e_pdf(employee_data)
+                # Generator for the selected template, reused across requests
+                pdf_path = GENERATOR_POOL.submit(
+                    get_pdf_generator(template_path).create_section_e_pdf, employee_data, request_output_filename('.pdf')
+                ).result()
                 
                 if pdf_path and os.path.exists(pdf_path):
-                    # Read the PDF file
-                    with open(pdf_path, 'rb') as pdf_file:
-                        pdf_content = pdf_file.read()
-                    
-                    # Send PDF response
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/pdf')
-                    self.send_header('Content-Disposition', f'attachment; filename="SectionE_{employee_data.get("name", "Unknown").replace(" ", "_")}_{template_info["name"].replace(" ", "_")}.pdf"')
-                    self.send_header('Content-Length', str(len(pdf_content)))
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(pdf_content)
+                    # Stream the PDF file to the client without loading it into memory
+                    self.send_generated_file(
+                        pdf_path, 'application/pdf',
+                        f'SectionE_{filename_slug(employee_data.get("name", "Unknown"))}_{filename_slug(template_info["name"])}.pdf'
+                    )
                     
                     print(f"✅ Custom PDF with template '{template_info['name']}' served successfully")
                     return
@@ -1396,46 +1927,27 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 
         except Exception as e:
             print(f"Error generating PDF with template: {e}")
-            import json
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
     
     def serve_custom_docx_with_template_api(self):
         """Generate custom DOCX with selected template"""
         try:
-            import json
-            
             # Read request body
             content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length).decode('utf-8')
-            request_data = json.loads(post_data)
+            post_data = self.read_request_body(content_length)
+            request_data = orjson.loads(post_data)
             
             # Extract template selection and employee data
             template_id = request_data.get('templateId', 'docx_template')
             employee_data = self.transform_resume_data(request_data)
             
-            # Load template metadata
-            templates_file_path = get_file_path('templates/templates.json')
-            with open(templates_file_path, 'r', encoding='utf-8') as f:
-                templates_data = json.load(f)
-            
-            # Find selected template
-            template_info = None
-            for template in templates_data['templates']:
-                if template['id'] == template_id:
-                    template_info = template
-                    break
+            # Find selected template; metadata is parsed again only when the file changes
+            template_info = load_json_view(TEMPLATES_CONFIG_PATH, 'id_index', build_template_id_index).get(template_id)
             
             # Default to DOCX template if not found
             if not template_info or template_info.get('type') not in ['docx', 'jinja_docx']:
-                for template in templates_data['templates']:
-                    if template.get('type') in ['docx', 'jinja_docx']:
-                        template_info = template
-                        break
+                template_info = load_json_view(TEMPLATES_CONFIG_PATH, 'default_docx', find_default_docx_template) or template_info
             
             if not template_info:
                 raise Exception("No DOCX template found")
@@ -1444,47 +1956,29 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 
         except Exception as e:
             print(f"Error generating DOCX with template: {e}")
-            import json
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
     
     def generate_docx_with_template(self, employee_data, template_info):
         """Generate DOCX using the appropriate template generator based on template type"""
         try:
             # Get template path (local or download from Supabase)
-            template_path = self.template_downloader.get_template_path(template_info['filename'])
+            template_path = self.get_template_path(template_info['filename'])
             if not template_path:
                 raise Exception(f"Template not found: {template_info['filename']}")
             
-            # Check template type and use appropriate generator
-            if template_info.get('type') == 'jinja_docx':
-                # Use Jinja DOCX generator for templates with {{ variable }} syntax
-                from src.generators.jinja_docx_generator import JinjaDOCXSectionEGenerator
-                generator = JinjaDOCXSectionEGenerator(template_path)
-                docx_path = generator.generate_section_e_docx(employee_data)
-            else:
-                # Use traditional cell-mapping DOCX generator
-                from src.generators.docx_section_e_generator import DOCXSectionEGenerator
-                generator = DOCXSectionEGenerator(template_path)
-                docx_path = generator.generate_section_e_docx(employee_data)
+            # Jinja generator for {{ variable }} templates, cell-mapping generator otherwise
+            generator = get_docx_generator(template_info.get('type'), template_path)
+            docx_path = GENERATOR_POOL.submit(
+                generator.generate_section_e_docx, employee_data, request_output_filename('.docx')
+            ).result()
             
             if docx_path and os.path.exists(docx_path):
-                # Read the DOCX file
-                with open(docx_path, 'rb') as docx_file:
-                    docx_content = docx_file.read()
-                
-                # Send DOCX response
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document')
-                self.send_header('Content-Disposition', f'attachment; filename="SectionE_{employee_data.get("name", "Unknown").replace(" ", "_")}_{template_info["name"].replace(" ", "_")}.docx"')
-                self.send_header('Content-Length', str(len(docx_content)))
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(docx_content)
+                # Stream the DOCX file to the client without loading it into memory
+                self.send_generated_file(
+                    docx_path, 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+                    f'SectionE_{filename_slug(employee_data.get("name", "Unknown"))}_{filename_slug(template_info["name"])}.docx'
+                )
                 
                 template_type = "Jinja" if template_info.get('type') == 'jinja_docx' else "Cell-mapping"
                 print(f"✅ Custom DOCX ({template_type}) with template '{template_info['name']}' served successfully")
@@ -1508,25 +2002,16 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
     def serve_employee_qualifications_api(self, employee_id):
         """Serve all professional qualifications for an employee"""
         try:
-            import json
-            from urllib.parse import unquote
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Decode URL-encoded ID
-            employee_id = unquote(employee_id)
+            employee_id = unquote_cached(employee_id)
             
             # Try to use Supabase
             try:
-                from supabase import create_client
-                
-                supabase_url = os.getenv('SUPABASE_URL')
-                supabase_key = os.getenv('SUPABASE_KEY')
+                supabase_url = _SUPABASE_URL
+                supabase_key = _SUPABASE_KEY
                 
                 if supabase_url and supabase_key:
-                    supabase = create_client(supabase_url, supabase_key)
+                    supabase = get_supabase_client()
                     
                     # Use the SQL function to get qualifications
                     result = supabase.rpc('get_employee_qualifications', {'p_employee_id': employee_id}).execute()
@@ -1536,16 +2021,12 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                     else:
                         qualifications = []
                     
-                    response = json.dumps({
+                    response = orjson.dumps({
                         'employee_id': employee_id,
                         'qualifications': qualifications
-                    }, default=str, indent=2)
+                    }, default=str)
                     
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(response.encode('utf-8'))
+                    self.send_json_response(response)
                     return
                 else:
                     raise Exception("Supabase credentials not found")
@@ -1553,40 +2034,26 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             except Exception as e:
                 print(f"Supabase error, falling back to JSON: {e}")
                 # Fallback to empty result for now (JSON doesn't have qualifications structure)
-                response = json.dumps({
+                response = orjson.dumps({
                     'employee_id': employee_id,
                     'qualifications': [],
                     'message': 'Qualifications only available with Supabase backend'
-                }, indent=2)
+                })
                 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(response.encode('utf-8'))
+                self.send_json_response(response)
                 
         except Exception as e:
             print(f"Error serving employee qualifications API: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
 
     def serve_set_primary_qualification_api(self):
         """Set primary qualification for an employee"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Read POST data
             content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length).decode('utf-8')
-            request_data = json.loads(post_data)
+            post_data = self.read_request_body(content_length)
+            request_data = orjson.loads(post_data)
             
             employee_id = request_data.get('employee_id')
             qualification_id = request_data.get('qualification_id')
@@ -1596,13 +2063,11 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             
             # Try to use Supabase
             try:
-                from supabase import create_client
-                
-                supabase_url = os.getenv('SUPABASE_URL')
-                supabase_key = os.getenv('SUPABASE_KEY')
+                supabase_url = _SUPABASE_URL
+                supabase_key = _SUPABASE_KEY
                 
                 if supabase_url and supabase_key:
-                    supabase = create_client(supabase_url, supabase_key)
+                    supabase = get_supabase_client()
                     
                     # Use the SQL function to set primary qualification
                     result = supabase.rpc('set_primary_qualification', {
@@ -1611,210 +2076,174 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                     }).execute()
                     
                     if result.data:
-                        response = json.dumps({
+                        response = orjson.dumps({
                             'success': True,
                             'message': 'Primary qualification updated successfully'
-                        }, indent=2)
-                        self.send_response(200)
+                        })
+                        status = 200
                     else:
-                        response = json.dumps({
+                        response = orjson.dumps({
                             'success': False,
                             'message': 'Failed to update primary qualification'
-                        }, indent=2)
-                        self.send_response(400)
+                        })
+                        status = 400
                 else:
                     raise Exception("Supabase credentials not found")
                     
             except Exception as e:
                 print(f"Supabase error: {e}")
-                response = json.dumps({
+                response = orjson.dumps({
                     'success': False,
                     'error': str(e),
                     'message': 'Primary qualification setting only available with Supabase backend'
-                }, indent=2)
-                self.send_response(500)
+                })
+                status = 500
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
                 
         except Exception as e:
             print(f"Error setting primary qualification: {e}")
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 'success': False,
                 'error': str(e)
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_employees_for_merge_api(self):
         """Serve employees list from Supabase database for merge functionality"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
                 # Return empty list if Supabase not configured
-                response = json.dumps({
+                response = orjson.dumps({
                     "employees": [],
                     "message": "Supabase not configured - merge feature requires database connection"
                 })
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(response.encode('utf-8'))
+                self.send_json_response(response)
                 return
             
-            # Connect to Supabase and get employees
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
-            
-            # Get all employees from the database with role aggregation
-            result = supabase.table('employee_profiles').select('employee_id, employee_name, role_in_contract, total_years_experience, education, source_filename').order('employee_name').execute()
-            
-            employees = result.data if result.data else []
-            
-            # Clean up roles in each employee record
-            for employee in employees:
-                if employee.get('role_in_contract'):
-                    employee['role_in_contract'] = self.deduplicate_role_string(employee['role_in_contract'])
-            
-            response = json.dumps({
-                "employees": employees,
-                "count": len(employees)
-            }, indent=2)
+            now = time.monotonic()
+            if now < _EMPLOYEES_FOR_MERGE_CACHE['expires']:
+                response = _EMPLOYEES_FOR_MERGE_CACHE['body']
+            else:
+                # Connect to Supabase and get employees
+                supabase = get_supabase_client()
+                columns = 'employee_id, employee_name, role_in_contract, total_years_experience, education, source_filename'
+                
+                # The view returns roles already deduplicated by dedup_roles() in Postgres
+                result = None
+                if UIHandler._employees_for_merge_view:
+                    try:
+                        result = supabase.table('employees_for_merge').select(columns).order('employee_name').execute()
+                    except Exception as view_error:
+                        logger.warning("⚠️ employees_for_merge view unavailable, deduplicating roles locally: %s", view_error)
+                        UIHandler._employees_for_merge_view = False
+                
+                if result is not None:
+                    employees = result.data if result.data else []
+                else:
+                    # Get all employees from the database with role aggregation
+                    result = supabase.table('employee_profiles').select(columns).order('employee_name').execute()
+                    
+                    employees = result.data if result.data else []
+                    
+                    # Clean up roles in each employee record
+                    for employee in employees:
+                        if employee.get('role_in_contract'):
+                            employee['role_in_contract'] = self.deduplicate_role_string(employee['role_in_contract'])
+                
+                response = orjson.dumps({
+                    "employees": employees,
+                    "count": len(employees)
+                })
+                _EMPLOYEES_FOR_MERGE_CACHE['body'] = response
+                _EMPLOYEES_FOR_MERGE_CACHE['expires'] = now + EMPLOYEES_FOR_MERGE_TTL_SECONDS
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error loading employees for merge: {e}")
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "error": str(e),
                 "employees": []
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_potential_duplicates_api(self):
         """Serve API endpoint to find potential duplicate employees"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
                 # Return empty list if Supabase not configured
-                response = json.dumps({
+                response = orjson.dumps({
                     "duplicates": [],
                     "message": "Supabase not configured - merge feature requires database connection"
                 })
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(response.encode('utf-8'))
+                self.send_json_response(response)
                 return
             
-            # Connect to Supabase and find potential duplicates
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
-            
-            # Call the SQL function to find potential duplicates
-            print(f"🔍 Calling find_potential_duplicate_employees function...")
-            result = supabase.rpc('find_potential_duplicate_employees', {
-                'p_similarity_threshold': 0.7
-            }).execute()
-            
-            print(f"📊 Raw duplicate search result: {result}")
-            duplicates = result.data if result.data else []
-            print(f"🎯 Found {len(duplicates)} potential duplicates")
-            
-            response = json.dumps({
-                "duplicates": duplicates,
-                "count": len(duplicates)
-            }, indent=2)
+            now = time.monotonic()
+            if now < _POTENTIAL_DUPLICATES_CACHE['expires']:
+                response = _POTENTIAL_DUPLICATES_CACHE['body']
+            else:
+                # Connect to Supabase and find potential duplicates
+                supabase = get_supabase_client()
+                
+                # Call the SQL function to find potential duplicates
+                print(f"🔍 Calling find_potential_duplicate_employees function...")
+                result = supabase.rpc('find_potential_duplicate_employees', {
+                    'p_similarity_threshold': 0.7
+                }).execute()
+                
+                print(f"📊 Raw duplicate search result: {result}")
+                duplicates = result.data if result.data else []
+                print(f"🎯 Found {len(duplicates)} potential duplicates")
+                
+                response = orjson.dumps({
+                    "duplicates": duplicates,
+                    "count": len(duplicates)
+                })
+                _POTENTIAL_DUPLICATES_CACHE['body'] = response
+                _POTENTIAL_DUPLICATES_CACHE['expires'] = now + POTENTIAL_DUPLICATES_TTL_SECONDS
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error finding potential duplicates: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "error": f"Server error while finding duplicates: {str(e)}",
                 "duplicates": []
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
     
     def serve_merge_preview_api(self, primary_id, secondary_id):
         """Serve API endpoint to preview employee merge"""
         try:
-            import json
-            from urllib.parse import unquote
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Decode URL-encoded IDs
-            primary_id = unquote(primary_id)
-            secondary_id = unquote(secondary_id)
+            primary_id = unquote_cached(primary_id)
+            secondary_id = unquote_cached(secondary_id)
             
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - merge preview requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase and get merge preview
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to get merge preview
             result = supabase.rpc('get_merge_preview', {
@@ -1823,61 +2252,39 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             }).execute()
             
             if result.data and 'error' in result.data:
-                error_response = json.dumps({"error": result.data['error']})
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                error_response = orjson.dumps({"error": result.data['error']})
+                self.send_json_response(error_response, 400)
                 return
             
             preview_data = result.data if result.data else {}
             
-            response = json.dumps(preview_data, indent=2)
+            response = orjson.dumps(preview_data)
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error getting merge preview: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
     
     def serve_merge_employees_api(self):
         """Serve API endpoint to merge two employees"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - merge operation requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Parse POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            data = orjson.loads(post_data)
             
             # Validate required fields
             primary_id = data.get('primary_employee_id')
@@ -1890,21 +2297,15 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"   Options: {merge_options}")
             
             if not primary_id or not secondary_id:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "success": False,
                     "error": "Both primary_employee_id and secondary_employee_id are required"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase and perform merge
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to merge employees
             print(f"🔗 Calling merge_employees function...")
@@ -1920,10 +2321,12 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"🎯 Processed merge result: {merge_result}")
             
             if merge_result.get('success'):
-                self.send_response(200)
+                expire_all_projects_cache()
+                expire_merge_caches()
+                status = 200
                 print(f"✅ Successfully merged employees: {merge_result.get('secondary_employee_name')} → {merge_result.get('primary_employee_name')}")
             else:
-                self.send_response(400)
+                status = 400
                 error_msg = merge_result.get('error', 'Unknown database error')
                 print(f"❌ Failed to merge employees: {error_msg}")
                 # Ensure we always return a proper error structure
@@ -1933,114 +2336,154 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         'error': f"Database operation failed: {error_msg}"
                     }
             
-            response = json.dumps(merge_result, indent=2)
+            response = orjson.dumps(merge_result)
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error merging employees: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
+    def serve_merge_employees_with_preview_api(self):
+        """
+        Serve API endpoint to preview, and optionally merge, two employees in one round trip
+        
+        Calls merge_employees_with_preview (sql/add_merge_with_preview_function.sql);
+        the merge only runs when the request sets auto_confirm.
+        
+        Returns:
+            JSON with "preview" (as from get_merge_preview) and "result"
+            (as from merge_employees, or null when not confirmed)
+        """
+        try:
+            if not _SUPABASE_URL or not _SUPABASE_KEY:
+                error_response = orjson.dumps({
+                    "error": "Supabase not configured - merge operation requires database connection"
+                })
+                self.send_json_response(error_response, 400)
+                return
+            
+            # Parse POST data
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.read_request_body(content_length)
+            data = orjson.loads(post_data)
+            
+            # Validate required fields
+            primary_id = data.get('primary_employee_id')
+            secondary_id = data.get('secondary_employee_id')
+            merge_options = data.get('merge_options', {})
+            auto_confirm = bool(data.get('auto_confirm'))
+            
+            if not primary_id or not secondary_id:
+                error_response = orjson.dumps({
+                    "success": False,
+                    "error": "Both primary_employee_id and secondary_employee_id are required"
+                })
+                self.send_json_response(error_response, 400)
+                return
+            
+            # Preview and merge in a single transaction
+            print(f"🔗 Calling merge_employees_with_preview function (confirm={auto_confirm})...")
+            result = get_supabase_client().rpc('merge_employees_with_preview', {
+                'p_primary_employee_id': primary_id,
+                'p_secondary_employee_id': secondary_id,
+                'p_merge_options': json.dumps(merge_options),
+                'p_confirm': auto_confirm
+            }).execute()
+            
+            combined = result.data if result.data else {}
+            preview = combined.get('preview') or {}
+            merge_result = combined.get('result')
+            
+            if 'error' in preview:
+                status = 400
+            elif merge_result is None:
+                status = 200
+            elif merge_result.get('success'):
+                expire_all_projects_cache()
+                expire_merge_caches()
+                status = 200
+                print(f"✅ Successfully merged employees: {merge_result.get('secondary_employee_name')} → {merge_result.get('primary_employee_name')}")
+            else:
+                status = 400
+                print(f"❌ Failed to merge employees: {merge_result.get('error', 'Unknown database error')}")
+            
+            response = orjson.dumps({
+                "preview": preview,
+                "result": merge_result
+            })
+            self.send_json_response(response, status)
+            
+        except Exception as e:
+            print(f"💥 Error merging employees with preview: {e}")
+            print(f"🔍 Full traceback: {traceback.format_exc()}")
+            
+            error_response = orjson.dumps({
+                "success": False,
+                "error": f"Server error: {str(e)}"
+            })
+            self.send_json_response(error_response, 500)
+    
     def serve_teams_for_merge_api(self):
         """Serve API endpoint to get teams list for merge functionality"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - teams merge requires database connection",
                     "teams": []
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Get all teams from the database
             result = supabase.table('teams').select('team_id, firm_name, location, created_at').execute()
             
             teams = result.data if result.data else []
             
-            response = json.dumps({
+            response = orjson.dumps({
                 "teams": teams,
                 "message": f"Found {len(teams)} teams" if teams else "No teams found in database"
-            }, indent=2)
+            })
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error loading teams for merge: {e}")
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "error": str(e),
                 "teams": []
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_potential_duplicate_teams_api(self):
         """Serve API endpoint to find potential duplicate teams"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - duplicate detection requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to find potential duplicates
             result = supabase.rpc('find_potential_duplicate_teams', {
@@ -2049,59 +2492,38 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             
             duplicates = result.data if result.data else []
             
-            response = json.dumps({
+            response = orjson.dumps({
                 "duplicates": duplicates,
                 "count": len(duplicates)
-            }, indent=2)
+            })
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error finding duplicate teams: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
 
     def serve_team_merge_preview_api(self, primary_id, secondary_id):
         """Serve API endpoint to preview team merge operation"""
         try:
-            import json
-            from dotenv import load_dotenv
-            from urllib.parse import unquote
-            
             # Decode URL-encoded IDs
-            primary_id = unquote(primary_id)
-            secondary_id = unquote(secondary_id)
-            
-            # Load environment variables
-            load_dotenv()
+            primary_id = unquote_cached(primary_id)
+            secondary_id = unquote_cached(secondary_id)
             
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - merge preview requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to get merge preview
             result = supabase.rpc('get_team_merge_preview', {
@@ -2110,61 +2532,39 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             }).execute()
             
             if result.data and 'error' in result.data:
-                error_response = json.dumps({"error": result.data['error']})
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                error_response = orjson.dumps({"error": result.data['error']})
+                self.send_json_response(error_response, 400)
                 return
             
             preview_data = result.data if result.data else {}
             
-            response = json.dumps(preview_data, indent=2)
+            response = orjson.dumps(preview_data)
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error getting team merge preview: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
 
     def serve_merge_teams_api(self):
         """Serve API endpoint to merge two teams"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - merge operation requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Parse POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            data = orjson.loads(post_data)
             
             # Validate required fields
             primary_id = data.get('primary_team_id')
@@ -2177,21 +2577,15 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"   Options: {merge_options}")
             
             if not primary_id or not secondary_id:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "success": False,
                     "error": "Both primary_team_id and secondary_team_id are required"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase and perform merge
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to merge teams
             print(f"🔗 Calling merge_teams function...")
@@ -2207,10 +2601,11 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"🎯 Processed merge result: {merge_result}")
             
             if merge_result.get('success'):
-                self.send_response(200)
+                expire_all_projects_cache()
+                status = 200
                 print(f"✅ Successfully merged teams: {merge_result.get('secondary_team_name')} → {merge_result.get('primary_team_name')}")
             else:
-                self.send_response(400)
+                status = 400
                 error_msg = merge_result.get('error', 'Unknown database error')
                 print(f"❌ Failed to merge teams: {error_msg}")
                 # Ensure we always return a proper error structure
@@ -2220,107 +2615,67 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         'error': f"Database operation failed: {error_msg}"
                     }
             
-            response = json.dumps(merge_result, indent=2)
+            response = orjson.dumps(merge_result)
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error merging teams: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_roles_for_merge_api(self):
         """Serve API endpoint to get all roles for manual merge selection"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - role operations require database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to get roles for merge
             result = supabase.rpc('get_roles_for_merge').execute()
             
             roles_data = result.data if result.data else []
             
-            response = json.dumps(roles_data, indent=2)
+            response = orjson.dumps(roles_data)
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error getting roles for merge: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
 
     def serve_potential_duplicate_roles_api(self):
         """Serve API endpoint to get potential duplicate roles"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - role operations require database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to find potential duplicates
             result = supabase.rpc('find_potential_duplicate_roles', {
@@ -2329,51 +2684,31 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             
             duplicates_data = result.data if result.data else []
             
-            response = json.dumps(duplicates_data, indent=2)
+            response = orjson.dumps(duplicates_data)
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error getting potential duplicate roles: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
 
     def serve_role_merge_preview_api(self, primary_role, secondary_role):
         """Serve API endpoint to preview role merge operation"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - role operations require database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to get role merge preview
             result = supabase.rpc('get_role_merge_preview', {
@@ -2382,61 +2717,39 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             }).execute()
             
             if result.data and 'error' in result.data:
-                error_response = json.dumps({"error": result.data['error']})
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                error_response = orjson.dumps({"error": result.data['error']})
+                self.send_json_response(error_response, 400)
                 return
             
             preview_data = result.data if result.data else {}
             
-            response = json.dumps(preview_data, indent=2)
+            response = orjson.dumps(preview_data)
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error getting role merge preview: {e}")
-            error_response = json.dumps({"error": str(e)})
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
 
     def serve_merge_roles_api(self):
         """Serve API endpoint to merge two roles"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - role merge operation requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Parse POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            data = orjson.loads(post_data)
             
             # Validate required fields
             primary_role = data.get('primary_role')
@@ -2449,21 +2762,15 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"   Options: {merge_options}")
             
             if not primary_role or not secondary_role:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "success": False,
                     "error": "Both primary_role and secondary_role are required"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase and perform merge
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to merge roles
             print(f"🔗 Calling merge_roles function...")
@@ -2479,10 +2786,11 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"🎯 Processed merge result: {merge_result}")
             
             if merge_result.get('success'):
-                self.send_response(200)
+                expire_merge_caches()
+                status = 200
                 print(f"✅ Successfully merged roles: {merge_result.get('secondary_role')} → {merge_result.get('final_role')}")
             else:
-                self.send_response(400)
+                status = 400
                 error_msg = merge_result.get('error', 'Unknown database error')
                 print(f"❌ Failed to merge roles: {error_msg}")
                 # Ensure we always return a proper error structure
@@ -2492,56 +2800,38 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         'error': f"Database operation failed: {error_msg}"
                     }
             
-            response = json.dumps(merge_result, indent=2)
+            response = orjson.dumps(merge_result)
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error merging roles: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_split_compound_roles_api(self):
         """Serve API endpoint to split compound roles"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - role operations require database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Parse POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            data = orjson.loads(post_data)
             
             # Validate required fields
             compound_role = data.get('compound_role')
@@ -2552,21 +2842,15 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"   Employee ID: {employee_id or 'All employees'}")
             
             if not compound_role:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "success": False,
                     "error": "compound_role is required"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase and perform split
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to split compound roles
             print(f"🔗 Calling split_compound_roles function...")
@@ -2581,10 +2865,11 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"🎯 Processed split result: {split_result}")
             
             if split_result.get('success'):
-                self.send_response(200)
+                expire_merge_caches()
+                status = 200
                 print(f"✅ Successfully split role: {split_result.get('original_role')} → {split_result.get('new_role_string')}")
             else:
-                self.send_response(400)
+                status = 400
                 error_msg = split_result.get('error', 'Unknown database error')
                 print(f"❌ Failed to split role: {error_msg}")
                 # Ensure we always return a proper error structure
@@ -2594,56 +2879,36 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         'error': f"Database operation failed: {error_msg}"
                     }
             
-            response = json.dumps(split_result, indent=2)
+            response = orjson.dumps(split_result)
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error splitting compound role: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_normalize_roles_api(self):
         """Serve API endpoint to normalize all roles"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - role operations require database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase and perform normalization
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to normalize all roles
             print(f"🔗 Calling normalize_all_roles function...")
@@ -2655,10 +2920,11 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"🎯 Processed normalization result: {normalize_result}")
             
             if normalize_result.get('success'):
-                self.send_response(200)
+                expire_merge_caches()
+                status = 200
                 print(f"✅ Successfully normalized roles: {normalize_result.get('employees_updated')} employees updated, {normalize_result.get('duplicates_removed')} duplicates removed")
             else:
-                self.send_response(400)
+                status = 400
                 error_msg = normalize_result.get('error', 'Unknown database error')
                 print(f"❌ Failed to normalize roles: {error_msg}")
                 # Ensure we always return a proper error structure
@@ -2668,38 +2934,27 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         'error': f"Database operation failed: {error_msg}"
                     }
             
-            response = json.dumps(normalize_result, indent=2)
+            response = orjson.dumps(normalize_result)
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error normalizing roles: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_execute_split_roles_api(self):
         """Execute the split_roles.py script and return its output"""
         try:
-            import subprocess
-            import json
-            
             print("🚀 Executing split_roles.py script...")
             
             # Execute the split_roles.py script with --apply flag
-            split_roles_path = get_file_path('utils/split_roles.py')
+            split_roles_path = SPLIT_ROLES_SCRIPT_PATH
             result = subprocess.run(
                 ['python3', split_roles_path, '--apply'],
                 capture_output=True,
@@ -2723,72 +2978,47 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             if result.stderr:
                 print(f"⚠️ STDERR:\n{result.stderr}")
             
-            response = json.dumps(response_data, indent=2)
+            response = orjson.dumps(response_data)
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response)
             
         except subprocess.TimeoutExpired:
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": "Script execution timed out after 5 minutes",
                 "executed_at": __import__('datetime').datetime.now().isoformat()
             })
-            self.send_response(408)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 408)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error executing split_roles.py: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}",
                 "executed_at": __import__('datetime').datetime.now().isoformat()
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_delete_employee_preview_api(self, employee_id):
         """Serve API endpoint to preview employee deletion"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - delete operation requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             print(f"🔍 Getting delete preview for employee: {employee_id}")
             
             # Connect to Supabase and get delete preview
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to get delete preview
             result = supabase.rpc('get_employee_delete_preview', {
@@ -2801,10 +3031,10 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"🎯 Processed preview result: {preview_result}")
             
             if preview_result.get('success'):
-                self.send_response(200)
+                status = 200
                 print(f"✅ Successfully retrieved delete preview for employee {employee_id}")
             else:
-                self.send_response(400)
+                status = 400
                 error_msg = preview_result.get('error', 'Unknown database error')
                 print(f"❌ Failed to get delete preview: {error_msg}")
                 if not isinstance(preview_result, dict) or not preview_result.get('error'):
@@ -2813,56 +3043,38 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         'error': f"Database operation failed: {error_msg}"
                     }
             
-            response = json.dumps(preview_result, indent=2)
+            response = orjson.dumps(preview_result)
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error getting delete preview: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_delete_employee_api(self):
         """Serve API endpoint to delete an employee"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - delete operation requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Parse POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            data = orjson.loads(post_data)
             
             # Validate required fields
             employee_id = data.get('employee_id')
@@ -2870,21 +3082,15 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"🗑️ Delete request received for employee: {employee_id}")
             
             if not employee_id:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "success": False,
                     "error": "employee_id is required"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase and perform deletion
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to delete employee
             print(f"🔗 Calling delete_employee_complete function...")
@@ -2905,12 +3111,11 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 # Check if this is the JSON parsing error but operation was successful
                 if "JSON could not be generated" in error_str and "success\": true" in error_str:
                     # Extract the actual result from the error details
-                    import re
                     match = re.search(r'b\'(\{.*?\})\'', error_str)
                     if match:
                         try:
                             result_json = match.group(1).encode().decode('unicode_escape')
-                            delete_result = json.loads(result_json)
+                            delete_result = orjson.loads(result_json)
                             print(f"✅ Extracted successful result from error: {delete_result}")
                         except:
                             # Fallback: create basic success response
@@ -2929,10 +3134,12 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                     raise rpc_error
             
             if delete_result.get('success'):
-                self.send_response(200)
+                expire_all_projects_cache()
+                expire_merge_caches()
+                status = 200
                 print(f"✅ Successfully deleted employee: {delete_result.get('employee_name')}")
             else:
-                self.send_response(400)
+                status = 400
                 error_msg = delete_result.get('error', 'Unknown database error')
                 print(f"❌ Failed to delete employee: {error_msg}")
                 if not isinstance(delete_result, dict) or not delete_result.get('error'):
@@ -2941,56 +3148,38 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         'error': f"Database operation failed: {error_msg}"
                     }
             
-            response = json.dumps(delete_result, indent=2)
+            response = orjson.dumps(delete_result)
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error deleting employee: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_delete_project_api(self):
         """Serve API endpoint to delete a project from an employee"""
         try:
-            import json
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
             # Check if Supabase is configured
-            supabase_url = os.getenv('SUPABASE_URL')
-            supabase_key = os.getenv('SUPABASE_KEY')
+            supabase_url = _SUPABASE_URL
+            supabase_key = _SUPABASE_KEY
             
             if not supabase_url or not supabase_key:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": "Supabase not configured - delete operation requires database connection"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Parse POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            data = orjson.loads(post_data)
             
             # Validate required fields
             employee_id = data.get('employee_id')
@@ -3001,21 +3190,15 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"   Project ID: {project_id}")
             
             if not employee_id or not project_id:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "success": False,
                     "error": "Both employee_id and project_id are required"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             # Connect to Supabase and perform deletion
-            from supabase import create_client
-            
-            supabase = create_client(supabase_url, supabase_key)
+            supabase = get_supabase_client()
             
             # Call the SQL function to delete project from employee
             print(f"🔗 Calling delete_employee_project function...")
@@ -3037,12 +3220,11 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 # Check if this is the JSON parsing error but operation was successful
                 if "JSON could not be generated" in error_str and "success\": true" in error_str:
                     # Extract the actual result from the error details
-                    import re
                     match = re.search(r'b\'(\{.*?\})\'', error_str)
                     if match:
                         try:
                             result_json = match.group(1).encode().decode('unicode_escape')
-                            delete_result = json.loads(result_json)
+                            delete_result = orjson.loads(result_json)
                             print(f"✅ Extracted successful result from error: {delete_result}")
                         except:
                             # Fallback: create basic success response
@@ -3061,10 +3243,11 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                     raise rpc_error
             
             if delete_result.get('success'):
-                self.send_response(200)
+                expire_all_projects_cache()
+                status = 200
                 print(f"✅ Successfully removed project {delete_result.get('project_title')} from employee {delete_result.get('employee_name')}")
             else:
-                self.send_response(400)
+                status = 400
                 error_msg = delete_result.get('error', 'Unknown database error')
                 print(f"❌ Failed to delete project: {error_msg}")
                 if not isinstance(delete_result, dict) or not delete_result.get('error'):
@@ -3073,50 +3256,36 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                         'error': f"Database operation failed: {error_msg}"
                     }
             
-            response = json.dumps(delete_result, indent=2)
+            response = orjson.dumps(delete_result)
             
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status)
             
         except Exception as e:
-            import traceback
             print(f"💥 Error deleting project: {e}")
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_trigger_processing_api(self):
         """Serve API endpoint to trigger immediate processing of uploaded files"""
         try:
-            import json
-            
             # Parse POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            data = orjson.loads(post_data)
             
             filename = data.get('filename')
             
             if not filename:
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "success": False,
                     "error": "filename is required"
                 })
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
             print(f"🔥 Immediate processing trigger received for: {filename}")
@@ -3128,14 +3297,14 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 success = trigger_immediate_processing(filename)
                 
                 if success:
-                    response = json.dumps({
+                    response = orjson.dumps({
                         "success": True,
                         "message": f"Successfully triggered immediate processing for {filename}",
                         "filename": filename
                     })
                     status_code = 200
                 else:
-                    response = json.dumps({
+                    response = orjson.dumps({
                         "success": False,
                         "error": f"Failed to create trigger for {filename}",
                         "filename": filename
@@ -3144,7 +3313,7 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                     
             except ImportError:
                 print("⚠️ Bucket watcher not available - trigger system not loaded")
-                response = json.dumps({
+                response = orjson.dumps({
                     "success": False,
                     "error": "Bucket watcher trigger system not available",
                     "note": "Make sure the automation module is properly installed"
@@ -3153,35 +3322,26 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
                 
             except Exception as e:
                 print(f"❌ Error triggering processing: {e}")
-                response = json.dumps({
+                response = orjson.dumps({
                     "success": False,
                     "error": f"Error creating trigger: {str(e)}",
                     "filename": filename
                 })
                 status_code = 500
             
-            self.send_response(status_code)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
+            self.send_json_response(response, status_code)
             
         except Exception as e:
             print(f"❌ Error in trigger processing API: {e}")
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "success": False,
                 "error": f"Server error: {str(e)}"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
 
     def serve_health_check(self):
         """Serve health check endpoint"""
-        from datetime import datetime
         
         health = {
             "status": "healthy",
@@ -3189,20 +3349,12 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             "env": "development"
         }
         
-        response = str(health).replace("'", '"')
-        
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(response.encode('utf-8'))
+        response = orjson.dumps(health)
+        self.send_cached_response(response, 'application/json')
     
     def serve_upload_template_api(self):
         """Handle template upload and update templates.json"""
         try:
-            import json
-            import uuid
-            from datetime import datetime
-            
             print("🔍 Upload template API called")
             
             # Read request body
@@ -3210,41 +3362,33 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             print(f"📝 Content length: {content_length}")
             
             if content_length == 0:
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                error_response = json.dumps({"error": "No content in request"})
-                self.wfile.write(error_response.encode('utf-8'))
+                error_response = orjson.dumps({"error": "No content in request"})
+                self.send_json_response(error_response, 400)
                 return
             
             print("📥 Reading request data...")
-            post_data = self.rfile.read(content_length).decode('utf-8')
-            print(f"📤 Received data: {post_data[:100]}...")  # First 100 chars
+            post_data = self.read_request_body(content_length)
+            print(f"📤 Received data: {post_data[:100].decode('utf-8', errors='replace')}...")  # First 100 bytes
             
             print("🔧 Parsing JSON...")
-            template_data = json.loads(post_data)
+            template_data = orjson.loads(post_data)
             print(f"✅ Parsed JSON: {template_data}")
             
             # Validate required fields
             required_fields = ['name', 'filename', 'type']
             for field in required_fields:
                 if not template_data.get(field):
-                    self.send_response(400)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    error_response = json.dumps({"error": f"Missing required field: {field}"})
-                    self.wfile.write(error_response.encode('utf-8'))
+                    error_response = orjson.dumps({"error": f"Missing required field: {field}"})
+                    self.send_json_response(error_response, 400)
                     return
             
             # Load existing templates
-            templates_file_path = get_file_path('templates/templates.json')
+            templates_file_path = TEMPLATES_CONFIG_PATH
             print(f"📁 Loading templates from: {templates_file_path}")
             
             try:
-                with open(templates_file_path, 'r', encoding='utf-8') as f:
-                    templates_config = json.load(f)
+                with open(templates_file_path, 'rb') as f:
+                    templates_config = orjson.loads(f.read())
             except FileNotFoundError:
                 # Create templates.json if it doesn't exist
                 templates_config = {"templates": []}
@@ -3271,25 +3415,23 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             templates_config['templates'].append(new_template)
             print(f"📋 Added template to config. Total templates: {len(templates_config['templates'])}")
             
+            # The file may have been reported missing before it was uploaded
+            self._missing_templates.pop(new_template['filename'], None)
+            
             # Save updated templates.json
             print("💾 Saving templates.json...")
-            with open(templates_file_path, 'w', encoding='utf-8') as f:
-                json.dump(templates_config, f, indent=2, ensure_ascii=False)
+            with open(templates_file_path, 'wb') as f:
+                f.write(orjson.dumps(templates_config, option=orjson.OPT_INDENT_2))
             
             # Respond with success
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            success_response = json.dumps({
+            success_response = orjson.dumps({
                 "success": True,
                 "template_id": template_id,
                 "message": f"Template '{template_data['name']}' uploaded successfully",
                 "template": new_template
-            }, indent=2)
+            })
             
-            self.wfile.write(success_response.encode('utf-8'))
+            self.send_json_response(success_response)
             print("✅ Response sent successfully")
             
             print(f"🎉 Template '{template_data['name']}' uploaded and registered successfully")
@@ -3299,66 +3441,39 @@ class UIHandler(http.server.SimpleHTTPRequestHandler):
             
         except json.JSONDecodeError as e:
             print(f"❌ JSON decode error: {e}")
-            self.send_response(400)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            error_response = json.dumps({"error": "Invalid JSON data"})
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": "Invalid JSON data"})
+            self.send_json_response(error_response, 400)
             
         except Exception as e:
             print(f"❌ Error in upload template API: {e}")
-            import traceback
             traceback.print_exc()
             
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            error_response = json.dumps({"error": str(e)})
-            self.wfile.write(error_response.encode('utf-8'))
+            error_response = orjson.dumps({"error": str(e)})
+            self.send_json_response(error_response, 500)
     
     def serve_ai_rewrite_api(self):
         """Serve AI rewrite API endpoint using OpenAI"""
         try:
-            import json
-            import openai
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
-            # Get OpenAI API key
-            openai_api_key = os.getenv('OPENAI_API_KEY')
-            if not openai_api_key:
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                error_response = json.dumps({
+            # Get the shared OpenAI client
+            client = get_openai_client()
+            if client is None:
+                error_response = orjson.dumps({
                     "error": "OpenAI API key not configured. Please add OPENAI_API_KEY to your .env file."
                 })
-                self.wfile.write(error_response.encode('utf-8'))
+                self.send_json_response(error_response, 400)
                 return
             
-            # Set up OpenAI client
-            client = openai.OpenAI(api_key=openai_api_key)
-            
             # Read POST data
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            request_data = json.loads(post_data.decode('utf-8'))
+            post_data = self.read_request_body(content_length)
+            request_data = orjson.loads(post_data)
             
             original_scope = request_data.get('original_scope', '')
             keywords = request_data.get('keywords', '')
             
             if not original_scope:
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                error_response = json.dumps({"error": "Original scope is required"})
-                self.wfile.write(error_response.encode('utf-8'))
+                error_response = orjson.dumps({"error": "Original scope is required"})
+                self.send_json_response(error_response, 400)
                 return
             
             # Create the prompt for OpenAI
@@ -3375,7 +3490,8 @@ Please provide exactly 3 different rewritten versions, each maintaining the prof
             print(f"🔄 Generating AI rewrites for scope with keywords: {keywords}")
             
             # Call OpenAI API
-            response = client.chat.completions.create(
+            response = OPENAI_POOL.submit(
+                client.chat.completions.create,
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a professional civil engineering technical writer who specializes in creating project scope descriptions for government proposals and Section E resumes."},
@@ -3383,7 +3499,7 @@ Please provide exactly 3 different rewritten versions, each maintaining the prof
                 ],
                 max_tokens=1500,
                 temperature=0.7
-            )
+            ).result()
             
             # Parse the response to extract the 3 versions
             full_response = response.choices[0].message.content
@@ -3393,7 +3509,6 @@ Please provide exactly 3 different rewritten versions, each maintaining the prof
             
             # Try to split the response into 3 versions
             # Look for common patterns like "Version 1:", "1.", etc.
-            import re
             
             # Split by version indicators
             version_patterns = [
@@ -3443,26 +3558,59 @@ Please provide exactly 3 different rewritten versions, each maintaining the prof
                 "keywords": keywords
             }
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response_data, indent=2).encode('utf-8'))
+            response = orjson.dumps(response_data)
+            self.send_json_response(response)
             
         except Exception as e:
             print(f"Error in AI rewrite API: {e}")
-            import traceback
             traceback.print_exc()
             
-            error_response = json.dumps({
+            error_response = orjson.dumps({
                 "error": str(e),
                 "message": "Failed to generate AI rewrites"
             })
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(error_response.encode('utf-8'))
+            self.send_json_response(error_response, 500)
+    
+    def parse_request(self):
+        """Parse the request line and headers; errors raised while parsing still close the connection"""
+        self._error_keeps_alive = False
+        return super().parse_request()
+    
+    def send_error(self, code, message=None, explain=None):
+        """
+        Send an error page. Errors from a routed GET (missing static files,
+        favicon.ico, bad merge preview URLs) carry a Content-Length and leave
+        no request body unread, so they keep the connection open; server
+        errors still close it.
+        """
+        if code >= 500:
+            self._error_keeps_alive = False
+        super().send_error(code, message, explain)
+    
+    def send_response(self, code, message=None):
+        """Start a response, tracking whether it declares its body length"""
+        self._sent_content_length = False
+        super().send_response(code, message)
+    
+    def send_header(self, keyword, value):
+        """Send a header, noting Content-Length for keep-alive"""
+        keyword_lower = keyword.lower()
+        if keyword_lower == 'content-length':
+            self._sent_content_length = True
+        elif keyword_lower == 'connection' and self._error_keeps_alive:
+            # Only send_error sets Connection here; its body is length-delimited
+            return
+        super().send_header(keyword, value)
+    
+    def end_headers(self):
+        """
+        Finish the headers; a response without Content-Length can only be
+        delimited by closing the connection, so keep-alive is turned off for it
+        """
+        if not getattr(self, '_sent_content_length', True):
+            super().send_header('Connection', 'close')
+            self.close_connection = True
+        super().end_headers()
     
     def log_message(self, format, *args):
         """Override to customize logging"""
@@ -3474,15 +3622,19 @@ def main():
     """Start the web server"""
     PORT = int(os.getenv('PORT', 8000))
     
-    # Create server
-    with socketserver.TCPServer(("", PORT), UIHandler) as httpd:
+    # Request-path logging is quiet by default; set LOG_LEVEL=DEBUG to trace requests
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper(), format='%(message)s')
+    
+    # Create server; one thread per connection so slow Supabase calls don't block other requests
+    with http.server.ThreadingHTTPServer(("", PORT), UIHandler) as httpd:
+        httpd.daemon_threads = True
         print('\n🚀 Section E Resume Database Server (Python)')
         print('=============================================')
         print(f'📍 Server running at: http://localhost:{PORT}')
         print(f'📁 Serving from: {os.getcwd()}')
         
         # Check environment setup
-        if os.getenv('SUPABASE_URL') and os.getenv('SUPABASE_KEY'):
+        if _SUPABASE_URL and _SUPABASE_KEY:
             print('✅ Environment variables detected')
             print('🔗 Database connection will be enabled')
         else:
@@ -12,9 +12,10 @@ python test_parser.py
 import os
 import sys
 import json
+import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 # Add project root to Python path for src module imports
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -34,7 +35,7 @@ def test_single_file():
         print("OPENAI_API_KEY=your_api_key_here")
         return False
     
-    client = OpenAI(api_key=api_key)
+    client = AsyncOpenAI(api_key=api_key)
     
     # Find a sample PDF to test with
     sample_files = [
@@ -65,7 +66,7 @@ def test_single_file():
         print(f"Extracted {len(text)} characters from PDF")
         
         # Parse the resume using OpenAI
-        resume_data = parse_resume_with_openai(client, text)
+        resume_data = asyncio.run(parse_resume_with_openai(client, text))
         
         if not resume_data:
             print("Error: No data parsed from resume")
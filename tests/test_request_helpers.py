@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Tests for the request-path and text-cleanup helpers
+
+Covers the pieces that parse input byte by byte or regex by regex and are
+easy to break without noticing:
+- Streaming multipart upload parsing in the web server
+- Route table compilation for prefix GET paths
+- CID decoding and encoding-marker counting in the text extractor
+
+None of these tests need network access, API keys or sample files.
+
+Usage:
+python test_request_helpers.py
+"""
+
+import io
+import os
+import sys
+
+# Add project root to Python path for src module imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+# serve_ui imports its sibling modules by plain name
+sys.path.insert(0, os.path.join(project_root, "src", "web"))
+
+import serve_ui
+from src.parsers.enhanced_text_extractor import EnhancedTextExtractor
+
+BOUNDARY = "----TestBoundary7MA4YWxk"
+# Bytes after the request body that belong to the next request on the connection
+NEXT_REQUEST = b"GET / HTTP/1.1\r\n"
+
+
+class FakeRequest:
+    """Minimal stand-in for UIHandler with just what stream_multipart_file uses"""
+
+    _body_unread = 0
+    read_request_body = serve_ui.UIHandler.read_request_body
+    stream_multipart_file = serve_ui.UIHandler.stream_multipart_file
+
+    def __init__(self, body):
+        self.rfile = io.BytesIO(body + NEXT_REQUEST)
+
+
+def build_multipart(parts, boundary=BOUNDARY, closed=True):
+    """Build a multipart/form-data body from (headers, payload) pairs"""
+    body = bytearray()
+    for headers, payload in parts:
+        body += f"--{boundary}\r\n{headers}\r\n\r\n".encode() + payload + b"\r\n"
+    if closed:
+        body += f"--{boundary}--\r\n".encode()
+    return bytes(body)
+
+
+def file_part(payload, filename="solicitation.pdf"):
+    """A file field part"""
+    headers = (f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+               'Content-Type: application/pdf')
+    return headers, payload
+
+
+def field_part(name, value):
+    """A plain form field part"""
+    return f'Content-Disposition: form-data; name="{name}"', value
+
+
+def stream_upload(body, chunk_size=1 << 20, required_prefix=b""):
+    """Run stream_multipart_file over body; returns (filename, file bytes, request)"""
+    request = FakeRequest(body)
+    out = io.BytesIO()
+    filename = request.stream_multipart_file(len(body), BOUNDARY, out, chunk_size, required_prefix)
+    return filename, out.getvalue(), request
+
+
+def assert_body_consumed(request, body):
+    """The whole body, and nothing after it, was read from the connection"""
+    assert request.rfile.read() == NEXT_REQUEST
+    assert request._body_unread == -len(body)
+
+
+def test_multipart_single_file():
+    """A lone file field is copied through unchanged"""
+    payload = b"%PDF-1.7\n" + bytes(range(256)) * 4
+    body = build_multipart([file_part(payload)])
+
+    filename, data, request = stream_upload(body)
+
+    assert filename == "solicitation.pdf"
+    assert data == payload
+    assert_body_consumed(request, body)
+
+
+def test_multipart_delimiter_split_across_chunks():
+    """Delimiters and headers that straddle read boundaries are still found"""
+    # Payload holds near-misses of the closing delimiter
+    payload = b"%PDF-1.4\r\n--" + b"\r\n-" * 20 + f"\r\n--{BOUNDARY[:-1]}x".encode() + b"tail"
+    body = build_multipart([field_part("note", b"first"), file_part(payload)])
+
+    for chunk_size in range(1, len(BOUNDARY) + 8):
+        filename, data, request = stream_upload(body, chunk_size=chunk_size)
+        assert filename == "solicitation.pdf", chunk_size
+        assert data == payload, chunk_size
+        assert_body_consumed(request, body)
+
+
+def test_multipart_missing_closing_delimiter():
+    """A body cut off before its closing delimiter keeps the bytes that arrived"""
+    payload = b"%PDF-1.5\n" + b"x" * 100
+    body = build_multipart([file_part(payload)], closed=False)
+    # Drop the CRLF the part would have ended with as well
+    body = body[:-2]
+
+    for chunk_size in (1, 7, 64, 1 << 20):
+        filename, data, request = stream_upload(body, chunk_size=chunk_size, required_prefix=b"%PDF-")
+        assert filename == "solicitation.pdf"
+        assert data == payload
+        assert_body_consumed(request, body)
+
+
+def test_multipart_required_prefix_rejected():
+    """A file without the required magic bytes is rejected and nothing is written"""
+    body = build_multipart([file_part(b"GIF89a not a pdf at all")])
+
+    for chunk_size in (1, 3, 1 << 20):
+        request = FakeRequest(body)
+        out = io.BytesIO()
+        try:
+            request.stream_multipart_file(len(body), BOUNDARY, out, chunk_size, b"%PDF-")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError for a non-PDF upload")
+        assert out.getvalue() == b""
+        # The rest of the body is drained so the connection stays usable
+        assert_body_consumed(request, body)
+
+
+def test_multipart_short_file_rejected():
+    """A file shorter than the required prefix is rejected, not accepted"""
+    body = build_multipart([file_part(b"%PD")])
+
+    try:
+        stream_upload(body, chunk_size=2, required_prefix=b"%PDF-")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for a truncated PDF header")
+
+
+def test_multipart_file_not_first():
+    """Plain fields before the file field are skipped"""
+    payload = b"%PDF-1.6\nbody"
+    body = build_multipart([
+        field_part("project", b"Bridge rehab --not a delimiter"),
+        field_part("notes", b"line one\r\nline two"),
+        file_part(payload, filename="rfq.pdf"),
+        field_part("after", b"ignored"),
+    ])
+
+    for chunk_size in (1, 5, 1 << 20):
+        filename, data, request = stream_upload(body, chunk_size=chunk_size, required_prefix=b"%PDF-")
+        assert filename == "rfq.pdf"
+        assert data == payload
+        assert_body_consumed(request, body)
+
+
+def test_multipart_no_file_field():
+    """A body without a file field returns None and writes nothing"""
+    body = build_multipart([field_part("project", b"value")])
+
+    filename, data, request = stream_upload(body, chunk_size=4)
+
+    assert filename is None
+    assert data == b""
+    assert_body_consumed(request, body)
+
+
+def test_route_table_dispatch():
+    """Each path resolves to its handler and that route's own capture groups"""
+    pattern, handlers = serve_ui.compile_route_table((
+        (r'/api/employee/(.*)', 'employee'),
+        (r'/api/merge-preview/([^/]*)/([^/]*)', 'merge'),
+        (r'/api/(?:team-)?merge-preview/.*', 'reject'),
+        (r'/api/ping', 'ping'),
+    ))
+
+    def resolve(path):
+        match = pattern.match(path)
+        if match is None:
+            return None
+        handler, first_arg, end_arg = handlers[match.lastgroup]
+        return handler, match.groups()[first_arg:end_arg]
+
+    assert resolve('/api/employee/Jane%20Doe') == ('employee', ('Jane%20Doe',))
+    assert resolve('/api/merge-preview/12/34') == ('merge', ('12', '34'))
+    # Too many segments falls through to the catch-all, not a partial match
+    assert resolve('/api/merge-preview/12/34/56') == ('reject', ())
+    assert resolve('/api/team-merge-preview/1/2') == ('reject', ())
+    assert resolve('/api/ping') == ('ping', ())
+    # Matches are anchored at both ends
+    assert resolve('/api/ping/extra') is None
+    assert resolve('/api/ping\n') is None
+    assert resolve('/other/api/ping') is None
+
+
+def test_server_prefix_routes():
+    """The server's own prefix table sends every route to an existing handler"""
+    pattern = serve_ui.UIHandler._GET_PREFIX_PATTERN
+    handlers = serve_ui.UIHandler._GET_PREFIX_HANDLERS
+
+    for handler, _, _ in handlers.values():
+        assert callable(getattr(serve_ui.UIHandler, handler)), handler
+
+    match = pattern.match('/api/merge-preview/a/b')
+    handler, first_arg, end_arg = handlers[match.lastgroup]
+    assert handler == 'serve_merge_preview_api'
+    assert match.groups()[first_arg:end_arg] == ('a', 'b')
+
+
+def test_decode_cid_patterns():
+    """Known CIDs are mapped, unknown ones dropped and plain lines left alone"""
+    extractor = EnhancedTextExtractor()
+
+    assert extractor.decode_cid_patterns("(cid:49)(cid:68)(cid:80)(cid:72)") == "Name"
+    assert extractor.decode_cid_patterns("Year(cid:3)(cid:21)(cid:19)(cid:21)(cid:23)") == "Year 2024"
+    # Unmapped and out-of-table CIDs are removed
+    assert extractor.decode_cid_patterns("A(cid:999)B(cid:5000)C") == "ABC"
+    # Lines are decoded independently; the cached result for a repeated line is reused
+    text = "(cid:36)\nplain (cid text\n(cid:36)"
+    assert extractor.decode_cid_patterns(text) == "A\nplain (cid text\nA"
+    assert extractor.decode_cid_patterns("") == ""
+
+
+def test_count_encoding_markers():
+    """Marker counts match a straightforward count over the patterns"""
+    extractor = EnhancedTextExtractor()
+    garbled_keys = set(extractor.char_replacements)
+
+    def reference(text):
+        return text.count("(cid:"), sum(1 for key in garbled_keys if key in text)
+
+    samples = [
+        "",
+        "Plain resume text with no markers at all.",
+        "(cid:36)(cid:37) and (cid:3)",
+        "1$0( of employee, 52/( in this &2175$&7",
+        # Overlapping patterns: "),501$0(" also contains "),50" and "1$0("
+        "),501$0(: MSMM",
+        "&855(17 &855(17 &855(17 (cid:20)",
+        "(;3(5,(1&( 727$/ :,7+ (cid:1)",
+    ]
+    for text in samples:
+        assert extractor._count_encoding_markers(text) == reference(text), text
+
+
+def main():
+    """Run all tests"""
+    print("Request and Text Helper Tests")
+    print("=" * 50)
+
+    tests = [
+        test_multipart_single_file,
+        test_multipart_delimiter_split_across_chunks,
+        test_multipart_missing_closing_delimiter,
+        test_multipart_required_prefix_rejected,
+        test_multipart_short_file_rejected,
+        test_multipart_file_not_first,
+        test_multipart_no_file_field,
+        test_route_table_dispatch,
+        test_server_prefix_routes,
+        test_decode_cid_patterns,
+        test_count_encoding_markers,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ PASS {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ FAIL {test.__name__}: {e!r}")
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"⚠️  {failures} of {len(tests)} tests failed")
+        sys.exit(1)
+    print(f"🎉 All {len(tests)} tests passed!")
+
+
+if __name__ == "__main__":
+    main()
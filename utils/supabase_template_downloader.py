@@ -64,6 +64,10 @@ class SupabaseTemplateDownloader:
         
         self.cache_dir.mkdir(exist_ok=True)
         
+        # String forms of both directories, joined with filenames on every lookup
+        self._local_templates_root = str(self.local_templates_dir)
+        self._cache_root = str(self.cache_dir)
+        
         # Initialize Supabase client if available
         self.supabase = None
         self.supabase_available = False
@@ -98,16 +102,16 @@ class SupabaseTemplateDownloader:
             str: Local path to template file, or None if not found anywhere
         """
         # Step 1: Check if template exists locally
-        local_path = self.local_templates_dir / filename
-        if local_path.exists():
+        local_path = os.path.join(self._local_templates_root, filename)
+        if os.path.exists(local_path):
             print(f"📄 Using local template: {local_path}")
-            return str(local_path)
+            return local_path
         
         # Step 2: Check cache
-        cached_path = self.cache_dir / filename
-        if cached_path.exists():
+        cached_path = os.path.join(self._cache_root, filename)
+        if os.path.exists(cached_path):
             print(f"📄 Using cached template: {cached_path}")
-            return str(cached_path)
+            return cached_path
         
         # Step 3: Try to download from Supabase
         if self.supabase_available and self.supabase: